@@ -1,5 +1,7 @@
 import comfy.utils
 
+from .aun_workflow_index import get_workflow_index
+
 class AlwaysEqualProxy(str):
     def __eq__(self, _):
         return True
@@ -81,51 +83,28 @@ class AUNAnyIndexSwitch:
         
         selected_label = key
         node_id = kwargs.get('unique_id')
-        connected_origin_slot = None
+        index = get_workflow_index(kwargs.get('extra_pnginfo')) if node_id else None
 
-        if node_id and 'extra_pnginfo' in kwargs and kwargs['extra_pnginfo'] is not None:
-            workflow_data = kwargs['extra_pnginfo']['workflow']
-            nodelist = workflow_data['nodes']
-            connected_node_id = None
-            for node in nodelist:
-                if str(node['id']) == node_id:
-                    inputs = node.get('inputs', [])
-                    for slot in inputs:
-                        if slot.get('name') == key and 'label' in slot:
-                            selected_label = slot['label']
-                        if slot.get('name') == key and 'link' in slot:
-                            link_id = slot['link']
-                            connected_origin_slot = None
-                            for link in workflow_data.get('links', []):
-                                if isinstance(link, dict):
-                                    if link.get('id') == link_id:
-                                        connected_node_id = link.get('origin_id')
-                                        connected_origin_slot = link.get('origin_slot')
-                                        break
-                                elif isinstance(link, list) and len(link) >= 5:
-                                    if str(link[0]) == str(link_id):
-                                        connected_node_id = link[1]
-                                        connected_origin_slot = link[2]
-                                        break
-                    break
-        
-        if connected_node_id:
-            for node in nodelist:
-                if isinstance(node, dict) and str(node.get('id', '')) == str(connected_node_id):
-                    if label_mode == "Slot Label" and connected_origin_slot is not None:
-                        outputs = node.get('outputs', [])
-                        if isinstance(outputs, list) and connected_origin_slot < len(outputs):
-                            output_slot = outputs[connected_origin_slot]
-                            selected_label = output_slot.get('label') or output_slot.get('name', key)
-                        else:
-                            selected_label = key
+        if index is not None:
+            slot = index.input_slot(node_id, key)
+            if slot is not None and 'label' in slot:
+                selected_label = slot['label']
+            origin = index.origin(node_id, key)
+            if origin is not None:
+                node, connected_origin_slot = origin
+                if label_mode == "Slot Label" and connected_origin_slot is not None:
+                    outputs = node.get('outputs', [])
+                    if isinstance(outputs, list) and connected_origin_slot < len(outputs):
+                        output_slot = outputs[connected_origin_slot]
+                        selected_label = output_slot.get('label') or output_slot.get('name', key)
                     else:
-                        if 'title' in node and node['title']:
-                            selected_label = node['title']
-                        elif 'type' in node:
-                            selected_label = node['type']
-                    break
-        
+                        selected_label = key
+                else:
+                    if 'title' in node and node['title']:
+                        selected_label = node['title']
+                    elif 'type' in node:
+                        selected_label = node['type']
+
         return (kwargs[key], selected_label)        
         
 NODE_CLASS_MAPPINGS = {
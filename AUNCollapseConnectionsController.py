@@ -1,3 +1,6 @@
+from .aun_event_bus import queue_event
+
+
 class AUNCollapseConnectionsController:
     """Hide the input/output slots of chosen nodes to reduce link lines between them.
 
@@ -67,12 +70,6 @@ class AUNCollapseConnectionsController:
         return inputs
 
     def execute(self, slot_count, AllSwitch, **kwargs):
-        try:
-            from server import PromptServer
-        except Exception as e:
-            print(f"[AUNCollapseConnectionsController] Could not import PromptServer: {e}")
-            return ()
-
         # If only one slot is active, AllSwitch is redundant and hidden in UI
         if slot_count == 1:
             AllSwitch = False
@@ -103,7 +100,7 @@ class AUNCollapseConnectionsController:
         if inactive_ids: target_groups.append({"type": "ID", "targets": inactive_ids, "is_active": False})
 
         try:
-            PromptServer.instance.send_sync("AUN_set_collapse_connections", {
+            queue_event("AUN_set_collapse_connections", {
                 "groups": target_groups,
                 "slot_count": int(slot_count),
             })
@@ -1,8 +1,9 @@
-import torch
 import time
 import random
 import numpy as np
 
+from .aun_latent_factory import empty_latent
+
 class AUNEmptyLatent:
     def __init__(self):
         pass
@@ -85,7 +86,7 @@ class AUNEmptyLatent:
             width, height = height, width
 
         # Create the empty latent
-        latent = torch.zeros([batch_size, 4, height // 8, width // 8])
+        latent = empty_latent(batch_size, width, height)
         
         return ({"samples": latent}, width, height, seed)   
     
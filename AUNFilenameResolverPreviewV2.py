@@ -3,7 +3,13 @@ import os
 
 import folder_paths
 
-from .aun_path_filename_shared import format_resolved_tokens, resolve_template, split_path_filename
+from .aun_path_filename_shared import (
+    compile_template,
+    format_resolved_tokens,
+    java_to_python_datefmt,
+    resolve_template,
+    split_path_filename,
+)
 from .model_utils import get_short_name as get_model_short_name, get_sampler_short_name, get_scheduler_short_name
 from .AUNSaveVideo import AUNSaveVideo
 
@@ -149,45 +155,16 @@ class AUNFilenameResolverPreviewV2:
             model_base = os.path.splitext(os.path.basename(model_name_value.replace("\\", "/")))[0]
 
         import datetime
-        import re
 
         now = datetime.datetime.now()
 
-        def java_to_python_datefmt(fmt):
-            mapping = [
-                ("yyyy", "%Y"),
-                ("MM", "%m"),
-                ("dd", "%d"),
-                ("HH", "%H"),
-                ("mm", "%M"),
-                ("ss", "%S"),
-                ("yy", "%y"),
-                ("M", "%m"),
-                ("d", "%d"),
-                ("H", "%H"),
-                ("m", "%M"),
-                ("s", "%S"),
-            ]
-            out = fmt
-            for java_token, python_token in mapping:
-                out = re.sub(rf"(?<!%)\b{java_token}\b", python_token, out)
-            return out
-
         def normalize_date_format(fmt):
             fmt_str = str(fmt or "%Y-%m-%d")
             if "y" in fmt_str and "M" in fmt_str:
                 return java_to_python_datefmt(fmt_str)
             return fmt_str
 
-        def replace_datetime_placeholders(template):
-            def _repl(match):
-                fmt = match.group(2)
-                pyfmt = java_to_python_datefmt(fmt)
-                return now.strftime(pyfmt)
-
-            return re.sub(r"%(date|time):([^%]+)%", _repl, template)
-
-        filename_template = replace_datetime_placeholders(filename_template)
+        filename_template = compile_template(filename_template, datetime_tokens=True).render({}, now)
 
         python_date_format = normalize_date_format(date_format)
         date_token = now.strftime(python_date_format)
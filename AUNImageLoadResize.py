@@ -1,5 +1,4 @@
 import hashlib
-import os
 import time
 from pathlib import Path
 from PIL.PngImagePlugin import PngInfo
@@ -13,6 +12,8 @@ from comfy.cli_args import args
 from server import PromptServer
 import re
 import comfy
+from .aun_listing_cache import list_input_files
+from .aun_image_decode import RESIZE_GAP, draft_scale, oriented_size, reduce_scale
 
 # FramePack-style bucket options and helper (embedded to avoid cross-package imports)
 _FRAMEPACK_BUCKET_OPTIONS = {
@@ -92,11 +93,10 @@ def clean_filename_for_output(filename_without_ext, max_words=0):
 class AUNImageLoadResize:
     @classmethod
     def INPUT_TYPES(cls):
-        input_dir = folder_paths.get_input_directory()
-        files = [f for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
+        files = list_input_files()
         return {"required":
                     {
-                    "image": (sorted(files), {
+                    "image": (files, {
                         "image_upload": True,
                         "tooltip": "Select image file from input directory or upload new image."
                     }),
@@ -137,6 +137,12 @@ class AUNImageLoadResize:
                         "tooltip": "Maximum number of words to keep for both filename outputs. Set to 0 for no limit."
                     }),
                     },
+                "optional": {
+                    "draft_decode": ("BOOLEAN", {
+                        "default": True,
+                        "tooltip": "When downscaling, decode JPEGs at a reduced scale and box-reduce large images before the exact resize (never below twice the target size). Much faster and lighter for big photos. Disable for a full-resolution decode. Not used with nearest interpolation."
+                    }),
+                },
                 "hidden": {"prompt": "PROMPT"}
                 }
 
@@ -147,7 +153,7 @@ class AUNImageLoadResize:
     FUNCTION = "load_image"
     DESCRIPTION = "Load images with optional automatic resizing. Supports FramePack nearest-bucket sizing, maintains aspect ratio, and provides filename information for workflow organization."
 
-    def load_image(self, image, resize, use_framepack_bucket, base_resolution, width, height, method="keep proportion", crop_position="center", interpolation="lanczos", max_num_words=0, divisible_by=8, prompt=None):
+    def load_image(self, image, resize, use_framepack_bucket, base_resolution, width, height, method="keep proportion", crop_position="center", interpolation="lanczos", max_num_words=0, divisible_by=8, draft_decode=True, prompt=None):
 
         image_path = folder_paths.get_annotated_filepath(image)
         filename = image.rsplit('.', 1)[0]  # get image name
@@ -168,9 +174,12 @@ class AUNImageLoadResize:
                 # nearest, nearest-exact, area
                 return F.interpolate(t, size=(th, tw), mode=mode)
 
-        def _resize_nchw(t, target_w, target_h, mode, strat, crop_anchor="center"):
+        def _resize_nchw(t, target_w, target_h, mode, strat, crop_anchor="center", source_size=None):
             # t: (N,C,H,W) -> (N,C,h,w)
             _, _, oh, ow = t.shape
+            if source_size is not None:
+                # t was draft-decoded/reduced; size the output from the original (w, h) so it matches a full decode
+                ow, oh = source_size
             # Defaults
             tgt_w = target_w if target_w and target_w > 0 else ow
             tgt_h = target_h if target_h and target_h > 0 else oh
@@ -238,8 +247,27 @@ class AUNImageLoadResize:
             if use_framepack_bucket and method == 'keep proportion':
                 effective_method = 'pad'
 
+        # Downscales may decode and reduce close to the target before the exact resize.
+        use_draft = resize and draft_decode and interpolation not in ("nearest", "nearest-exact")
+
+        def _source_scale(sw, sh):
+            # Smallest scale of a (sw, sh) frame that still covers the resize's intermediate size.
+            tw, th = max(1, int(target_w)), max(1, int(target_h))
+            if effective_method in ('keep proportion', 'pad'):
+                ratio = min(tw / sw, th / sh)
+            else:
+                ratio = max(tw / sw, th / sh)
+            return ratio * RESIZE_GAP
+
+        # Output sizes always come from the full-resolution size, not the rounded-up reduced one
+        full_size = oriented_size(img) if use_draft else None
+        if use_draft:
+            draft_scale(img, _source_scale(*full_size))
+
         for i in ImageSequence.Iterator(img):
             i = node_helpers.pillow(ImageOps.exif_transpose, i)
+            if use_draft:
+                i = reduce_scale(i, _source_scale(*i.size))
 
             if i.mode == 'I':
                 i = i.point(lambda i: i * (1 / 255))
@@ -263,12 +291,12 @@ class AUNImageLoadResize:
                 tgt_w = max(1, int(target_w))
                 tgt_h = max(1, int(target_h))
                 # Resize color
-                rgb_out = _resize_nchw(rgb_t, tgt_w, tgt_h, interpolation, effective_method, crop_position)
+                rgb_out = _resize_nchw(rgb_t, tgt_w, tgt_h, interpolation, effective_method, crop_position, full_size)
                 # Resize mask with bilinear for smooth edges (or same method if preferred)
                 if mask_t is None:
                     mask_out = torch.zeros((1, 1, rgb_out.shape[2], rgb_out.shape[3]), dtype=torch.float32)
                 else:
-                    mask_out = _resize_nchw(mask_t, tgt_w, tgt_h, 'bilinear', effective_method, crop_position)
+                    mask_out = _resize_nchw(mask_t, tgt_w, tgt_h, 'bilinear', effective_method, crop_position, full_size)
             else:
                 rgb_out = rgb_t
                 if mask_t is None:
@@ -1,15 +1,16 @@
 import os
 import random
 import folder_paths
-import numpy as np
 import torch
-from PIL import Image, ImageSequence, ImageOps
+from PIL import Image, ImageSequence
 import hashlib
 import json
 import re
 import fnmatch
 from nodes import PreviewImage
 from server import PromptServer  # already available in ComfyUI core
+from .aun_listing_cache import list_input_files
+from .aun_image_decode import frame_to_tensor, load_first_frame, load_first_frames
 
 def clean_filename_for_output(filename_without_ext, max_words=0):
     """Replace symbols with spaces, collapse whitespace, optionally drop a trailing numeric counter,
@@ -143,8 +144,7 @@ class AUNImageSingleBatch3(PreviewImage):
     @classmethod
     def INPUT_TYPES(cls):
         predefined_paths = load_predefined_paths()
-        input_dir = folder_paths.get_input_directory()
-        files = [f for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
+        files = list_input_files()
 
         return {
             "required": {
@@ -173,7 +173,7 @@ class AUNImageSingleBatch3(PreviewImage):
                     "tooltip": "Multi-purpose field:\n• For fixed/range modes: Comma-separated 1-based indices or ranges (e.g., 2,3,4-7,10)\n• For search mode: Search pattern supporting wildcards (*,?,[]), regex, or simple text (e.g., 'portrait*', 'img_[0-9]+', '.*face.*')"
                 }),
                 "image_upload": (
-                    sorted(files),
+                    files,
                     {
                         "image_upload": True,
                         "tooltip": "When source_mode is 'Single Image Upload', choose the file from the ComfyUI input directory.",
@@ -188,6 +188,12 @@ class AUNImageSingleBatch3(PreviewImage):
                     "tooltip": "When enabled with 'range', 'fixed', or 'search' batch modes, output ALL matching images as a list (one per downstream execution) with corresponding filename lists."
                 }),
             },
+            "optional": {
+                "list_size_hint": ("INT", {
+                    "default": 0, "min": 0, "max": 16384, "step": 8,
+                    "tooltip": "List output only: the longest side downstream nodes need. JPEGs larger than this are decoded at a reduced scale (1/2, 1/4 or 1/8) that stays at or above it. Set to 0 to always decode at full resolution."
+                }),
+            },
             "hidden": {
                 "prompt": "PROMPT",
                 "extra_pnginfo": "EXTRA_PNGINFO",
@@ -216,16 +222,11 @@ class AUNImageSingleBatch3(PreviewImage):
         output_images = []
         w, h = None, None
         for i in ImageSequence.Iterator(pil_image):
-            i = ImageOps.exif_transpose(i)
-            if i.mode == 'I':
-                i = i.point(lambda i: i * (1 / 255))
-            image = i.convert("RGB")
+            image_tensor = frame_to_tensor(i)
             if not output_images:
-                w, h = image.size
-            if image.size[0] != w or image.size[1] != h:
+                h, w = image_tensor.shape[1:3]
+            if image_tensor.shape[1] != h or image_tensor.shape[2] != w:
                 continue
-            image_np = np.array(image).astype(np.float32) / 255.0
-            image_tensor = torch.from_numpy(image_np)[None,]
             output_images.append(image_tensor)
         if not output_images:
             raise ValueError("Failed to process the image.")
@@ -234,7 +235,7 @@ class AUNImageSingleBatch3(PreviewImage):
         else:
             return output_images[0]
 
-    def load_image(self, source_mode, path_mode, predefined_path, manual_path, batch_mode, range_or_pattern, image_upload, max_num_words=0, output_is_list=False, hide_preview=False, unique_id=None, **kwargs):
+    def load_image(self, source_mode, path_mode, predefined_path, manual_path, batch_mode, range_or_pattern, image_upload, max_num_words=0, output_is_list=False, list_size_hint=0, hide_preview=False, unique_id=None, **kwargs):
         # Retrieve or initialize state for this node instance
         if unique_id is not None:
             if isinstance(unique_id, (list, tuple)):
@@ -336,31 +337,21 @@ class AUNImageSingleBatch3(PreviewImage):
                 indices = list(range(num_files))
             if not indices:
                 raise ValueError("No valid indices found for list output.")
-            image_list = []
+            selected_files = [state["image_files"][idx] for idx in indices]
+            # Only frame 0 of each file is output, so decode just that, in parallel.
+            image_list = load_first_frames(
+                [os.path.join(effective_path, sf) for sf in selected_files], int(list_size_hint or 0)
+            )
             filename_list = []
             cleaned_list = []
-            for idx in indices:
-                sf = state["image_files"][idx]
-                fp = os.path.join(effective_path, sf)
-                pi = Image.open(fp)
-                t = self._process_pil_image(pi)
-                if t.dim() == 4 and t.shape[0] > 1:
-                    t = t[0:1]
-                if t.dim() == 3:
-                    t = t.unsqueeze(0)
-                image_list.append(t)
+            for sf in selected_files:
                 raw_fn = os.path.splitext(sf)[0]
                 filename_list.append(raw_fn)
                 cleaned_list.append(clean_filename_for_output(raw_fn, max_num_words))
             return (image_list, filename_list, cleaned_list)
         
         if output_is_list:
-            pil_image = Image.open(image_path)
-            t = self._process_pil_image(pil_image)
-            if t.dim() == 4 and t.shape[0] > 1:
-                t = t[0:1]
-            if t.dim() == 3:
-                t = t.unsqueeze(0)
+            t = load_first_frame(image_path, int(list_size_hint or 0))
             cfn = clean_filename_for_output(filename_without_ext, max_num_words)
             fn = filename_without_ext
             if max_num_words > 0:
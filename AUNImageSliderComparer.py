@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from nodes import PreviewImage, SaveImage
 
+from .aun_slider_preview_server import export_frame, register_lazy_frame
+from .aun_workflow_index import get_workflow_index
+
 
 class AUNImageSliderComparer(PreviewImage):
     """Compare two images side-by-side with a draggable slider divider."""
@@ -47,6 +50,7 @@ class AUNImageSliderComparer(PreviewImage):
             "hidden": {
                 "prompt": "PROMPT",
                 "extra_pnginfo": "EXTRA_PNGINFO",
+                "unique_id": "UNIQUE_ID",
             },
         }
         for i in range(1, cls.MAX_PAIRS + 1):
@@ -89,6 +93,7 @@ class AUNImageSliderComparer(PreviewImage):
         frame = self._first(frame)
         prompt = self._first(prompt)
         extra_pnginfo = self._first(extra_pnginfo)
+        unique_id = self._first(kwargs.get("unique_id"))
         save_active = bool(self._first(kwargs.get("save_active", False)))
         prefix = str(self._first(kwargs.get("prefix", "")) or "AUNImageSliderComparer")
 
@@ -98,7 +103,7 @@ class AUNImageSliderComparer(PreviewImage):
             for i in range(1, self.MAX_PAIRS + 1)
             for side in ("left", "right")
         ]
-        names = self._read_slot_names(extra_pnginfo, *slot_names)
+        names = self._read_slot_names(extra_pnginfo, *slot_names, node_id=unique_id)
 
         pairs = []
         frame_store = {}
@@ -133,12 +138,9 @@ class AUNImageSliderComparer(PreviewImage):
 
             any_connected = True
 
-            left_images = self._save_frames(
-                left_frames, f"AUNImageSliderComparer_left{i}", prompt, extra_pnginfo
-            )
-            right_images = self._save_frames(
-                right_frames, f"AUNImageSliderComparer_right{i}", prompt, extra_pnginfo
-            )
+            eager = i == pair_index
+            left_images = self._save_frames(left_frames, eager)
+            right_images = self._save_frames(right_frames, eager)
 
             if len(left_images) == 1 and len(right_images) > 1:
                 left_images = left_images * len(right_images)
@@ -217,15 +219,17 @@ class AUNImageSliderComparer(PreviewImage):
                 frames.append(t)
         return frames or None
 
-    def _save_frames(self, frames, prefix, prompt, extra_pnginfo):
-        """Save each frame individually (frames may differ in size) and return filenames."""
-        images = []
-        for index, frame in enumerate(frames):
-            saved = self.save_images(
-                frame.unsqueeze(0), f"{prefix}_f{index}", prompt, extra_pnginfo
-            )
-            images.extend(saved.get("ui", {}).get("images", []))
-        return images
+    @staticmethod
+    def _save_frames(frames, eager):
+        """Return preview infos for each frame (frames may differ in size).
+
+        Previews are content-addressed, so unchanged tensors reuse the file
+        written by a previous run. Only the active pair is exported eagerly;
+        other pairs get lazy placeholders the frontend resolves on demand.
+        """
+        if eager:
+            return [export_frame(frame) for frame in frames]
+        return [register_lazy_frame(frame) for frame in frames]
 
     @staticmethod
     def _save_active_frames(left_frames, right_frames, frame_index, prefix, prompt, extra_pnginfo):
@@ -250,34 +254,26 @@ class AUNImageSliderComparer(PreviewImage):
         return max(1, min(idx, AUNImageSliderComparer.MAX_PAIRS))
 
     @staticmethod
-    def _read_slot_names(extra_pnginfo, *slot_names):
+    def _read_slot_names(extra_pnginfo, *slot_names, node_id=None):
         """Map each requested input slot name to the connected output slot label."""
         names = {}
-        if extra_pnginfo is None:
+        index = get_workflow_index(extra_pnginfo)
+        if index is None:
             return names
 
-        workflow = extra_pnginfo.get("workflow", {})
-        nodelist = workflow.get("nodes", [])
-        links = workflow.get("links", [])
-
-        for node in nodelist:
-            if not isinstance(node, dict):
+        # Without our own ID, read every node that has these inputs.
+        node_ids = [node_id] if node_id is not None else index.node_ids()
+        for nid in node_ids:
+            node = index.node(nid)
+            if node is None:
                 continue
-            inputs = node.get("inputs", [])
-            if isinstance(inputs, dict):
-                inputs = list(inputs.values())
-            if not isinstance(inputs, list):
-                continue
-
             manual_labels = node.get("properties", {}).get("input_labels", {}) or {}
             if not isinstance(manual_labels, dict):
                 manual_labels = {}
 
-            for slot in inputs:
-                if not isinstance(slot, dict):
-                    continue
-                slot_name = slot.get("name", "")
-                if slot_name not in slot_names:
+            for slot_name in slot_names:
+                slot = index.input_slot(nid, slot_name)
+                if slot is None:
                     continue
                 manual = str(manual_labels.get(slot_name, "") or "").strip()
                 if manual:
@@ -287,44 +283,23 @@ class AUNImageSliderComparer(PreviewImage):
                 if label and label != slot_name:
                     names[slot_name] = label
                     continue
-                link_id = slot.get("link")
-                if link_id is None:
-                    continue
 
-                for link in links:
-                    link_id_val = None
-                    origin_node_id = None
-                    origin_slot_idx = None
-                    if isinstance(link, dict):
-                        link_id_val = link.get("id")
-                        origin_node_id = link.get("origin_id")
-                        origin_slot_idx = link.get("origin_slot")
-                    elif isinstance(link, list) and len(link) >= 5:
-                        link_id_val = link[0]
-                        origin_node_id = link[1]
-                        origin_slot_idx = link[2]
-
-                    if str(link_id_val) != str(link_id):
-                        continue
-
-                    src_node = next(
-                        (n for n in nodelist if str(n.get("id")) == str(origin_node_id)),
-                        None,
-                    )
-                    if src_node and origin_slot_idx is not None:
-                        outputs = src_node.get("outputs", [])
-                        if (
-                            isinstance(outputs, list)
-                            and origin_slot_idx < len(outputs)
-                            and isinstance(outputs[origin_slot_idx], dict)
-                        ):
-                            out = outputs[origin_slot_idx]
-                            label = (out.get("label") or "").strip()
-                            names[slot_name] = label or out.get("name", slot_name)
-                    break
+                origin = index.origin(nid, slot_name)
+                if origin is None:
+                    continue
+                src_node, origin_slot_idx = origin
+                if origin_slot_idx is not None:
+                    outputs = src_node.get("outputs", [])
+                    if (
+                        isinstance(outputs, list)
+                        and origin_slot_idx < len(outputs)
+                        and isinstance(outputs[origin_slot_idx], dict)
+                    ):
+                        out = outputs[origin_slot_idx]
+                        label = (out.get("label") or "").strip()
+                        names[slot_name] = label or out.get("name", slot_name)
         return names
 
-
 NODE_CLASS_MAPPINGS = {
     "AUNImageSliderComparer": AUNImageSliderComparer,
 }
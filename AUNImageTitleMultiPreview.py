@@ -1,3 +1,5 @@
+import functools
+
 import numpy as np
 import torch
 from nodes import PreviewImage
@@ -108,61 +110,94 @@ class AUNImageTitleMultiPreview(PreviewImage):
         bg_color_rgb = _parse_color(bg_color)
         font_color_rgb = _parse_color(font_color)
 
-        result_tensors = []
         if images.dim() == 3:
             images = images.unsqueeze(0)
 
-        for i in range(images.shape[0]):
-            img_tensor = images[i : i + 1]
-            label_text = labels[i] if i < num_labels else ""
+        if not show_labels or images.shape[0] == 0:
+            return self.save_images(
+                images, "AUNImageTitleMulti", prompt, extra_pnginfo
+            )
+
+        # All frames in a batch share one size, so the label bar geometry is
+        # computed once and each frame is a plain slice copy into one buffer.
+        batch, h, w = images.shape[0], images.shape[1], images.shape[2]
+        pixel_font = max(8, int(h * font_scale))
+        pixel_label_height = int(pixel_font * label_height_scale)
+        if label_position == "bottom":
+            body_rows = slice(0, h)
+            label_rows = slice(h, h + pixel_label_height)
+        else:
+            body_rows = slice(pixel_label_height, h + pixel_label_height)
+            label_rows = slice(0, pixel_label_height)
+
+        output = torch.empty(
+            (batch, h + pixel_label_height, w, 3),
+            dtype=torch.float32,
+            device=images.device,
+        )
+        output[:, body_rows] = images[..., :3].clamp(0.0, 1.0)
 
-            if show_labels:
-                from PIL import Image, ImageDraw, ImageFont
-                img_np = img_tensor.squeeze(0).cpu().numpy()
-                img_pil = Image.fromarray(
-                    np.clip(img_np * 255, 0, 255).astype(np.uint8)
+        strips = {}
+        for i in range(batch):
+            label_text = labels[i] if i < num_labels else ""
+            strip = strips.get(label_text)
+            if strip is None:
+                strip_np = _render_label_strip(
+                    label_text,
+                    w,
+                    pixel_label_height,
+                    pixel_font,
+                    font_color_rgb,
+                    bg_color_rgb,
+                    text_align,
                 )
-                w, h = img_pil.size
-                pixel_font = max(8, int(h * font_scale))
-                pixel_label_height = int(pixel_font * label_height_scale)
-                canvas = Image.new("RGB", (w, h + pixel_label_height), bg_color_rgb)
-                if label_position == "bottom":
-                    canvas.paste(img_pil, (0, 0))
-                    draw_y = h
-                else:
-                    canvas.paste(img_pil, (0, pixel_label_height))
-                    draw_y = 0
-
-                if label_text:
-                    draw = ImageDraw.Draw(canvas)
-                    try:
-                        font = ImageFont.truetype("DejaVuSans.ttf", pixel_font)
-                    except Exception:
-                        font = ImageFont.load_default()
-                    text = _truncate_text(draw, label_text, font, w - 10)
-                    bbox = draw.textbbox((0, 0), text, font=font)
-                    tw = bbox[2] - bbox[0]
-                    th = bbox[3] - bbox[1]
-                    if text_align == "left":
-                        x = 5
-                    elif text_align == "right":
-                        x = w - tw - 5
-                    else:
-                        x = (w - tw) // 2
-                    y = draw_y + (pixel_label_height - th) // 2 - bbox[1]
-                    draw.text((x, y), text, fill=font_color_rgb, font=font)
-
-                out_np = np.array(canvas).astype(np.float32) / 255.0
-                result_tensors.append(torch.from_numpy(out_np)[None,])
-            else:
-                result_tensors.append(img_tensor)
-
-        output = torch.cat(result_tensors, dim=0) if result_tensors else images
+                strip = torch.tensor(
+                    strip_np, dtype=torch.float32, device=images.device
+                ) / 255.0
+                strips[label_text] = strip
+            output[i, label_rows] = strip
+
         return self.save_images(
             output, "AUNImageTitleMulti", prompt, extra_pnginfo
         )
 
 
+@functools.lru_cache(maxsize=32)
+def _load_font(pixel_font):
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", pixel_font)
+    except Exception:
+        return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=128)
+def _render_label_strip(
+    label_text, width, height, pixel_font, font_color_rgb, bg_color_rgb, text_align
+):
+    """Render one label bar as a read-only (height, width, 3) uint8 array."""
+    from PIL import Image, ImageDraw
+    strip = Image.new("RGB", (width, height), bg_color_rgb)
+    if label_text:
+        draw = ImageDraw.Draw(strip)
+        font = _load_font(pixel_font)
+        text = _truncate_text(draw, label_text, font, width - 10)
+        bbox = draw.textbbox((0, 0), text, font=font)
+        tw = bbox[2] - bbox[0]
+        th = bbox[3] - bbox[1]
+        if text_align == "left":
+            x = 5
+        elif text_align == "right":
+            x = width - tw - 5
+        else:
+            x = (width - tw) // 2
+        y = (height - th) // 2 - bbox[1]
+        draw.text((x, y), text, fill=font_color_rgb, font=font)
+    strip_np = np.array(strip)
+    strip_np.setflags(write=False)
+    return strip_np
+
+
 def _parse_color(color_str):
     if color_str in COLOR_MAP:
         return COLOR_MAP[color_str]
@@ -1,5 +1,4 @@
 import hashlib
-import os
 import time
 from pathlib import Path
 from PIL.PngImagePlugin import PngInfo
@@ -11,6 +10,8 @@ from PIL import Image, ImageSequence, ImageOps
 from comfy.cli_args import args
 from server import PromptServer
 import re
+from .aun_listing_cache import list_input_files
+from .aun_image_decode import RESIZE_GAP, draft_scale, oriented_size, reduce_scale
 
 # Pillow resampling compatibility across versions
 try:
@@ -56,8 +57,7 @@ def clean_filename_for_output(filename_without_ext, max_words=0):
 class AUNImg2Img:
     @classmethod
     def INPUT_TYPES(cls):
-        input_dir = folder_paths.get_input_directory()
-        files = [f for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
+        files = list_input_files()
         return {"required": 
                     {
                     "img2img": ("BOOLEAN", { "default": False, "label_on": "On", "label_off": "Off", "tooltip": "Enable/disable Img2Img mode." }),
@@ -66,7 +66,7 @@ class AUNImg2Img:
                     "new_height": ("INT", { "default": 1024, "min": 0, "max": 2048,"step": 8, "tooltip": "Set the new height for the image when Img2Img is enabled. The longest side of the image will be resized to this length. Aspect ratio is preserved." }),
                     "latent_width": ("INT", { "forceInput": True, "tooltip": "The width of the latent space (from EmptyLatentImage node). The longest side of the image will be resized to this length. Aspect ratio is preserved."}),
                     "latent_height": ("INT", { "forceInput": True, "tooltip": "The height of the latent space (from EmptyLatentImage node). The longest side of the image will be resized to this length. Aspect ratio is preserved."}),
-                    "image": (sorted(files), {"image_upload": True, "tooltip": "Select the image to use for Img2Img."}),
+                    "image": (files, {"image_upload": True, "tooltip": "Select the image to use for Img2Img."}),
                     "max_num_words": ("INT", {
                         "default": 0, "min": 0, "max": 32, "step": 1,
                         "tooltip": "Maximum number of words to keep for both filename outputs. Set to 0 for no limit."
@@ -74,6 +74,9 @@ class AUNImg2Img:
                     "vae": ("VAE", { "tooltip": "The VAE to use for encoding the image to latent space." }),
                     "empty_latent": ("LATENT", { "tooltip": "The empty latent image to use when Img2Img is disabled." }),
                     },
+                "optional": {
+                    "draft_decode": ("BOOLEAN", { "default": True, "tooltip": "When Img2Img downscales the image, decode JPEGs at a reduced scale and box-reduce large images before the Lanczos resize (never below twice the target size). Much faster and lighter for big photos. Disable for a full-resolution decode." }),
+                },
                 "hidden": {"prompt": "PROMPT"}
                 }
 
@@ -85,7 +88,7 @@ class AUNImg2Img:
                     "denoise strength")
     FUNCTION = "load_image"
 
-    def load_image(self, img2img, denoise_strength, image, new_width, new_height, latent_width, latent_height, vae, empty_latent, max_num_words=0, prompt=None):
+    def load_image(self, img2img, denoise_strength, image, new_width, new_height, latent_width, latent_height, vae, empty_latent, max_num_words=0, draft_decode=True, prompt=None):
         image_path = folder_paths.get_annotated_filepath(image)
         filename = image.rsplit('.', 1)[0]  # get image name
         img = node_helpers.pillow(Image.open, image_path)
@@ -120,6 +123,15 @@ class AUNImg2Img:
             # Pass through the empty_latent
             latent_result = empty_latent
 
+        # Downscales may decode and reduce close to the target before the exact resize.
+        use_draft = resize and draft_decode
+
+        def _source_scale(sw, sh):
+            return max(width / sw, height / sh) * RESIZE_GAP
+
+        if use_draft:
+            draft_scale(img, _source_scale(*oriented_size(img)))
+
         # Process the image first
         for i in ImageSequence.Iterator(img):
             i = node_helpers.pillow(ImageOps.exif_transpose, i)
@@ -129,6 +141,8 @@ class AUNImg2Img:
             image = i.convert("RGB")
             
             if resize:
+                if use_draft:
+                    image = reduce_scale(image, _source_scale(*image.size))
                 image = image.resize((width, height), resample=RESAMPLE_LANCZOS)
 
             if len(output_images) == 0:
@@ -1,5 +1,4 @@
 import hashlib
-import os
 import time
 from pathlib import Path
 from PIL.PngImagePlugin import PngInfo
@@ -11,6 +10,7 @@ from PIL import Image, ImageSequence, ImageOps
 from comfy.cli_args import args
 from server import PromptServer
 import re
+from .aun_listing_cache import list_input_files
 
 def clean_filename_for_output(filename_without_ext, max_words=0):
     """Replace symbols with spaces, collapse whitespace, optionally drop a trailing numeric counter,
@@ -49,10 +49,9 @@ def clean_filename_for_output(filename_without_ext, max_words=0):
 class AUNImgLoader:
     @classmethod
     def INPUT_TYPES(cls):
-        input_dir = folder_paths.get_input_directory()
-        files = [f for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
+        files = list_input_files()
         return {"required": {
-                    "image": (sorted(files), {"image_upload": True, "tooltip": "Select the image to load."}),
+                    "image": (files, {"image_upload": True, "tooltip": "Select the image to load."}),
                     "max_num_words": ("INT", {
                         "default": 0, "min": 0, "max": 32, "step": 1,
                         "tooltip": "Maximum number of words to keep for both filename outputs. Set to 0 for no limit."
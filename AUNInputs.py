@@ -2,11 +2,12 @@ import os
 import folder_paths as comfy_paths
 import comfy.sd
 import comfy.utils
-import torch
 import comfy.samplers
 from datetime import datetime
 
 from .AUNResolutionHelper import PRESETS, ASPECT_RATIOS, ASPECT_RATIO_NAMES, ASPECT_MODE_OPTIONS, MEGAPIXELS_WIDGET, MULTIPLE_WIDGET, resolve_dimensions, apply_aspect_mode
+from .aun_latent_factory import empty_latent
+from .aun_listing_cache import lora_names
 
 class AnyType(str):
    
@@ -46,7 +47,7 @@ class AUNInputs:
             'required': {
                 "ckpt_name": (comfy_paths.get_filename_list("checkpoints"), {"tooltip": "The checkpoint model file to load."}),
                 "speed_lora": ("BOOLEAN", {"default": False, "label_on": "On", "label_off": "Off", "tooltip": "Enable or disable SpeedLoRA optimizations."}),
-                "speed_lora_model": (comfy_paths.get_filename_list("loras") + ['None'], {"default": 'None', "tooltip": "The SpeedLoRA model to apply. Select 'None' to disable SpeedLoRA."}),
+                "speed_lora_model": (lora_names() + ['None'], {"default": 'None', "tooltip": "The SpeedLoRA model to apply. Select 'None' to disable SpeedLoRA."}),
                 "speed_lora_strength": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 3.0, "step": 0.01, "round": 0.01, "tooltip": "Multiplier applied to the selected SpeedLoRA weights."}),
                 "clip_skip": ("INT", {"default": -1, "min": -24, "max": -1, "step": 1, "tooltip": "Number of last layers of CLIP to skip. -1 is a good default."}),
                 "sampler": (comfy.samplers.KSampler.SAMPLERS, {"tooltip": "The sampling algorithm to use."}),
@@ -109,7 +110,7 @@ class AUNInputs:
         original_width, original_height = width, height
 
         # Create the empty latent
-        latent = torch.zeros([batch_size, 4, height // 8, width // 8])
+        latent = empty_latent(batch_size, width, height)
 
         # Determine the name to use based on name_mode
         filename_to_process = ManualName if name_mode else auto_name
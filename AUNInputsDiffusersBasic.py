@@ -1,13 +1,13 @@
 import os
 from .AUNResolutionHelper import ASPECT_RATIO_NAMES, ASPECT_MODE_OPTIONS, MEGAPIXELS_WIDGET, MULTIPLE_WIDGET, resolve_dimensions, apply_aspect_mode
 
-import comfy.sample
 import comfy.samplers
 import comfy.sd
 import comfy.utils
 import folder_paths as comfy_paths
-import nodes
-import torch
+from .aun_component_cache import load_clip, load_diffusion_model, load_vae
+from .aun_latent_factory import empty_latent
+from .aun_listing_cache import lora_names
 
 
 class AnyType(str):
@@ -137,7 +137,7 @@ class AUNInputsDiffusersBasic:
                     },
                 ),
                 "speed_lora_model": (
-                    comfy_paths.get_filename_list("loras") + ["None"],
+                    lora_names() + ["None"],
                     {"default": "None", "tooltip": "SpeedLoRA file to apply after loading the model."},
                 ),
                 "speed_lora_strength": (
@@ -273,21 +273,16 @@ class AUNInputsDiffusersBasic:
         self._ensure_valid_choice(clip_name, self._NO_CLIP, "A CLIP file")
         self._ensure_valid_choice(vae_name, self._NO_VAE, "A VAE file")
 
-        diffusion_path = comfy_paths.get_full_path("diffusion_models", diffusion_name)
-        model = comfy.sd.load_diffusion_model(diffusion_path, model_options={})
+        # Components are shared through the component cache, so an unchanged CLIP/VAE is not reloaded.
+        model = load_diffusion_model(self, "model", diffusion_name)
 
         resolved_clip_type = self._CLIP_TYPE_LOOKUP.get(clip_type, clip_type)
         if isinstance(resolved_clip_type, (list, tuple)):
             resolved_clip_type = resolved_clip_type[0] if resolved_clip_type else "stable_diffusion"
         resolved_clip_type = str(resolved_clip_type)
 
-        clip_loader = nodes.CLIPLoader()
-        clip_tuple = clip_loader.load_clip(clip_name=clip_name, type=resolved_clip_type)
-        clip = clip_tuple[0] if isinstance(clip_tuple, (list, tuple)) else clip_tuple
-
-        vae_loader = nodes.VAELoader()
-        vae_tuple = vae_loader.load_vae(vae_name=vae_name)
-        vae = vae_tuple[0] if isinstance(vae_tuple, (list, tuple)) else vae_tuple
+        clip = load_clip(self, "clip", clip_name, resolved_clip_type)
+        vae = load_vae(self, "vae", vae_name)
 
         return model, clip, vae
 
@@ -295,17 +290,7 @@ class AUNInputsDiffusersBasic:
 
     @classmethod
     def _build_latent(cls, model, batch_size, width, height):
-        latent = torch.zeros([batch_size, 4, height // 8, width // 8])
-        try:
-            matched = comfy.sample.fix_empty_latent_channels(model, latent)
-            if hasattr(matched, "shape") and matched.shape[1] != latent.shape[1]:
-                try:
-                    setattr(model, "_aun_latent_channels", matched.shape[1])
-                except Exception:
-                    pass
-            return matched
-        except Exception:
-            return latent
+        return empty_latent(batch_size, width, height, model=model)
 
     def inputs(
         self,
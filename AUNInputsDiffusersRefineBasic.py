@@ -1,13 +1,13 @@
 import os
 from .AUNResolutionHelper import ASPECT_RATIO_NAMES, ASPECT_MODE_OPTIONS, MEGAPIXELS_WIDGET, MULTIPLE_WIDGET, resolve_dimensions, apply_aspect_mode
 
-import comfy.sample
 import comfy.samplers
 import comfy.sd
 import comfy.utils
 import folder_paths as comfy_paths
-import nodes
-import torch
+from .aun_component_cache import load_clip, load_diffusion_model, load_vae, release
+from .aun_latent_factory import empty_latent
+from .aun_listing_cache import lora_names
 
 
 class AnyType(str):
@@ -100,7 +100,7 @@ class AUNInputsDiffusersRefineBasic:
                     },
                 ),
                 "speed_lora_model": (
-                    comfy_paths.get_filename_list("loras") + ["None"],
+                    lora_names() + ["None"],
                     {"default": "None", "tooltip": "SpeedLoRA file to apply after loading the models."},
                 ),
                 "speed_lora_strength": (
@@ -257,10 +257,9 @@ class AUNInputsDiffusersRefineBasic:
         if choice == placeholder:
             raise RuntimeError(f"{label} is required for AUNInputsDiffusersRefineBasic.")
 
-    def _load_diffusion_model(self, diffusion_name):
+    def _load_diffusion_model(self, diffusion_name, slot="model"):
         self._ensure_valid_choice(diffusion_name, self._NO_DIFFUSION, "A diffusion-model file")
-        diffusion_path = comfy_paths.get_full_path("diffusion_models", diffusion_name)
-        return comfy.sd.load_diffusion_model(diffusion_path, model_options={})
+        return load_diffusion_model(self, slot, diffusion_name)
 
     def _load_shared_clip_and_vae(self, clip_name, clip_type, vae_name):
         self._ensure_valid_choice(clip_name, self._NO_CLIP, "A CLIP file")
@@ -271,14 +270,9 @@ class AUNInputsDiffusersRefineBasic:
             resolved_clip_type = resolved_clip_type[0] if resolved_clip_type else "stable_diffusion"
         resolved_clip_type = str(resolved_clip_type)
 
-        clip_loader = nodes.CLIPLoader()
-        clip_tuple = clip_loader.load_clip(clip_name=clip_name, type=resolved_clip_type)
-        clip = clip_tuple[0] if isinstance(clip_tuple, (list, tuple)) else clip_tuple
-
-        vae_loader = nodes.VAELoader()
-        vae_tuple = vae_loader.load_vae(vae_name=vae_name)
-        vae = vae_tuple[0] if isinstance(vae_tuple, (list, tuple)) else vae_tuple
-
+        # Shared with the other loaders through the component cache.
+        clip = load_clip(self, "clip", clip_name, resolved_clip_type)
+        vae = load_vae(self, "vae", vae_name)
         return clip, vae
 
     @staticmethod
@@ -312,17 +306,7 @@ class AUNInputsDiffusersRefineBasic:
 
     @classmethod
     def _build_latent(cls, model, batch_size, width, height):
-        latent = torch.zeros([batch_size, 4, height // 8, width // 8])
-        try:
-            matched = comfy.sample.fix_empty_latent_channels(model, latent)
-            if hasattr(matched, "shape") and matched.shape[1] != latent.shape[1]:
-                try:
-                    setattr(model, "_aun_latent_channels", matched.shape[1])
-                except Exception:
-                    pass
-            return matched
-        except Exception:
-            return latent
+        return empty_latent(batch_size, width, height, model=model)
 
     def inputs(
         self,
@@ -354,8 +338,9 @@ class AUNInputsDiffusersRefineBasic:
 
         refine_name = os.path.splitext(os.path.basename(refine_diffusion_name))[0]
         if refine_diffusion_name not in (None, "", "None"):
-            refine_model = self._mark_latent_processing(self._load_diffusion_model(refine_diffusion_name))
+            refine_model = self._mark_latent_processing(self._load_diffusion_model(refine_diffusion_name, "refine_model"))
         else:
+            release(self, "refine_model")
             refine_model = self._mark_latent_processing(self._clone_model_if_possible(model))
             refine_name = os.path.splitext(os.path.basename(diffusion_name))[0]
 
@@ -1,13 +1,13 @@
 import os
 from .AUNResolutionHelper import ASPECT_RATIO_NAMES, ASPECT_MODE_OPTIONS, MEGAPIXELS_WIDGET, MULTIPLE_WIDGET, resolve_dimensions, apply_aspect_mode
-import torch
 from datetime import datetime
 
 import comfy.sd
-import comfy.sample
 import comfy.utils
-import nodes
 import folder_paths as comfy_paths
+from .aun_component_cache import load_clip, load_diffusion_model, load_vae, release
+from .aun_latent_factory import empty_latent
+from .aun_listing_cache import lora_names
 
 
 class AnyType(str):
@@ -143,7 +143,7 @@ class AUNInputsHybrid:
                     },
                 ),
                 "speed_lora_model": (
-                    comfy_paths.get_filename_list("loras"),
+                    lora_names(),
                     {"default": "", "tooltip": "SpeedLoRA file to apply after loading the model."},
                 ),
                 "speed_lora_strength": (
@@ -364,27 +364,26 @@ class AUNInputsHybrid:
         self._ensure_valid_choice(clip_name, self._NO_CLIP, "A CLIP file")
         self._ensure_valid_choice(vae_name, self._NO_VAE, "A VAE file")
 
-        diffusion_path = comfy_paths.get_full_path("diffusion_models", diffusion_name)
-        model = comfy.sd.load_diffusion_model(diffusion_path, model_options={})
+        # Components are shared through the component cache, so an unchanged CLIP/VAE is not reloaded.
+        model = load_diffusion_model(self, "model", diffusion_name)
 
         resolved_clip_type = self._CLIP_TYPE_LOOKUP.get(clip_type, clip_type)
         if isinstance(resolved_clip_type, (list, tuple)):
             resolved_clip_type = resolved_clip_type[0] if resolved_clip_type else "stable_diffusion"
         resolved_clip_type = str(resolved_clip_type)
-        clip_loader = nodes.CLIPLoader()
-        clip_tuple = clip_loader.load_clip(clip_name=clip_name, type=resolved_clip_type)
-        clip = clip_tuple[0] if isinstance(clip_tuple, (list, tuple)) else clip_tuple
-
-        vae_loader = nodes.VAELoader()
-        vae_tuple = vae_loader.load_vae(vae_name=vae_name)
-        vae = vae_tuple[0] if isinstance(vae_tuple, (list, tuple)) else vae_tuple
+        clip = load_clip(self, "clip", clip_name, resolved_clip_type)
+        vae = load_vae(self, "vae", vae_name)
 
         return model, clip, vae
 
     @staticmethod
     def _apply_clip_skip(clip, clip_skip):
         if hasattr(clip, "clip_layer"):
+            # Cached CLIPs are shared, so the layer is set on a clone.
+            if hasattr(clip, "clone"):
+                clip = clip.clone()
             clip.clip_layer(clip_skip)
+        return clip
 
 
 
@@ -401,19 +400,7 @@ class AUNInputsHybrid:
 
     @classmethod
     def _build_latent(cls, model, batch_size, width, height, force_match=False):
-        latent = torch.zeros([batch_size, 4, height // 8, width // 8])
-        if not force_match:
-            return latent
-        try:
-            matched = comfy.sample.fix_empty_latent_channels(model, latent)
-            if hasattr(matched, "shape") and matched.shape[1] != latent.shape[1]:
-                try:
-                    setattr(model, "_aun_latent_channels", matched.shape[1])
-                except Exception:
-                    pass
-            return matched
-        except Exception:
-            return latent
+        return empty_latent(batch_size, width, height, model=model if force_match else None)
 
     def inputs(
         self,
@@ -457,6 +444,8 @@ class AUNInputsHybrid:
             except Exception:
                 pass
         else:
+            # The cached diffusion components this node held are no longer in use.
+            release(self)
             model, clip, vae = self._load_checkpoint_bundle(ckpt_name)
             ckpt_label = os.path.splitext(os.path.basename(ckpt_name))[0]
             force_match = False
@@ -465,7 +454,7 @@ class AUNInputsHybrid:
             except Exception:
                 pass
 
-        self._apply_clip_skip(clip, clip_skip)
+        clip = self._apply_clip_skip(clip, clip_skip)
 
         if speed_lora:
             lora_choice = speed_lora_model if speed_lora_model not in (None, "", "None") else None
@@ -4,9 +4,10 @@ import comfy.samplers
 import comfy.sd
 import comfy.utils
 import folder_paths as comfy_paths
-import torch
 
 from .AUNResolutionHelper import ASPECT_RATIO_NAMES, ASPECT_MODE_OPTIONS, MEGAPIXELS_WIDGET, MULTIPLE_WIDGET, resolve_dimensions, apply_aspect_mode
+from .aun_latent_factory import empty_latent
+from .aun_listing_cache import lora_names
 
 
 class AnyType(str):
@@ -32,7 +33,7 @@ class AUNInputsRefineBasic:
                 "ckpt_name": (comfy_paths.get_filename_list("checkpoints"), {"tooltip": "The checkpoint model file to load."}),
                 "refine_ckpt": (comfy_paths.get_filename_list("checkpoints") + ["None"], {"default": "None", "tooltip": "An optional refinement checkpoint to load as a separate refine model. Select 'None' to reuse the main model."}),
                 "speed_lora": ("BOOLEAN", {"default": False, "label_on": "On", "label_off": "Off", "tooltip": "Enable or disable SpeedLoRA optimizations."}),
-                "speed_lora_model": (comfy_paths.get_filename_list("loras") + ["None"], {"default": "None", "tooltip": "The SpeedLoRA model to apply. Select 'None' to disable SpeedLoRA."}),
+                "speed_lora_model": (lora_names() + ["None"], {"default": "None", "tooltip": "The SpeedLoRA model to apply. Select 'None' to disable SpeedLoRA."}),
                 "speed_lora_strength": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 3.0, "step": 0.01, "round": 0.01, "tooltip": "Multiplier applied to the selected SpeedLoRA weights."}),
                 "speed_lora_full_both": ("BOOLEAN", {"default": False, "label_on": "On", "label_off": "Off", "tooltip": "Apply the full SpeedLoRA strength to both the main and refine models."}),
                 "speed_lora_ratio": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 1.0, "step": 0.01, "round": 0.01, "tooltip": "Share of the SpeedLoRA strength applied to the main model. The refine model receives the remaining share."}),
@@ -160,7 +161,7 @@ class AUNInputsRefineBasic:
         width, height = resolve_dimensions(width, height, aspect_ratio, megapixels, multiple)
         width, height = apply_aspect_mode(width, height, aspect_mode)
 
-        latent = torch.zeros([batch_size, 4, height // 8, width // 8])
+        latent = empty_latent(batch_size, width, height)
 
         return (
             model,
@@ -1,3 +1,7 @@
+from .aun_event_bus import queue_event
+from .aun_keyword_matcher import MATCH_MODES, get_matcher, split_keywords
+
+
 class AUNKeywordFaceIDSettings:
     MAX_INPUTS = 6
     MIN_VISIBLE_INPUTS = 2
@@ -74,14 +78,14 @@ class AUNKeywordFaceIDSettings:
                 "default": "",
                 "forceInput": True,
                 "multiline": True,
-                "tooltip": "Text to scan for keywords. Keywords are matched as substrings.",
+                "tooltip": "Text to scan for keywords. Keywords are matched as substrings unless match_mode says otherwise.",
             }),
         }
 
         for i in range(1, cls.MAX_INPUTS + 1):
             optional["keyword%d" % i] = ("STRING", {
                 "default": "",
-                "tooltip": "Keyword %d to match against the reference phrase. Matched as a substring. Comma-separated to allow multiple keywords on this row (any one matching activates it)." % i,
+                "tooltip": "Keyword %d to match against the reference phrase (see match_mode). Comma-separated to allow multiple keywords on this row (any one matching activates it)." % i,
             })
             optional["preset%d" % i] = (cls.UNIFIED_PRESETS, {
                 "default": "PLUS FACE (portraits)",
@@ -104,6 +108,11 @@ class AUNKeywordFaceIDSettings:
                 "tooltip": "IPAdapterFaceID weight_type for keyword %d." % i,
             })
 
+        optional["match_mode"] = (MATCH_MODES, {
+            "default": "substring",
+            "tooltip": "substring: keywords match anywhere. whole word: keywords must not be part of a longer word. regex: each keyword is a regular expression.",
+        })
+
         return {
             "required": required,
             "optional": optional,
@@ -120,7 +129,8 @@ class AUNKeywordFaceIDSettings:
     CATEGORY = "AUN Nodes/IPAdapter"
     DESCRIPTION = (
         "Select FaceID/IPAdapter settings based on keyword matching in a reference phrase. "
-        "Keywords are matched as substrings (case-insensitive by default); first match wins "
+        "Keywords are matched as substrings (case-insensitive by default), as whole words, "
+        "or as regular expressions; first match wins "
         "(top-to-bottom order). Each preset row holds the 8 settings consumed by an "
         "IPAdapterUnifiedLoader + IPAdapterSimple + IPAdapterUnifiedLoaderFaceID + "
         "IPAdapterFaceID combination (e.g. a FaceIDPreset subgraph): preset, weight, "
@@ -145,30 +155,21 @@ class AUNKeywordFaceIDSettings:
             return default
         return max(low, min(v, high))
 
-    def _select_settings(self, visible_inputs, case_sensitive, reference_phrase, manual_preset, match_keywords, **kwargs):
+    def _select_settings(self, visible_inputs, case_sensitive, reference_phrase, manual_preset, match_keywords,
+                         match_mode="substring", **kwargs):
         manual_n = min(int(manual_preset), visible_inputs)
         keywords_on = match_keywords == "Yes"
 
-        search = reference_phrase if case_sensitive else reference_phrase.lower()
-
         matched = None
         matched_keyword = ""
         matched_index = 0
         if keywords_on:
-            for i in range(1, visible_inputs + 1):
-                raw = kwargs.get("keyword%d" % i, "")
-                sub_keywords = [k.strip() for k in str(raw).split(",") if k.strip()]
-                if not sub_keywords:
-                    continue
-                for sub in sub_keywords:
-                    match_kw = sub if case_sensitive else sub.lower()
-                    if match_kw in search:
-                        matched = i
-                        matched_keyword = sub
-                        matched_index = i
-                        break
-                if matched is not None:
-                    break
+            rows = tuple(split_keywords(kwargs.get("keyword%d" % i, "")) for i in range(1, visible_inputs + 1))
+            match = get_matcher(rows, bool(case_sensitive), match_mode).first(reference_phrase)
+            if match is not None:
+                matched = match.row
+                matched_keyword = match.keyword
+                matched_index = match.row
 
         def _row(i):
             return (
@@ -206,13 +207,13 @@ class AUNKeywordFaceIDSettings:
         )
 
     def select_settings(self, visible_inputs, case_sensitive, reference_phrase="",
-                        manual_preset="1", match_keywords="Yes",
+                        manual_preset="1", match_keywords="Yes", match_mode="substring",
                         unique_id=None, extra_pnginfo=None, **kwargs):
         visible_inputs = max(self.MIN_VISIBLE_INPUTS,
                              min(int(visible_inputs or self.MIN_VISIBLE_INPUTS), self.MAX_INPUTS))
 
         result = self._select_settings(visible_inputs, case_sensitive, reference_phrase,
-                                       manual_preset, match_keywords, **kwargs)
+                                       manual_preset, match_keywords, match_mode, **kwargs)
 
         self._notify_executed(unique_id, result)
 
@@ -222,9 +223,7 @@ class AUNKeywordFaceIDSettings:
         if unique_id is None:
             return
         try:
-            from server import PromptServer  # type: ignore[import-not-found]
-
-            PromptServer.instance.send_sync(
+            queue_event(
                 "AUN_keyword_faceid_settings_executed",
                 {
                     "node_id": str(unique_id),
@@ -240,6 +239,7 @@ class AUNKeywordFaceIDSettings:
                     "matched_index": int(result[9]),
                     "preset_number": result[11],
                 },
+                key=("AUN_keyword_faceid_settings_executed", str(unique_id)),
             )
         except Exception:
             pass
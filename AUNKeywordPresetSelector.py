@@ -1,3 +1,7 @@
+from .aun_event_bus import queue_event
+from .aun_keyword_matcher import MATCH_MODES, get_matcher, split_keywords
+
+
 class AUNKeywordPresetSelector:
     MAX_INPUTS = 20
     MIN_VISIBLE_INPUTS = 2
@@ -26,7 +30,7 @@ class AUNKeywordPresetSelector:
                     "default": "",
                     "forceInput": True,
                     "multiline": True,
-                    "tooltip": "Text to scan for keywords. Keywords are matched as substrings."
+                    "tooltip": "Text to scan for keywords. Keywords are matched as substrings unless match_mode says otherwise."
                 }),
             },
             "hidden": {"unique_id": "UNIQUE_ID", "extra_pnginfo": "EXTRA_PNGINFO"},
@@ -47,7 +51,7 @@ class AUNKeywordPresetSelector:
                 "STRING",
                 {
                     "default": "",
-                    "tooltip": "Keyword %d to match against the reference phrase. Matched as a substring. Comma-separated to allow multiple keywords on this row (any one matching activates it)." % i,
+                    "tooltip": "Keyword %d to match against the reference phrase (see match_mode). Comma-separated to allow multiple keywords on this row (any one matching activates it)." % i,
                 },
             )
             inputs["optional"]["preset%d" % i] = (
@@ -59,6 +63,14 @@ class AUNKeywordPresetSelector:
                 },
             )
 
+        inputs["optional"]["match_mode"] = (
+            MATCH_MODES,
+            {
+                "default": "substring",
+                "tooltip": "substring: keywords match anywhere. whole word: keywords must not be part of a longer word. regex: each keyword is a regular expression.",
+            },
+        )
+
         return inputs
 
     RETURN_TYPES = ("STRING", "STRING", "INT")
@@ -67,7 +79,8 @@ class AUNKeywordPresetSelector:
     CATEGORY = "AUN Nodes/Prompts"
     DESCRIPTION = (
         "Select a preset value based on keyword matching in a reference phrase. "
-        "Keywords are matched as substrings (case-insensitive by default). "
+        "Keywords are matched as substrings (case-insensitive by default), as whole "
+        "words, or as regular expressions. "
         "First match wins (top-to-bottom order). Useful for automating workflow "
         "selection based on text analysis."
     )
@@ -77,28 +90,19 @@ class AUNKeywordPresetSelector:
         return float("nan")
 
     def select_preset(self, visible_inputs, case_sensitive,
-                      reference_phrase="", unique_id=None, extra_pnginfo=None, **kwargs):
+                      reference_phrase="", unique_id=None, extra_pnginfo=None, match_mode="substring", **kwargs):
         visible_inputs = max(self.MIN_VISIBLE_INPUTS, min(int(visible_inputs or 5), self.MAX_INPUTS))
-        search = reference_phrase if case_sensitive else reference_phrase.lower()
 
         selected_value = ""
         matched_keyword = ""
         matched_index = 0
 
-        for i in range(1, visible_inputs + 1):
-            raw = kwargs.get("keyword%d" % i, "")
-            sub_keywords = [k.strip() for k in str(raw).split(",") if k.strip()]
-            if not sub_keywords:
-                continue
-            for sub in sub_keywords:
-                match_kw = sub if case_sensitive else sub.lower()
-                if match_kw in search:
-                    selected_value = kwargs.get("preset%d" % i, "")
-                    matched_keyword = sub
-                    matched_index = i
-                    break
-            if matched_index:
-                break
+        rows = tuple(split_keywords(kwargs.get("keyword%d" % i, "")) for i in range(1, visible_inputs + 1))
+        match = get_matcher(rows, bool(case_sensitive), match_mode).first(reference_phrase)
+        if match is not None:
+            selected_value = kwargs.get("preset%d" % match.row, "")
+            matched_keyword = match.keyword
+            matched_index = match.row
 
         if matched_index == 0:
             selected_value = kwargs.get("preset_default", "")
@@ -110,9 +114,7 @@ class AUNKeywordPresetSelector:
         if unique_id is None:
             return
         try:
-            from server import PromptServer  # type: ignore[import-not-found]
-
-            PromptServer.instance.send_sync(
+            queue_event(
                 "AUN_keyword_preset_selector_executed",
                 {
                     "node_id": str(unique_id),
@@ -120,6 +122,7 @@ class AUNKeywordPresetSelector:
                     "matched_keyword": str(matched_keyword),
                     "matched_index": int(matched_index),
                 },
+                key=("AUN_keyword_preset_selector_executed", str(unique_id)),
             )
         except Exception:
             pass
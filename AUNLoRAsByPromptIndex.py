@@ -2,6 +2,10 @@ import comfy.sd
 import comfy.utils
 import folder_paths
 
+from .aun_event_bus import queue_event
+from .aun_listing_cache import lora_names
+from .aun_perf import stage as perf_stage
+
 
 class AUNLoRAsByPromptIndex:
     MAX_PROMPTS = 20
@@ -9,13 +13,7 @@ class AUNLoRAsByPromptIndex:
 
     @classmethod
     def _lora_choices(cls):
-        try:
-            files = folder_paths.get_filename_list("loras")
-        except Exception:
-            files = []
-        if not isinstance(files, list):
-            files = []
-        return ["None"] + files
+        return ["None"] + lora_names()
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -201,12 +199,10 @@ class AUNLoRAsByPromptIndex:
         if unique_id is None:
             return
         try:
-            from server import PromptServer  # type: ignore[import-not-found]
-
             node_id = self._normalize_node_id(unique_id)
             if node_id is None:
                 return
-            PromptServer.instance.send_sync(
+            queue_event(
                 "AUN_random_lora_multi_selected",
                 {
                     "node_id": str(node_id),
@@ -215,6 +211,7 @@ class AUNLoRAsByPromptIndex:
                     "trigger_words_list": [str(t or "") for t in trigger_words_list],
                     "apply_lora": bool(apply_lora),
                 },
+                key=("AUN_random_lora_multi_selected", str(node_id)),
             )
         except Exception:
             pass
@@ -302,7 +299,8 @@ class AUNLoRAsByPromptIndex:
                 continue
 
             try:
-                lora_weights = comfy.utils.load_torch_file(lora_path, safe_load=True)
+                with perf_stage("lora.load"):
+                    lora_weights = comfy.utils.load_torch_file(lora_path, safe_load=True)
                 current_model, current_clip = comfy.sd.load_lora_for_models(
                     current_model,
                     current_clip,
@@ -3,6 +3,7 @@ import os
 import comfy.sd
 import comfy.utils
 import folder_paths
+from .aun_perf import stage as perf_stage
 
 
 class AUNLoraLoaderModelOnlyFromString:
@@ -89,7 +90,9 @@ class AUNLoraLoaderModelOnlyFromString:
         if not lora_path:
             raise FileNotFoundError(f"LoRA not found: {lora_name}")
 
-        lora_weights = comfy.utils.load_torch_file(lora_path, safe_load=True)
+        with perf_stage("lora.load"):
+
+            lora_weights = comfy.utils.load_torch_file(lora_path, safe_load=True)
         loaded_model, _ = comfy.sd.load_lora_for_models(model, None, lora_weights, float(strength_model), 0.0)
 
         resolved = os.path.basename(lora_path)
@@ -1,6 +1,8 @@
 import comfy.sd
 import comfy.utils
 import folder_paths
+from .aun_listing_cache import lora_names
+from .aun_perf import stage as perf_stage
 
 
 class AUNLoraStackWithTriggers:
@@ -8,13 +10,7 @@ class AUNLoraStackWithTriggers:
 
     @classmethod
     def _lora_choices(cls):
-        try:
-            files = folder_paths.get_filename_list("loras")
-        except Exception:
-            files = []
-        if not isinstance(files, list):
-            files = []
-        return ["None"] + files
+        return ["None"] + lora_names()
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -247,7 +243,8 @@ class AUNLoraStackWithTriggers:
             if not lora_path:
                 continue
             try:
-                lora_weights = comfy.utils.load_torch_file(lora_path, safe_load=True)
+                with perf_stage("lora.load"):
+                    lora_weights = comfy.utils.load_torch_file(lora_path, safe_load=True)
                 loaded_model, _ = comfy.sd.load_lora_for_models(
                     loaded_model,
                     None,
@@ -2,6 +2,8 @@ import numpy as np
 import torch
 from PIL import Image, ImageDraw, ImageFont
 
+from .aun_lazy_switch import pending_inputs
+
 
 class AUNManualAutoImageSwitch:
     @staticmethod
@@ -18,11 +20,12 @@ class AUNManualAutoImageSwitch:
     def INPUT_TYPES(cls):
         return {
             "required": {
-                "image": ("IMAGE", {"tooltip": "Image to pass through when Name Mode is Auto."}),
+                "image": ("IMAGE", {"tooltip": "Image to pass through when Name Mode is Auto. Not evaluated in Manual mode.", "lazy": True}),
                 "Filename": ("STRING", {
                     "multiline": False,
                     "default": "",
                     "forceInput": False,
+                    "lazy": True,
                     "tooltip": "The automatically generated filename."
                 }),
                 "width": ("INT", {
@@ -154,6 +157,12 @@ class AUNManualAutoImageSwitch:
         image_tensor = torch.from_numpy(image_np).unsqueeze(0)
         return image_tensor.to(dtype=dtype, device=device)
 
+    def check_lazy_status(self, name_mode, **kwargs):
+        # Manual mode outputs a blank image and ManualName, so the upstream branch is skipped.
+        if not name_mode:
+            return []
+        return pending_inputs(kwargs, ["image", "Filename"])
+
     @classmethod
     def IS_CHANGED(cls, image, Filename, width, height, ManualName, name_mode, show_overlay, overlay_text, background_color, text_color, box_color):
         return float("nan")
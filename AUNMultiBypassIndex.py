@@ -1,3 +1,6 @@
+from .aun_event_bus import BYPASS_EVENT, queue_node_mode
+
+
 class AUNMultiBypassIndex:
     @classmethod
     def INPUT_TYPES(cls):
@@ -33,8 +36,6 @@ class AUNMultiBypassIndex:
                       node_ids_16, node_ids_17, node_ids_18,
                       node_ids_19, node_ids_20):
         try:
-            from server import PromptServer
-
             all_inputs = [
                 node_ids_1, node_ids_2, node_ids_3,
                 node_ids_4, node_ids_5, node_ids_6,
@@ -62,12 +63,9 @@ class AUNMultiBypassIndex:
                     except ValueError as e:
                         print(f"[AUNMultiBypassIndex] Invalid node ID string for set {group_idx + 1}: '{node_ids_str}'. Must be comma-separated integers. Error: {e}")
 
-            if node_states:
-                mute_clear = [{"node_id": nid, "is_active": True} for nid in node_states.keys()]
-                PromptServer.instance.send_sync("AUN-node-mute-state", {"updates": mute_clear})
-
-                bypass_updates = [{"node_id": nid, "is_active": active} for nid, active in node_states.items()]
-                PromptServer.instance.send_sync("AUN_node_bypass_state", {"updates": bypass_updates})
+            # Bypass supersedes the mute-clear for the same node, so only bypass states are queued.
+            for nid, active in node_states.items():
+                queue_node_mode(BYPASS_EVENT, nid, active)
 
         except Exception as e:
             print(f"[AUNMultiBypassIndex] Could not send bypass state: {e}")
@@ -2,7 +2,7 @@ import json
 import random
 import re
 import time
-from server import PromptServer
+from .aun_event_bus import queue_event
 
 class AUNMultiGroupUniversal:
     def __init__(self):
@@ -172,7 +172,7 @@ class AUNMultiGroupUniversal:
 
                 if target_groups:
                     state_changes = self._compute_state_changes(mode)
-                    PromptServer.instance.send_sync("AUN_universal_update", {
+                    queue_event("AUN_universal_update", {
                         "mode": mode,
                         "groups": target_groups,
                         "state_changes": state_changes
@@ -202,10 +202,10 @@ class AUNMultiGroupUniversal:
                         kwargs[f"switch_{i}"] = (1 <= active_slot <= slot_count) and (i == active_slot)
                     
                     # Tell frontend to update the UI switches
-                    PromptServer.instance.send_sync("AUN_update_switches", {
+                    queue_event("AUN_update_switches", {
                         "node_id": unique_id,
                         "active_slot": active_slot
-                    })
+                    }, key=("AUN_update_switches", str(unique_id)))
 
             # Collect active groups
             active_groups = []
@@ -247,7 +247,7 @@ class AUNMultiGroupUniversal:
             # Send updates to frontend
             if target_groups:
                 state_changes = self._compute_state_changes(mode)
-                PromptServer.instance.send_sync("AUN_universal_update", {
+                queue_event("AUN_universal_update", {
                     "mode": mode,
                     "groups": target_groups,
                     "state_changes": state_changes
@@ -1,3 +1,6 @@
+from .aun_event_bus import MUTE_EVENT, queue_node_mode
+
+
 class AUNMultiMuteIndex:
     @classmethod
     def INPUT_TYPES(cls):
@@ -34,8 +37,6 @@ class AUNMultiMuteIndex:
                       node_ids_16, node_ids_17, node_ids_18,
                       node_ids_19, node_ids_20):
         try:
-            from server import PromptServer
-
             all_inputs = [
                 node_ids_1, node_ids_2, node_ids_3,
                 node_ids_4, node_ids_5, node_ids_6,
@@ -63,12 +64,9 @@ class AUNMultiMuteIndex:
                     except ValueError as e:
                         print(f"[AUNMultiMuteIndex] Invalid node ID string for set {group_idx + 1}: '{node_ids_str}'. Must be comma-separated integers. Error: {e}")
 
-            if node_states:
-                bypass_clear = [{"node_id": nid, "is_active": True} for nid in node_states.keys()]
-                PromptServer.instance.send_sync("AUN_node_bypass_state", {"updates": bypass_clear})
-
-                mute_updates = [{"node_id": nid, "is_active": active} for nid, active in node_states.items()]
-                PromptServer.instance.send_sync("AUN-node-mute-state", {"updates": mute_updates})
+            # Mute supersedes the bypass-clear for the same node, so only mute states are queued.
+            for nid, active in node_states.items():
+                queue_node_mode(MUTE_EVENT, nid, active)
 
         except Exception as e:
             print(f"[AUNMultiMuteIndex] Could not send mute state: {e}")
@@ -1,5 +1,7 @@
 import random
 
+from .aun_prompt_library import TextPromptLibrary, select_library
+
 class AUNMultiPromptCycler:
     DESCRIPTION = "Outputs all prompts matching a range or search query as lists. Each list element triggers a separate downstream execution."
 
@@ -16,6 +18,9 @@ class AUNMultiPromptCycler:
             "Laboratory:A steampunk laboratory with brass gears and steam.",
             "Garden:A magical garden with glowing flowers and butterflies."
         ]
+        self._examples = TextPromptLibrary(
+            self.example_prompts, [f"Prompt {i}" for i in range(1, len(self.example_prompts) + 1)]
+        )
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -37,6 +42,11 @@ class AUNMultiPromptCycler:
                     "dynamicPrompts": True,
                     "default": "Enter prompts here...",
                     "tooltip": "Enter your own prompts, one per line. Optional title: use 'Title: Prompt text' format. Lines without a title get auto-generated ones (e.g., 'Prompt 1')."
+                }),
+                "prompt_file": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "tooltip": "Optional prompt library file (same one-per-line format), absolute or relative to the ComfyUI input folder. Used instead of custom_prompts when set. Large files are read on demand."
                 })
             },
             "hidden": {
@@ -51,24 +61,8 @@ class AUNMultiPromptCycler:
     CATEGORY = "AUN Nodes/Prompts"
     OUTPUT_NODE = True
 
-    def _parse_prompts(self, custom_prompts):
-        prompts_to_use = self.example_prompts
-        titles_to_use = [f"Prompt {i}" for i in range(1, len(self.example_prompts) + 1)]
-        if custom_prompts and custom_prompts.strip():
-            parsed = []
-            for i, line in enumerate(custom_prompts.split('\n'), 1):
-                line = line.strip()
-                if not line:
-                    continue
-                if ":" in line:
-                    title, _, prompt_text = line.partition(":")
-                    parsed.append((prompt_text.strip(), title.strip()))
-                else:
-                    parsed.append((line, f"Prompt {i}"))
-            if parsed:
-                prompts_to_use = [p for p, _ in parsed]
-                titles_to_use = [t for _, t in parsed]
-        return prompts_to_use, titles_to_use
+    def _parse_prompts(self, custom_prompts, prompt_file=""):
+        return select_library(custom_prompts, prompt_file, self._examples, "AUNMultiPromptCycler")
 
     def _fallback(self):
         return ([""], [""])
@@ -103,37 +97,28 @@ class AUNMultiPromptCycler:
             return list(range(1, max_len + 1))
         return sorted(set(indices))
 
-    def _get_search_matches(self, query, prompts_to_use, titles_to_use):
+    def _get_search_matches(self, query, library):
         if not query.strip():
             return []
-        or_groups = [g.strip().lower().split() for g in query.split(",") if g.strip()]
-        if not or_groups:
-            return []
-        def matches(text):
-            t = text.lower()
-            return any(all(word in t for word in group) for group in or_groups)
-        return [(p, t) for p, t in zip(prompts_to_use, titles_to_use) if matches(p)]
+        return library.get_many(library.search(query))
 
-    def get_prompts(self, mode, mode_input, custom_prompts="", unique_id=None, **kwargs):
-        prompts_to_use, titles_to_use = self._parse_prompts(custom_prompts)
-        if not prompts_to_use:
+    def get_prompts(self, mode, mode_input, custom_prompts="", prompt_file="", unique_id=None, **kwargs):
+        library = self._parse_prompts(custom_prompts, prompt_file)
+        if not len(library):
             return self._fallback()
 
         if mode == "range":
-            indices = self._get_range_indices(mode_input, len(prompts_to_use))
+            indices = self._get_range_indices(mode_input, len(library))
             if not indices:
                 return self._fallback()
-            prompts = [prompts_to_use[i - 1] for i in indices]
-            titles = [titles_to_use[i - 1] for i in indices]
-            return (prompts, titles)
-
+            pairs = library.get_many(indices)
         else:
-            matches = self._get_search_matches(mode_input, prompts_to_use, titles_to_use)
-            if not matches:
+            pairs = self._get_search_matches(mode_input, library)
+            if not pairs:
                 return self._fallback()
-            prompts = [p for p, _ in matches]
-            titles = [t for _, t in matches]
-            return (prompts, titles)
+        prompts = [p for p, _ in pairs]
+        titles = [t for _, t in pairs]
+        return (prompts, titles)
 
     @classmethod
     def IS_CHANGED(cls, **kwargs):
@@ -1,8 +1,37 @@
+import functools
 import json
 import random
 import re
 import time
-from server import PromptServer
+from .aun_event_bus import queue_event
+from .aun_workflow_index import get_workflow_index
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_targets(targets_str):
+    """Split a targets widget value once per distinct value."""
+    return tuple(s.strip() for s in re.split(r'[,\n;]+', targets_str) if s.strip())
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_title_spec(targets):
+    """Lowercased (includes, excludes) for a title group; '!'/'-' mark exclusions."""
+    includes, excludes = [], []
+    for target in targets:
+        if target[0] in "!-":
+            cleaned = target[1:].strip().lower()
+            if cleaned:
+                excludes.append(cleaned)
+        else:
+            includes.append(target.lower())
+    return tuple(includes), tuple(excludes)
+
+
+def _compile_id_spec(targets):
+    """Concrete IDs of an ID group with exclusions removed."""
+    excludes = {t[1:].strip() for t in targets if t[0] in "!-"}
+    return [t for t in targets if t[0] not in "!-" and t not in excludes]
+
 
 class AUNMultiUniversal:
     def __init__(self):
@@ -30,7 +59,7 @@ class AUNMultiUniversal:
                     "tooltip": "Show boolean output pins for each slot."
                 }),
             },
-            "hidden": {"unique_id": "UNIQUE_ID"}
+            "hidden": {"unique_id": "UNIQUE_ID", "extra_pnginfo": "EXTRA_PNGINFO"}
         }
         
         # Pre-define 20 slots in required to ensure proper validation and widget behavior
@@ -127,7 +156,37 @@ class AUNMultiUniversal:
         else:
             return ["bypass", "mute"]
 
-    def execute(self, mode, slot_count, toggle_restriction, show_outputs, AllSwitch, control_mode="manual", Index=0, unique_id=None, **kwargs):
+    @staticmethod
+    def _resolve_title_groups(target_groups, extra_pnginfo):
+        """Turn Title groups into concrete node IDs using the queued workflow.
+
+        Groups are applied in order by the frontend (the last write to a node
+        wins), so the final state per node is computed the same way here.
+        Falls back to the unresolved groups when the workflow is unavailable
+        or contains subgraphs.
+        """
+        index = get_workflow_index(extra_pnginfo)
+        if index is None or not index.resolvable:
+            return target_groups
+
+        node_states = {}
+        for group in target_groups:
+            if group["type"] == "ID":
+                node_ids = _compile_id_spec(group["targets"])
+            else:
+                includes, excludes = _compile_title_spec(tuple(group["targets"]))
+                node_ids = index.match_titles(includes, excludes) if includes else ()
+            for node_id in node_ids:
+                node_states[node_id] = group["is_active"]
+
+        active_ids = [nid for nid, active in node_states.items() if active]
+        inactive_ids = [nid for nid, active in node_states.items() if not active]
+        resolved = []
+        if active_ids: resolved.append({"type": "ID", "targets": active_ids, "is_active": True})
+        if inactive_ids: resolved.append({"type": "ID", "targets": inactive_ids, "is_active": False})
+        return resolved
+
+    def execute(self, mode, slot_count, toggle_restriction, show_outputs, AllSwitch, control_mode="manual", Index=0, unique_id=None, extra_pnginfo=None, **kwargs):
         try:
             # If only one slot is active, AllSwitch is redundant and hidden in UI
             if slot_count == 1:
@@ -153,10 +212,10 @@ class AUNMultiUniversal:
                         kwargs[f"switch_{i}"] = (1 <= active_slot <= slot_count) and (i == active_slot)
                     
                     # Tell frontend to update the UI switches
-                    PromptServer.instance.send_sync("AUN_update_switches", {
+                    queue_event("AUN_update_switches", {
                         "node_id": unique_id,
                         "active_slot": active_slot
-                    })
+                    }, key=("AUN_update_switches", str(unique_id)))
 
             # Collect active groups
             active_labels = []
@@ -183,8 +242,7 @@ class AUNMultiUniversal:
                             active_labels.append(label)
 
                     if targets_str and targets_str != "0":
-                        targets = [s.strip() for s in re.split(r'[,\n;]+', targets_str) if s.strip()]
-                        for t in targets:
+                        for t in _compile_targets(targets_str):
                             if target_type == "ID":
                                 # Prioritize True (Active)
                                 if id_states.get(t) is not True:
@@ -209,9 +267,12 @@ class AUNMultiUniversal:
             if active_titles: target_groups.append({"type": "Title", "targets": active_titles, "is_active": True})
             if inactive_titles: target_groups.append({"type": "Title", "targets": inactive_titles, "is_active": False})
 
+            if title_states:
+                target_groups = self._resolve_title_groups(target_groups, extra_pnginfo)
+
             # Send updates to frontend
             if target_groups:
-                PromptServer.instance.send_sync("AUN_universal_update", {
+                queue_event("AUN_universal_update", {
                     "mode": mode,
                     "groups": target_groups,
                     "state_changes": state_changes
@@ -1,3 +1,8 @@
+from server import PromptServer
+
+from .aun_event_bus import BYPASS_EVENT, MUTE_EVENT, queue_event, queue_node_mode
+
+
 class AUNNodeStateController:
     """Combine collapse/expand and bypass/mute controls targeting nodes by:
     - Node IDs (comma separated list)
@@ -54,12 +59,6 @@ class AUNNodeStateController:
         return [l.strip() for l in re.split(r'[,\n;]+', text) if l.strip()]
 
     def execute(self, target_mode, node_ids, group_title, group_exclude_titles, node_titles, combined, use_mute, collapse, active):
-        try:
-            from server import PromptServer
-        except Exception as e:
-            print(f"[AUNNodeStateController] Could not import PromptServer: {e}")
-            return ()
-
         try:
             combined = bool(combined)
             use_mute = bool(use_mute)
@@ -70,25 +69,12 @@ class AUNNodeStateController:
                 id_list = self._parse_node_ids(node_ids)
                 if not id_list:
                     return ()
+                mode_event = MUTE_EVENT if use_mute else BYPASS_EVENT
                 for nid in id_list:
-                    if combined:
-                        # collapse + disable
-                        PromptServer.instance.send_sync("AUN_set_collapse_state", {"node_id": nid, "collapse": True})
-                        if use_mute:
-                            PromptServer.instance.send_sync("AUN-node-mute-state", {"node_id": nid, "is_active": False})
-                        else:
-                            PromptServer.instance.send_sync("AUN_node_bypass_state", {"node_id": nid, "is_active": False})
-                    else:
-                        # Independent states
-                        if use_mute:
-                            PromptServer.instance.send_sync("AUN-node-mute-state", {"node_id": nid, "is_active": is_active_state})
-                            # Clear bypass to active to prevent stale disable
-                            PromptServer.instance.send_sync("AUN_node_bypass_state", {"node_id": nid, "is_active": True})
-                        else:
-                            PromptServer.instance.send_sync("AUN_node_bypass_state", {"node_id": nid, "is_active": is_active_state})
-                            # Clear mute to active
-                            PromptServer.instance.send_sync("AUN-node-mute-state", {"node_id": nid, "is_active": True})
-                        PromptServer.instance.send_sync("AUN_set_collapse_state", {"node_id": nid, "collapse": collapse_state})
+                    # Bypass and mute both set the node mode, so writing the chosen
+                    # state also clears the other one (no separate clear event).
+                    queue_node_mode(mode_event, nid, is_active_state)
+                    queue_event("AUN_set_collapse_state", {"node_id": nid, "collapse": collapse_state}, key=("collapse", str(nid)))
                 mode = "mute" if use_mute else "bypass"
                 #print(f"[AUNNodeStateController] IDs {id_list} collapse={collapse_state} active={is_active_state} mode={mode} combined={combined}")
 
@@ -118,19 +104,19 @@ class AUNNodeStateController:
                 if use_titles_path and used_titles:
                     # Collapse by titles
                     try:
-                        PromptServer.instance.send_sync("AUN_set_collapse_by_titles", {"titles": used_titles, "collapse": collapse_state})
+                        queue_event("AUN_set_collapse_by_titles", {"titles": used_titles, "collapse": collapse_state})
                     except Exception:
                         pass
                     if use_mute:
-                        PromptServer.instance.send_sync("AUN_set_mute_by_titles", {"titles": used_titles, "is_active": desired_active})
+                        queue_event("AUN_set_mute_by_titles", {"titles": used_titles, "is_active": desired_active})
                         mode = "mute-titles"
                     else:
-                        PromptServer.instance.send_sync("AUN_set_bypass_by_titles", {"titles": used_titles, "is_active": desired_active})
+                        queue_event("AUN_set_bypass_by_titles", {"titles": used_titles, "is_active": desired_active})
                         mode = "bypass-titles"
                     #print(f"[AUNNodeStateController] Group '{group_title}' (titles path) collapse={collapse_state} active={desired_active} excludes={len(excludes)} mode={mode}")
                 else:
                     # Fallback to group-wide events (no excludes or couldn't resolve titles)
-                    PromptServer.instance.send_sync("AUN_set_collapse_state_group", {"group_title": group_title, "collapse": collapse_state})
+                    queue_event("AUN_set_collapse_state_group", {"group_title": group_title, "collapse": collapse_state})
                     if use_mute:
                         # revert to previous best-effort per-title mute path
                         try:
@@ -145,14 +131,14 @@ class AUNNodeStateController:
                                         if t:
                                             titles.append(t)
                             if titles:
-                                PromptServer.instance.send_sync("AUN_set_mute_by_titles", {"titles": titles, "is_active": desired_active})
+                                queue_event("AUN_set_mute_by_titles", {"titles": titles, "is_active": desired_active})
                             else:
-                                PromptServer.instance.send_sync("AUN_set_bypass_by_group_title", {"group_title": group_title, "is_active": desired_active})
+                                queue_event("AUN_set_bypass_by_group_title", {"group_title": group_title, "is_active": desired_active})
                         except Exception:
-                            PromptServer.instance.send_sync("AUN_set_bypass_by_group_title", {"group_title": group_title, "is_active": desired_active})
+                            queue_event("AUN_set_bypass_by_group_title", {"group_title": group_title, "is_active": desired_active})
                         #print(f"[AUNNodeStateController] Group '{group_title}' collapse={collapse_state} active={desired_active} mode=mute (fallback) excludes={len(excludes)}")
                     else:
-                        PromptServer.instance.send_sync("AUN_set_bypass_by_group_title", {"group_title": group_title, "is_active": desired_active})
+                        queue_event("AUN_set_bypass_by_group_title", {"group_title": group_title, "is_active": desired_active})
                         #print(f"[AUNNodeStateController] Group '{group_title}' collapse={collapse_state} active={desired_active} mode=bypass excludes={len(excludes)}")
 
             elif target_mode == "Node Titles":
@@ -163,16 +149,16 @@ class AUNNodeStateController:
                 state_active = True if not combined and is_active_state else False
                 # Collapse via new event (client will listen) when collapse requested or combined
                 try:
-                    PromptServer.instance.send_sync("AUN_set_collapse_by_titles", {"titles": titles, "collapse": collapse_state})
+                    queue_event("AUN_set_collapse_by_titles", {"titles": titles, "collapse": collapse_state})
                 except Exception:
                     pass
                 if use_mute:
                     # Send mute by titles
-                    PromptServer.instance.send_sync("AUN_set_mute_by_titles", {"titles": titles, "is_active": state_active})
+                    queue_event("AUN_set_mute_by_titles", {"titles": titles, "is_active": state_active})
                     mode = "mute"
                 else:
                     # Send bypass by titles
-                    PromptServer.instance.send_sync("AUN_set_bypass_by_titles", {"titles": titles, "is_active": state_active})
+                    queue_event("AUN_set_bypass_by_titles", {"titles": titles, "is_active": state_active})
                     mode = "bypass"
                 #print(f"[AUNNodeStateController] Titles {titles} active={state_active} combined={combined} mode={mode}")
 
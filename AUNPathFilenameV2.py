@@ -1,8 +1,7 @@
 import os
-import re
 from datetime import datetime
 
-from .aun_path_filename_shared import build_path, crop_name
+from .aun_path_filename_shared import build_path, crop_name, java_to_python_datefmt
 
 
 class AUNPathFilenameV2:
@@ -64,24 +63,7 @@ class AUNPathFilenameV2:
 
     @staticmethod
     def _normalize_date_format(fmt: str) -> str:
-        normalized = str(fmt or "%Y-%m-%d")
-        mapping = [
-            ("yyyy", "%Y"),
-            ("MM", "%m"),
-            ("dd", "%d"),
-            ("HH", "%H"),
-            ("mm", "%M"),
-            ("ss", "%S"),
-            ("yy", "%y"),
-            ("M", "%m"),
-            ("d", "%d"),
-            ("H", "%H"),
-            ("m", "%M"),
-            ("s", "%S"),
-        ]
-        for java_token, python_token in mapping:
-            normalized = re.sub(rf"(?<!%)\b{java_token}\b", python_token, normalized)
-        return normalized
+        return java_to_python_datefmt(str(fmt or "%Y-%m-%d"))
 
     def generate_path_v2(self, **kwargs):
         date_subfolder = kwargs.get("Date_Subfolder", True)
@@ -1,9 +1,8 @@
 import os
-import re
 from datetime import datetime
 
 from .AUNPathFilenameVideo import AUNPathFilenameVideo
-from .aun_path_filename_shared import build_path, crop_name
+from .aun_path_filename_shared import build_path, crop_name, java_to_python_datefmt
 
 
 class AUNPathFilenameVideoV2:
@@ -46,24 +45,7 @@ class AUNPathFilenameVideoV2:
 
     @staticmethod
     def _normalize_date_format(fmt: str) -> str:
-        normalized = str(fmt or "%Y-%m-%d")
-        mapping = [
-            ("yyyy", "%Y"),
-            ("MM", "%m"),
-            ("dd", "%d"),
-            ("HH", "%H"),
-            ("mm", "%M"),
-            ("ss", "%S"),
-            ("yy", "%y"),
-            ("M", "%m"),
-            ("d", "%d"),
-            ("H", "%H"),
-            ("m", "%M"),
-            ("s", "%S"),
-        ]
-        for java_token, python_token in mapping:
-            normalized = re.sub(rf"(?<!%)\b{java_token}\b", python_token, normalized)
-        return normalized
+        return java_to_python_datefmt(str(fmt or "%Y-%m-%d"))
 
     def generate_path_v2(self, **kwargs):
         main_folder = kwargs.get("MainFolder", "Videos")
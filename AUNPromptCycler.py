@@ -1,6 +1,29 @@
+import functools
 import random
 from typing import List, Tuple, Any
 
+from .aun_prompt_library import TextPromptLibrary, select_library
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_range(range_indices: str, count: int) -> tuple:
+    """Parse "1,2,4-8,11" -> (1, 2, 4, 5, 6, 7, 8, 11), clamped to 1..count."""
+    indices = []
+    for part in range_indices.split(","):
+        part = part.strip()
+        if "-" in part:
+            bounds = part.split("-", 1)
+            s = max(1, int(bounds[0].strip()))
+            e = min(int(bounds[1].strip()), count)
+            if s > e:
+                s, e = e, s
+            indices.extend(range(s, e + 1))
+        else:
+            idx = max(1, int(part))
+            if idx <= count:
+                indices.append(idx)
+    return tuple(indices) or (1,)
+
 class AUNPromptCycler:
     """
     A ComfyUI custom node that cycles through an infinite number of prompts.
@@ -29,6 +52,9 @@ class AUNPromptCycler:
             "Laboratory:A steampunk laboratory with brass gears and steam.",
             "Garden:A magical garden with glowing flowers and butterflies."
         ]
+        self._examples = TextPromptLibrary(
+            self.example_prompts, [f"Prompt {i}" for i in range(1, len(self.example_prompts) + 1)]
+        )
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -76,6 +102,11 @@ class AUNPromptCycler:
                     "dynamicPrompts": True,
                     "default": default_prompts,
                     "tooltip": "Enter your own prompts, one per line. Optional title: use 'Title: Prompt text' format. Lines without a title get auto-generated ones (e.g., 'Prompt 1')."
+                }),
+                "prompt_file": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "tooltip": "Optional prompt library file (same one-per-line format), absolute or relative to the ComfyUI input folder. Used instead of custom_prompts when set. Large files are read on demand."
                 })
             },
             "hidden": {
@@ -106,7 +137,7 @@ class AUNPromptCycler:
         except Exception:
             pass
 
-    def cycle_prompt(self, cycle_mode: str, manual_index: int = 1, range_indices: str = "1-10", search_query: str = "", custom_prompts: str = "", unique_id=None, **kwargs):
+    def cycle_prompt(self, cycle_mode: str, manual_index: int = 1, range_indices: str = "1-10", search_query: str = "", custom_prompts: str = "", prompt_file: str = "", unique_id=None, **kwargs):
         """
         Cycle through prompts and return the current one.
         Supports infinite number of prompts via custom_prompts input.
@@ -117,93 +148,43 @@ class AUNPromptCycler:
             range_indices: Comma-separated indices or ranges for range mode (1-based), e.g. '1,2,4-8,11'
             search_query: Search for prompts containing this text, used when cycle_mode is "search"
             custom_prompts: Optional custom prompts (one per line). If empty, uses example prompts.
+            prompt_file: Optional prompt library file; takes precedence over custom_prompts.
         
         Returns:
             Tuple of (current_prompt, prompt_title, cycle_index)
         """
-        # Use custom prompts if provided, otherwise use example prompts
-        prompts_to_use = self.example_prompts
-        titles_to_use = [f"Prompt {i}" for i in range(1, len(self.example_prompts) + 1)]
-        if custom_prompts.strip():
-            parsed = []
-            for i, line in enumerate(custom_prompts.split('\n'), 1):
-                line = line.strip()
-                if not line:
-                    continue
-                if ":" in line:
-                    title, _, prompt = line.partition(":")
-                    parsed.append((prompt.strip(), title.strip()))
-                else:
-                    parsed.append((line, f"Prompt {i}"))
-            if parsed:
-                prompts_to_use = [p for p, _ in parsed]
-                titles_to_use = [t for _, t in parsed]
+        # Prompt file, then custom prompts, then the example prompts
+        library = select_library(custom_prompts, prompt_file, self._examples, "AUNPromptCycler")
+        count = len(library)
         
         # Choose prompt based on cycle mode
         if cycle_mode == "sequential":
-            prompt = prompts_to_use[(self.current_index - 1) % len(prompts_to_use)]
-            title = titles_to_use[(self.current_index - 1) % len(titles_to_use)]
-            cycle_index = ((self.current_index - 1) % len(prompts_to_use)) + 1
+            cycle_index = ((self.current_index - 1) % count) + 1
             self.current_index += 1
         elif cycle_mode == "manual":
-            cycle_index = ((manual_index - 1) % len(prompts_to_use)) + 1
-            prompt = prompts_to_use[cycle_index - 1]
-            title = titles_to_use[cycle_index - 1]
+            cycle_index = ((manual_index - 1) % count) + 1
         elif cycle_mode == "range":
-            # Parse range_indices string: "1,2,4-8,11" -> [1, 2, 4, 5, 6, 7, 8, 11]
-            indices = []
-            for part in range_indices.split(","):
-                part = part.strip()
-                if "-" in part:
-                    bounds = part.split("-", 1)
-                    s = max(1, int(bounds[0].strip()))
-                    e = min(int(bounds[1].strip()), len(prompts_to_use))
-                    if s > e:
-                        s, e = e, s
-                    indices.extend(range(s, e + 1))
-                else:
-                    idx = max(1, int(part))
-                    if idx <= len(prompts_to_use):
-                        indices.append(idx)
-            if not indices:
-                indices = [1]
+            indices = _parse_range(range_indices, count)
             cycle_index = indices[self.range_index % len(indices)]
-            prompt = prompts_to_use[cycle_index - 1]
-            title = titles_to_use[cycle_index - 1]
             self.range_index += 1
         elif cycle_mode == "search":
             # Find prompts matching the search query (case-insensitive)
             # Supports: "word1 word2" = AND (both words), "term1, term2" = OR (either term)
             if search_query.strip():
-                or_groups = [g.strip().lower().split() for g in search_query.split(",") if g.strip()]
-                if or_groups:
-                    def matches(prompt_text):
-                        text = prompt_text.lower()
-                        # Match if any OR group matches (each group requires all words)
-                        return any(all(word in text for word in group) for group in or_groups)
-                    matches_list = [(i + 1, p, t) for i, (p, t) in enumerate(zip(prompts_to_use, titles_to_use)) if matches(p)]
-                    if matches_list:
-                        cycle_index, prompt, title = matches_list[self.search_index % len(matches_list)]
-                        self.search_index += 1
-                    else:
-                        # No matches, fall back to first prompt
-                        cycle_index = 1
-                        prompt = prompts_to_use[0]
-                        title = titles_to_use[0]
+                matches = library.search(search_query)
+                if matches:
+                    cycle_index = matches[self.search_index % len(matches)]
+                    self.search_index += 1
                 else:
+                    # No matches, fall back to first prompt
                     cycle_index = 1
-                    prompt = prompts_to_use[0]
-                    title = titles_to_use[0]
             else:
                 # Empty query, cycle through all sequentially
-                prompt = prompts_to_use[(self.search_index) % len(prompts_to_use)]
-                title = titles_to_use[(self.search_index) % len(titles_to_use)]
-                cycle_index = (self.search_index % len(prompts_to_use)) + 1
+                cycle_index = (self.search_index % count) + 1
                 self.search_index += 1
         else:  # random mode
-            cycle_index = random.randint(1, len(prompts_to_use))
-            prompt = prompts_to_use[cycle_index - 1]
-            title = titles_to_use[cycle_index - 1]
+            cycle_index = random.randint(1, count)
+        prompt, title = library.get(cycle_index)
         
         self.execution_count += 1
 
@@ -1,6 +1,8 @@
 import random
 import time
 
+from .aun_lazy_switch import pending_inputs
+
 # This proxy class allows the node to accept any input type by always returning True for equality checks.
 class AlwaysEqualProxy(str):
     def __eq__(self, _):
@@ -9,6 +11,7 @@ class AlwaysEqualProxy(str):
         return False
 
 any_type = AlwaysEqualProxy("*")
+lazy_options = {"lazy": True}
 
 class AUNRandomAnySwitch:
     @classmethod
@@ -18,11 +21,11 @@ class AUNRandomAnySwitch:
                 "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff, "tooltip": "Seed for the random selection. Changing this will change the choice."}),
             },
             "optional": {
-                "input_1": (any_type, {"tooltip": "Optional candidate #1 (any type)."}),
-                "input_2": (any_type, {"tooltip": "Optional candidate #2 (any type)."}),
-                "input_3": (any_type, {"tooltip": "Optional candidate #3 (any type)."}),
-                "input_4": (any_type, {"tooltip": "Optional candidate #4 (any type)."}),
-                "input_5": (any_type, {"tooltip": "Optional candidate #5 (any type)."}),
+                "input_1": (any_type, {"tooltip": "Optional candidate #1 (any type).", **lazy_options}),
+                "input_2": (any_type, {"tooltip": "Optional candidate #2 (any type).", **lazy_options}),
+                "input_3": (any_type, {"tooltip": "Optional candidate #3 (any type).", **lazy_options}),
+                "input_4": (any_type, {"tooltip": "Optional candidate #4 (any type).", **lazy_options}),
+                "input_5": (any_type, {"tooltip": "Optional candidate #5 (any type).", **lazy_options}),
             }
         }
 
@@ -32,22 +35,27 @@ class AUNRandomAnySwitch:
     CATEGORY = "AUN Nodes/Utility"
     DESCRIPTION = "Randomly selects one of several connected inputs of any type and outputs it, along with the index of the selected input."
 
-    def random_switch(self, seed, input_1=None, input_2=None, input_3=None, input_4=None, input_5=None):
-        # Create a list of all potential inputs with their original 1-based index
-        all_inputs = [input_1, input_2, input_3, input_4, input_5]
-        indexed_inputs = [(i + 1, val) for i, val in enumerate(all_inputs) if val is not None]
+    @staticmethod
+    def _pick(seed, kwargs):
+        """1-based index of the chosen input, or 0 when nothing is connected."""
+        # Lazy inputs are present (possibly still None) exactly when they are linked,
+        # so the choice is the same before and after the chosen branch is evaluated.
+        connected = [i for i in range(1, 6) if f"input_{i}" in kwargs]
+        if not connected:
+            return 0
+        # Use a local RNG so this node does not alter global random state.
+        return random.Random(seed).choice(connected)
+
+    def check_lazy_status(self, seed, **kwargs):
+        index = self._pick(seed, kwargs)
+        return pending_inputs(kwargs, [f"input_{index}"]) if index else []
 
-        if not indexed_inputs:
+    def random_switch(self, seed, **kwargs):
+        index = self._pick(seed, kwargs)
+        if not index:
             # Return None for the output and 0 for the index if nothing is connected
             return (None, 0)
-
-        # Use a local RNG so this node does not alter global random state.
-        seeded_rng = random.Random(seed)
-
-        # Randomly select one of the connected (index, value) tuples
-        selected_tuple = seeded_rng.choice(indexed_inputs)
-        
-        return (selected_tuple[1], selected_tuple[0]) # Return (value, 1-based index)
+        return (kwargs[f"input_{index}"], index)  # Return (value, 1-based index)
 
     @classmethod
     def IS_CHANGED(cls, **kwargs):
@@ -5,6 +5,10 @@ import comfy.sd
 import comfy.utils
 import folder_paths
 
+from .aun_event_bus import queue_event
+from .aun_listing_cache import lora_names
+from .aun_perf import stage as perf_stage
+
 
 class AUNRandomLoraModelOnly:
     MAX_LORAS = 10
@@ -16,13 +20,7 @@ class AUNRandomLoraModelOnly:
 
     @classmethod
     def _lora_choices(cls):
-        try:
-            files = folder_paths.get_filename_list("loras")
-        except Exception:
-            files = []
-        if not isinstance(files, list):
-            files = []
-        return ["None"] + files
+        return ["None"] + lora_names()
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -259,12 +257,10 @@ class AUNRandomLoraModelOnly:
         if unique_id is None:
             return
         try:
-            from server import PromptServer  # type: ignore[import-not-found]
-
             node_id = self._normalize_node_id(unique_id)
             if node_id is None:
                 return
-            PromptServer.instance.send_sync(
+            queue_event(
                 "AUN_random_lora_selected",
                 {
                     "node_id": str(node_id),
@@ -276,6 +272,7 @@ class AUNRandomLoraModelOnly:
                     "strength_clip": float(strength_clip),
                     "apply_lora": bool(apply_lora),
                 },
+                key=("AUN_random_lora_selected", str(node_id)),
             )
         except Exception:
             pass
@@ -431,7 +428,8 @@ class AUNRandomLoraModelOnly:
             )
 
         try:
-            lora_weights = comfy.utils.load_torch_file(lora_path, safe_load=True)
+            with perf_stage("lora.load"):
+                lora_weights = comfy.utils.load_torch_file(lora_path, safe_load=True)
             loaded_model, loaded_clip = comfy.sd.load_lora_for_models(
                 model,
                 clip,
@@ -3,6 +3,9 @@ import time
 import builtins
 import re
 
+from .aun_lazy_switch import SlotChoice, pending_inputs
+
+lazy_options = {"lazy": True}
 
 class AUNRandomModelBundleSwitch:
     MAX_SLOTS = 10
@@ -11,6 +14,7 @@ class AUNRandomModelBundleSwitch:
         self.index = None
         self.range_index = 0
         self._rng = random.SystemRandom()
+        self._choice = SlotChoice()
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -73,6 +77,7 @@ class AUNRandomModelBundleSwitch:
             "MODEL",
             {
                 "tooltip": "Unpatched model passthrough used when mode is None.",
+                **lazy_options,
             },
         )
         for i in range(1, cls.MAX_SLOTS + 1):
@@ -80,12 +85,14 @@ class AUNRandomModelBundleSwitch:
                 "MODEL",
                 {
                     "tooltip": f"Model input for slot {i}.",
+                    **lazy_options,
                 },
             )
             optional[f"text_{i}"] = (
                 "STRING",
                 {
                     "tooltip": f"Optional text metadata for slot {i}.",
+                    **lazy_options,
                     "forceInput": True,
                 },
             )
@@ -93,6 +100,7 @@ class AUNRandomModelBundleSwitch:
                 "STRING",
                 {
                     "tooltip": f"Optional custom label for slot {i}.",
+                    **lazy_options,
                     "forceInput": True,
                 },
             )
@@ -146,24 +154,24 @@ class AUNRandomModelBundleSwitch:
             valid_indices = [min_val]
         return sorted(set(valid_indices))
 
-    def _first_non_empty(self, indices, model_map):
+    def _first_non_empty(self, indices, filled):
         for idx in indices:
-            if model_map.get(idx) is not None:
+            if idx in filled:
                 return idx
         return None
 
-    def _next_filled_from(self, start_idx, candidate_indices, model_map):
+    def _next_filled_from(self, start_idx, candidate_indices, filled):
         if not candidate_indices:
             return None
         ordered = sorted(set(candidate_indices))
         if start_idx not in ordered:
-            return self._first_non_empty(ordered, model_map)
+            return self._first_non_empty(ordered, filled)
 
         start_pos = ordered.index(start_idx)
         total = len(ordered)
         for step in range(total):
             idx = ordered[(start_pos + step) % total]
-            if model_map.get(idx) is not None:
+            if idx in filled:
                 return idx
         return None
 
@@ -201,6 +209,49 @@ class AUNRandomModelBundleSwitch:
         select_idx = max(1, min(int(select or 1), max(1, min(int(slot_count or self.MAX_SLOTS), self.MAX_SLOTS))))
         return select_idx
 
+    def _choose_slot(self, mode, active_slot_count, select, minimum, maximum, range_str, kwargs):
+        """(input to output, reported index) for the connected inputs; index 0 means mode None."""
+        # Lazy inputs are present (possibly still None) exactly when they are linked.
+        available_indices = [i for i in builtins.range(1, active_slot_count + 1) if f"model_{i}" in kwargs]
+
+        if mode == "None":
+            if "base_model" in kwargs:
+                return ("base_model", 0)
+            if available_indices:
+                # Fallback behavior if base_model is not connected.
+                return (f"model_{available_indices[0]}", 0)
+            raise ValueError("Mode is None but no base_model is connected.")
+
+        if not available_indices:
+            raise ValueError("No model inputs connected. Connect at least one model_X input.")
+
+        picked = self._pick_index(mode, select, minimum, maximum, range_str, available_indices, active_slot_count)
+        resolved_idx = self._next_filled_from(picked, available_indices, set(available_indices))
+        if resolved_idx is None:
+            raise ValueError("No connected model found in selectable slots.")
+        return (f"model_{resolved_idx}", resolved_idx)
+
+    def _selection(self, mode, slot_count, select, minimum, maximum, range_str, prompt, kwargs):
+        active_slot_count = max(1, min(int(slot_count or self.MAX_SLOTS), self.MAX_SLOTS))
+        connected = tuple(sorted(name for name in kwargs if name == "base_model" or name.startswith("model_")))
+        key = (mode, active_slot_count, select, minimum, maximum, range_str, connected)
+        return self._choice.pick(
+            prompt,
+            key,
+            lambda: self._choose_slot(mode, active_slot_count, select, minimum, maximum, range_str, kwargs),
+        )
+
+    def check_lazy_status(self, mode, slot_count, select, minimum, maximum, range, prompt=None, **kwargs):
+        try:
+            source, idx = self._selection(mode, slot_count, select, minimum, maximum, range, prompt, kwargs)
+        except ValueError:
+            # Nothing selectable; execution reports the error.
+            return []
+        needed = [source]
+        if idx:
+            needed += [f"text_{idx}", f"label_{idx}"]
+        return pending_inputs(kwargs, needed)
+
     def _find_prompt_node(self, prompt, node_id):
         if not isinstance(prompt, dict) or not node_id:
             return None
@@ -435,12 +486,12 @@ class AUNRandomModelBundleSwitch:
         extra_pnginfo=None,
         **kwargs,
     ):
-        base_model = kwargs.get("base_model")
         active_slot_count = max(1, min(int(slot_count or self.MAX_SLOTS), self.MAX_SLOTS))
+        try:
+            source, resolved_idx = self._selection(mode, slot_count, select, minimum, maximum, range, prompt, kwargs)
+        finally:
+            self._choice.release()
 
-        model_map = {
-            i: kwargs.get(f"model_{i}") for i in builtins.range(1, active_slot_count + 1)
-        }
         text_map = {
             i: self._normalize_text(kwargs.get(f"text_{i}"))
             for i in builtins.range(1, active_slot_count + 1)
@@ -449,28 +500,11 @@ class AUNRandomModelBundleSwitch:
             i: self._normalize_text(kwargs.get(f"label_{i}")).strip()
             for i in builtins.range(1, active_slot_count + 1)
         }
-        available_indices = [idx for idx, model in model_map.items() if model is not None]
-
-        if mode == "None":
-            if base_model is not None:
-                self._emit_selected_index(unique_id, 0, mode)
-                return (base_model, "", 0, "none")
-            if available_indices:
-                # Fallback behavior if base_model is not connected.
-                fallback_idx = available_indices[0]
-                self._emit_selected_index(unique_id, 0, mode)
-                return (model_map[fallback_idx], "", 0, "none")
-            raise ValueError("Mode is None but no base_model is connected.")
-
-        if not available_indices:
-            raise ValueError("No model inputs connected. Connect at least one model_X input.")
-
-        picked = self._pick_index(mode, select, minimum, maximum, range, available_indices, active_slot_count)
-        resolved_idx = self._next_filled_from(picked, available_indices, model_map)
-        if resolved_idx is None:
-            raise ValueError("No connected model found in selectable slots.")
+        if resolved_idx == 0:
+            self._emit_selected_index(unique_id, 0, mode)
+            return (kwargs.get(source), "", 0, "none")
 
-        selected_model = model_map[resolved_idx]
+        selected_model = kwargs.get(source)
         selected_text = text_map.get(resolved_idx, "")
         if not selected_text:
             selected_text = label_map.get(resolved_idx, "")
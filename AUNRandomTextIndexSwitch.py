@@ -1,6 +1,8 @@
 import random
 import time
 
+from .aun_lazy_switch import SlotChoice, pending_inputs
+
 lazy_options = {"lazy": True}
 
 
@@ -11,6 +13,7 @@ class AUNRandomTextIndexSwitch:
     def __init__(self):
         self.index = None
         self._rng = random.SystemRandom()
+        self._choice = SlotChoice()
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -42,7 +45,7 @@ class AUNRandomTextIndexSwitch:
             },
             "optional": {
             },
-            "hidden": {"unique_id": "UNIQUE_ID", "extra_pnginfo": "EXTRA_PNGINFO"}
+            "hidden": {"prompt": "PROMPT", "unique_id": "UNIQUE_ID", "extra_pnginfo": "EXTRA_PNGINFO"}
         }
         for i in range(1, cls.MAX_INPUTS + 1):
             inputs["optional"]["text%d" % i] = (
@@ -51,6 +54,7 @@ class AUNRandomTextIndexSwitch:
                     "default": "",
                     "forceInput": True,
                     "tooltip": f"Text input {i}. Only the selected index is output.",
+                    **lazy_options,
                 },
             )
         return inputs
@@ -62,9 +66,10 @@ class AUNRandomTextIndexSwitch:
     OUTPUT_NODE = True
     DESCRIPTION = "Combines random index generation with text selection. Generates an index based on the selected mode (Select: fixed value, Increment: cycling through range, Random: random within range) and uses it to select from up to 20 text inputs. Control how many sockets are visible on the node for cleaner layouts."
 
-    def check_lazy_status(self, minimum, maximum, mode, select, visible_inputs, **kwargs):
-        # Since index is generated at runtime, cannot determine which input is needed in advance
-        return []
+    def check_lazy_status(self, minimum, maximum, mode, select, visible_inputs, prompt=None, **kwargs):
+        # Pick the index now (once per execution) so only the selected text branch is evaluated.
+        index = self._selected_index(minimum, maximum, mode, select, visible_inputs, prompt, kwargs)
+        return pending_inputs(kwargs, ["text%d" % index])
 
     def _record_pginfo(self, extra_pnginfo, unique_id, payload):
         if not isinstance(extra_pnginfo, dict) or unique_id is None:
@@ -110,10 +115,7 @@ class AUNRandomTextIndexSwitch:
             return min_val
         return max(min_val, min(int(index), max_val))
 
-    def random_text_switch(self, minimum, maximum, mode, select, visible_inputs, **kwargs):
-        min_val, max_val = self._clamp_range(minimum, maximum, visible_inputs)
-        select_val = self._clamp_index(select, min_val, max_val)
-
+    def _pick_index(self, min_val, max_val, mode, select):
         # Generate the index based on mode
         if mode == "Random":
             index = self._rng.randint(min_val, max_val)
@@ -126,6 +128,20 @@ class AUNRandomTextIndexSwitch:
             index = self.index
         else:  # Select
             index = select
+        return index
+
+    def _selected_index(self, minimum, maximum, mode, select, visible_inputs, prompt, kwargs):
+        min_val, max_val = self._clamp_range(minimum, maximum, visible_inputs)
+        key = (min_val, max_val, mode, select)
+        return self._choice.pick(prompt, key, lambda: self._pick_index(min_val, max_val, mode, select))
+
+    def random_text_switch(self, minimum, maximum, mode, select, visible_inputs, prompt=None, **kwargs):
+        min_val, max_val = self._clamp_range(minimum, maximum, visible_inputs)
+        select_val = self._clamp_index(select, min_val, max_val)
+        try:
+            index = self._selected_index(minimum, maximum, mode, select, visible_inputs, prompt, kwargs)
+        finally:
+            self._choice.release()
 
         key = "text%d" % index
 
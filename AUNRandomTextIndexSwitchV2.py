@@ -1,6 +1,8 @@
 import random
 import time
 
+from .aun_lazy_switch import SlotChoice, pending_inputs
+
 lazy_options = {"lazy": True}
 
 
@@ -12,6 +14,7 @@ class AUNRandomTextIndexSwitchV2:
         self.index = None
         self.range_index = 0
         self._rng = random.SystemRandom()
+        self._choice = SlotChoice()
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -48,7 +51,7 @@ class AUNRandomTextIndexSwitchV2:
             },
             "optional": {
             },
-            "hidden": {"unique_id": "UNIQUE_ID", "extra_pnginfo": "EXTRA_PNGINFO"}
+            "hidden": {"prompt": "PROMPT", "unique_id": "UNIQUE_ID", "extra_pnginfo": "EXTRA_PNGINFO"}
         }
         for i in range(1, cls.MAX_INPUTS + 1):
             inputs["optional"]["text%d" % i] = (
@@ -57,6 +60,7 @@ class AUNRandomTextIndexSwitchV2:
                     "default": "",
                     "forceInput": True,
                     "tooltip": f"Text input {i}. Only the selected index is output.",
+                    **lazy_options,
                 },
             )
         return inputs
@@ -68,9 +72,10 @@ class AUNRandomTextIndexSwitchV2:
     OUTPUT_NODE = True
     DESCRIPTION = "Combines random index generation with text selection. Generates an index based on the selected mode (Select: fixed value, Increment: cycling through range, Random: random within range, Range: selecting a range of indices) and uses it to select from up to 20 text inputs. Control how many sockets are visible on the node for cleaner layouts."
 
-    def check_lazy_status(self, minimum, maximum, mode, select, visible_inputs, **kwargs):
-        # Since index is generated at runtime, cannot determine which input is needed in advance
-        return []
+    def check_lazy_status(self, minimum, maximum, mode, select, visible_inputs, prompt=None, **kwargs):
+        # Pick the index now (once per execution) so only the selected text branch is evaluated.
+        index = self._selected_index(minimum, maximum, mode, select, visible_inputs, prompt, kwargs)
+        return pending_inputs(kwargs, ["text%d" % index])
 
     def _record_pginfo(self, extra_pnginfo, unique_id, payload):
         if not isinstance(extra_pnginfo, dict) or unique_id is None:
@@ -157,11 +162,7 @@ class AUNRandomTextIndexSwitchV2:
             return parts[1].strip()
         return clean_label
 
-    def random_text_switch(self, minimum, maximum, mode, select, visible_inputs, **kwargs):
-        min_val, max_val = self._clamp_range(minimum, maximum, visible_inputs)
-        select_val = self._clamp_index(select, 1, self.MAX_INPUTS)
-        range_str = kwargs.get("range", "")
-
+    def _pick_index(self, min_val, max_val, mode, select_val, range_str):
         # Generate the index based on mode
         if mode == "Random":
             index = self._rng.randint(min_val, max_val)
@@ -184,6 +185,22 @@ class AUNRandomTextIndexSwitchV2:
             self.range_index = (self.range_index + 1) % len(valid_indices)
         else:  # Select
             index = select_val
+        return index
+
+    def _selected_index(self, minimum, maximum, mode, select, visible_inputs, prompt, kwargs):
+        min_val, max_val = self._clamp_range(minimum, maximum, visible_inputs)
+        select_val = self._clamp_index(select, 1, self.MAX_INPUTS)
+        range_str = kwargs.get("range", "")
+        key = (min_val, max_val, mode, select_val, range_str)
+        return self._choice.pick(prompt, key, lambda: self._pick_index(min_val, max_val, mode, select_val, range_str))
+
+    def random_text_switch(self, minimum, maximum, mode, select, visible_inputs, prompt=None, **kwargs):
+        min_val, max_val = self._clamp_range(minimum, maximum, visible_inputs)
+        select_val = self._clamp_index(select, 1, self.MAX_INPUTS)
+        try:
+            index = self._selected_index(minimum, maximum, mode, select, visible_inputs, prompt, kwargs)
+        finally:
+            self._choice.release()
 
         key = "text%d" % index
 
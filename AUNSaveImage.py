@@ -13,6 +13,10 @@ import numpy as np
 import folder_paths
 import re
 from .misc import get_sha256
+from .aun_filename_allocator import release_reserved_path, reserve_unique_path
+from .aun_output_catalog import record_outputs
+from .aun_perf import stage as perf_stage, timed
+from .aun_path_filename_shared import compile_template, java_to_python_datefmt, resolve_batch_tokens
 from .model_utils import (
     get_short_name as get_model_short_name,
     get_lora_short_name,
@@ -550,6 +554,7 @@ def _extract_loras_from_inputs(inputs: Any,
         pass
     return items
 
+@timed("graph.extract_loras")
 def extract_loras(prompt: Any = None, extra_pnginfo: Any = None) -> list[dict]:
     """Extract enabled LoRAs (name + strengths) from LoRA loader nodes
     in both runtime prompt (server) structure and saved workflow (UI) structure.
@@ -675,23 +680,7 @@ def extract_loras(prompt: Any = None, extra_pnginfo: Any = None) -> list[dict]:
 def get_timestamp(time_format):
     """Generates a timestamp string based on the provided format."""
     try:
-        normalized_format = str(time_format or "%Y%m%d-%H%M%S")
-        mapping = [
-            ("yyyy", "%Y"),
-            ("MM", "%m"),
-            ("dd", "%d"),
-            ("HH", "%H"),
-            ("mm", "%M"),
-            ("ss", "%S"),
-            ("yy", "%y"),
-            ("M", "%m"),
-            ("d", "%d"),
-            ("H", "%H"),
-            ("m", "%M"),
-            ("s", "%S"),
-        ]
-        for java_token, python_token in mapping:
-            normalized_format = re.sub(rf"(?<!%)\b{java_token}\b", python_token, normalized_format)
+        normalized_format = java_to_python_datefmt(str(time_format or "%Y%m%d-%H%M%S"))
         return datetime.now().strftime(normalized_format)
     except:
         return datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -705,52 +694,8 @@ def build_sidecar_timestamp(date_format):
     return get_timestamp(normalized_format)
 
 def generate_path_from_pattern(pattern, replacements):
-    """Replace both canonical %token% and legacy %token placeholders."""
-    resolved = str(pattern)
-
-    def _java_to_python_datefmt(fmt: str) -> str:
-        mapping = [
-            ("yyyy", "%Y"),
-            ("MM", "%m"),
-            ("dd", "%d"),
-            ("HH", "%H"),
-            ("mm", "%M"),
-            ("ss", "%S"),
-            ("yy", "%y"),
-            ("M", "%m"),
-            ("d", "%d"),
-            ("H", "%H"),
-            ("m", "%M"),
-            ("s", "%S"),
-        ]
-        out = fmt
-        for java_token, python_token in mapping:
-            out = re.sub(rf"(?<!%)\b{java_token}\b", python_token, out)
-        return out
-
-    def _replace_datetime_placeholders(text: str) -> str:
-        now = datetime.now()
-
-        def _repl(match):
-            kind = match.group(1)
-            raw_fmt = match.group(2)
-            fmt = _java_to_python_datefmt(raw_fmt)
-            try:
-                return now.strftime(fmt)
-            except Exception:
-                return now.strftime("%Y-%m-%d" if kind == "date" else "%H-%M-%S")
-
-        return re.sub(r"%(date|time):([^%]+)%", _repl, text)
-
-    resolved = _replace_datetime_placeholders(resolved)
-
-    # Replace longer placeholders first to avoid substring collisions.
-    for placeholder in sorted(replacements.keys(), key=len, reverse=True):
-        value = replacements[placeholder]
-        replacement = "" if value is None else str(value)
-        resolved = resolved.replace(f"%{placeholder}%", replacement)
-        resolved = resolved.replace(f"%{placeholder}", replacement)
-    return resolved
+    """Replace both canonical %token% and legacy %token placeholders (plus %date:fmt%/%time:fmt%)."""
+    return compile_template(pattern, replacements.keys(), datetime_tokens=True).render(replacements)
 
 # --- Node Class ---
 
@@ -760,6 +705,7 @@ class AUNSaveImage:
         self.type = "output"
 
     @staticmethod
+    @timed("graph.extract_prompts")
     def _extract_text_prompts(prompt: Dict | None = None, extra_pnginfo: Dict | None = None) -> tuple[str, str]:
         """Extract only the final text feeding the CLIP text encoders (no concatenation)."""
         def to_key(x):
@@ -1306,13 +1252,17 @@ class AUNSaveImage:
                 #  - Output json          -> return json sidecar in node output only
                 #  - Save to file - text  -> return text sidecar AND write .txt file(s)
                 #  - Save to file - json  -> return json sidecar AND write .json file(s)
+                #  - Save to catalog - *  -> return sidecar AND append it to the output catalog database (no per-image files)
                 # Backwards compatibility: legacy values like 'none', 'save to file (txt)', 'save to file (json)' still parsed in _normalize_sidecar.
                 "sidecar_format": ([
                     "Output text",
                     "Output json",
                     "Save to file - text",
-                    "Save to file - json"
-                ], {"default": "Output text", "tooltip": "Sidecar output format and file saving: choose Output (text/json) or also Save to file (text/json)."}),
+                    "Save to file - json",
+                    "Save to catalog - text",
+                    "Save to catalog - json",
+                ], {"default": "Output text", "tooltip": "Sidecar output format and file saving: choose Output (text/json), also Save to file (text/json), or Save to catalog to record every image in one indexed database (aun_output_catalog.sqlite3 in the output folder) instead of per-image files."}),
+                "compress_metadata": ("BOOLEAN", {"default": False, "tooltip": "PNG only. Store the prompt/workflow metadata as compressed zTXt/iTXt chunks instead of plain tEXt. Large workflows shrink each PNG by up to hundreds of KB, but tools that only read plain tEXt chunks will not see the embedded workflow."}),
             },
             "hidden": {"prompt": "PROMPT", "extra_pnginfo": "EXTRA_PNGINFO"},
         }
@@ -1398,6 +1348,10 @@ class AUNSaveImage:
                     return ("text", True)
                 if c == "save to file - json":
                     return ("json", True)
+                if c == "save to catalog - text":
+                    return ("text", False)
+                if c == "save to catalog - json":
+                    return ("json", False)
                 # Legacy / synonym handling
                 if c in {"none", "off", "disabled"}:
                     return ("text", False)
@@ -1650,6 +1604,7 @@ class AUNSaveImage:
             if selected_sidecar in (None, "", "Output text") and bool(kwargs.get("save_sidecar_to_file", False)):
                 selected_sidecar = "Save to file - text"
             sidecar_fmt, sidecar_save = _normalize_sidecar(selected_sidecar)
+            sidecar_catalog = "catalog" in str(selected_sidecar or "").lower()
             # Backward compatibility: map legacy 'save_mode' (string) to new boolean 'save_image'
             if 'save_mode' in kwargs and 'save_image' not in kwargs:
                 sm_val = str(kwargs.get('save_mode')).strip().lower()
@@ -1660,8 +1615,9 @@ class AUNSaveImage:
             save_image = bool(kwargs.get("save_image", True))
             preview_only = not save_image
             if preview_only:
-                # Never write sidecar files in preview-only mode
+                # Never write sidecar files (or catalog rows) in preview-only mode
                 sidecar_save = False
+                sidecar_catalog = False
 
             if not preview_only:
                 saved_filenames = self.save_images_to_disk(
@@ -1670,6 +1626,8 @@ class AUNSaveImage:
                     sidecar_fmt,
                     sidecar_context,
                     sidecar_save=sidecar_save,
+                    sidecar_catalog=sidecar_catalog,
+                    compress_metadata=bool(kwargs.get("compress_metadata", False)),
                 )
             else:
                 # Preview-only: save images into the ComfyUI temp directory so UI can display them without populating output folder.
@@ -1681,20 +1639,18 @@ class AUNSaveImage:
                 if not os.path.exists(temp_dir):
                     os.makedirs(temp_dir, exist_ok=True)
                 saved_filenames = []
+                png_info = PngInfo()
+                png_info.add_text("parameters", metadata_comment)
                 for i, image_tensor in enumerate(images):
                     img_array = np.clip(255. * image_tensor.cpu().numpy(), 0, 255).astype(np.uint8)
                     img = Image.fromarray(img_array)
                     # Resolve batch placeholder for this index
-                    this_prefix = filename_prefix
-                    for ph in ("%batch_num%", "%batch_number%", "%batch_num", "%batch_number"):
-                        this_prefix = this_prefix.replace(ph, str(i + 1))
+                    this_prefix = resolve_batch_tokens(filename_prefix, i + 1)
                     # Use a short unique suffix in temp to avoid collisions
                     temp_name = f"{this_prefix}_tmp{i+1}.{extension}"
                     temp_path = os.path.join(temp_dir, temp_name)
                     try:
                         if extension == 'png':
-                            png_info = PngInfo()
-                            png_info.add_text("parameters", metadata_comment)
                             img.save(temp_path, pnginfo=png_info, optimize=True)
                         else:
                             img.save(temp_path, optimize=True, quality=90)
@@ -1708,9 +1664,7 @@ class AUNSaveImage:
                 batch_count = len(images)
             except Exception:
                 batch_count = 1
-            final_return_prefix = filename_prefix
-            for ph in ("%batch_num%", "%batch_number%", "%batch_num", "%batch_number"):
-                final_return_prefix = final_return_prefix.replace(ph, str(batch_count if batch_count > 0 else 1))
+            final_return_prefix = resolve_batch_tokens(filename_prefix, batch_count if batch_count > 0 else 1)
 
             # Produce sidecar text output always, matching selected format when possible
             def _format_sidecar(record: Dict[str, Any], fmt: str) -> str:
@@ -1771,44 +1725,69 @@ class AUNSaveImage:
     def save_images_to_disk(self, images, output_path, filename_prefix, comment, extension, prompt, extra_pnginfo,
                             sidecar_format: str = "text",
                             sidecar_context: Dict[str, Any] | None = None,
-                            sidecar_save: bool = False):
+                            sidecar_save: bool = False,
+                            sidecar_catalog: bool = False,
+                            compress_metadata: bool = False):
         saved_filenames = []
+        catalog_entries = []
+
+        # The embedded metadata is the same for every image of the batch, so serialize it once
+        png_info = None
+        exif_bytes = None
+        if extension == 'png':
+            png_info = PngInfo()
+            png_info.add_text("parameters", comment)
+            if prompt:
+                png_info.add_text("prompt", json.dumps(prompt), zip=compress_metadata)
+            if extra_pnginfo:
+                for key, value in extra_pnginfo.items():
+                    png_info.add_text(key, json.dumps(value), zip=compress_metadata)
+            # Add LoRA information to PNG metadata
+            if sidecar_context and "loras" in sidecar_context:
+                png_info.add_text("loras", json.dumps(sidecar_context["loras"]))
+        elif piexif is not None:
+            exif_bytes = piexif.dump({"Exif": {piexif.ExifIFD.UserComment: piexif.helper.UserComment.dump(comment, encoding="unicode")}})
         for i, image_tensor in enumerate(images):
             img_array = np.clip(255. * image_tensor.cpu().numpy(), 0, 255).astype(np.uint8)
             img = Image.fromarray(img_array)
 
             # Support both %batch_num%/%batch_number% and legacy non-trailing-% forms.
-            final_filename_prefix = filename_prefix
-            for ph in ("%batch_num%", "%batch_number%", "%batch_num", "%batch_number"):
-                final_filename_prefix = final_filename_prefix.replace(ph, str(i+1))
+            final_filename_prefix = resolve_batch_tokens(filename_prefix, i + 1)
             unique_prefix = self.get_unique_filename(output_path, final_filename_prefix, extension)
             
             file_path = f"{unique_prefix}.{extension}"
             full_file_path = os.path.join(output_path, file_path)
 
-            if extension == 'png':
-                png_info = PngInfo()
-                png_info.add_text("parameters", comment)
-                if prompt:
-                    png_info.add_text("prompt", json.dumps(prompt)) 
-                if extra_pnginfo:
-                    for key, value in extra_pnginfo.items():
-                        png_info.add_text(key, json.dumps(value))
-                # Add LoRA information to PNG metadata
-                if sidecar_context and "loras" in sidecar_context:
-                    png_info.add_text("loras", json.dumps(sidecar_context["loras"]))
-                img.save(full_file_path, pnginfo=png_info, optimize=True)
-            else:
-                img.save(full_file_path, optimize=True, quality=95)
-                if piexif is not None:
-                    exif_bytes = piexif.dump({"Exif": {piexif.ExifIFD.UserComment: piexif.helper.UserComment.dump(comment, encoding="unicode")}})
-                    piexif.insert(exif_bytes, full_file_path)
-                else:
-                    # Still save the image; EXIF metadata requires piexif.
-                    pass
+            try:
+                with perf_stage("save_image.write") as perf:
+                    if extension == 'png':
+                        img.save(full_file_path, pnginfo=png_info, optimize=True)
+                    else:
+                        img.save(full_file_path, optimize=True, quality=95)
+                        if exif_bytes is not None:
+                            piexif.insert(exif_bytes, full_file_path)
+                        else:
+                            # Still save the image; EXIF metadata requires piexif.
+                            pass
+                    perf.add_bytes(os.path.getsize(full_file_path))
+            except Exception:
+                # Don't leave the reserved (empty) file behind
+                release_reserved_path(full_file_path)
+                raise
             
             saved_filenames.append(file_path)
 
+            if sidecar_catalog:
+                entry = dict(sidecar_context or {})
+                entry.update({
+                    "filename": file_path,
+                    "batch_num": i + 1,
+                    "extension": extension,
+                    "width": img.width,
+                    "height": img.height,
+                })
+                catalog_entries.append((full_file_path, entry))
+
             # Sidecar writing per image (always include all known fields; add prompt/workflow if available)
             try:
                 if sidecar_save:
@@ -1844,16 +1823,17 @@ class AUNSaveImage:
             except Exception:
                 # Sidecar writing should never break saving images
                 pass
+        if catalog_entries:
+            try:
+                record_outputs(catalog_entries, kind="image")
+            except Exception as e:
+                print(f"[AUNSaveImage] Could not write output catalog: {e}")
         return saved_filenames
 
     def get_unique_filename(self, output_path, filename_prefix, extension):
-        i = 1
-        while True:
-            suffix = f"_{i:03}" if i > 1 else ""
-            full_path = os.path.join(output_path, f"{filename_prefix}{suffix}.{extension}")
-            if not os.path.exists(full_path):
-                return f"{filename_prefix}{suffix}"
-            i += 1
+        """Reserve the first free name: the bare prefix, then ``_002``, ``_003``, ..."""
+        unique_prefix, _ = reserve_unique_path(output_path, filename_prefix, extension, first_index=2)
+        return unique_prefix
 
 NODE_CLASS_MAPPINGS = {"AUNSaveImage": AUNSaveImage}
 NODE_DISPLAY_NAME_MAPPINGS = {"AUNSaveImage": "AUN Save Image (Deprecated)"}
\ No newline at end of file
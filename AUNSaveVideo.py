@@ -4,19 +4,24 @@ from pathlib import Path
 import builtins
 
 import folder_paths
+from . import aun_ffmpeg
+from .aun_filename_allocator import release_reserved_path, reserve_unique_path
+from .aun_output_catalog import record_outputs
+from .aun_perf import stage as perf_stage
+from .aun_path_filename_shared import compile_template, java_to_python_datefmt
 from .logger import logger
 from .misc import (
-    ACCEPTED_IMAGE_AND_VIDEO_EXTENSIONS_COMPENDIUM,
+    get_image_and_video_extensions,
     VIDEO_FORMATS_DIRECTORY,
     get_clean_filename,
     get_file_extension_without_dot,
     is_video,
     map_to_range,
     resolve_file_path,
-    tensor2pil,
 )
 
 import copy
+import functools
 import json
 import math
 import random
@@ -47,8 +52,10 @@ from .model_utils import (
     LORA_SHORT_NAMES,
 )
 from .aun_lora_extraction_shared import BASIC_LORA_TARGET_NAMES, extract_basic_loras_from_inputs
+from .aun_animated_image_writer import GIF_PALETTE_MODES, save_animated_image
+from .aun_frame_pipe import PIPE_PIXEL_FORMATS, FramePipe, pipe_pix_fmt, source_channels
+from .aun_video_encoders import SPEED_TIERS, resolve as resolve_encode_plan
 
-import numpy as np
 
 import comfy.sd
 from nodes import SaveImage
@@ -59,22 +66,38 @@ from PIL.PngImagePlugin import PngInfo
 from typing import Dict, List
 import time
 import os as _os_mod
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
-FFMPEG_PATH = shutil.which("ffmpeg")
-if FFMPEG_PATH is None:
-    logger.info("ffmpeg could not be found. Using ffmpeg from imageio-ffmpeg.")
-    try:
-        from imageio_ffmpeg import get_ffmpeg_exe  # type: ignore
-
+@functools.lru_cache(maxsize=1)
+def get_ffmpeg_path():
+    """Resolve ffmpeg on first use: PATH first, then the imageio-ffmpeg binary."""
+    ffmpeg_path = shutil.which("ffmpeg")
+    if ffmpeg_path is None:
+        logger.info("ffmpeg could not be found. Using ffmpeg from imageio-ffmpeg.")
         try:
-            FFMPEG_PATH = get_ffmpeg_exe()
+            from imageio_ffmpeg import get_ffmpeg_exe  # type: ignore
+
+            try:
+                ffmpeg_path = get_ffmpeg_exe()
+            except Exception:
+                logger.warning("ffmpeg could not be found. Outputs that require it have been disabled")
         except Exception:
-            logger.warning("ffmpeg could not be found. Outputs that require it have been disabled")
-    except Exception:
-        logger.warning(
-            "imageio-ffmpeg is not installed and ffmpeg is not on PATH. Outputs that require it have been disabled"
-        )
+            logger.warning(
+                "imageio-ffmpeg is not installed and ffmpeg is not on PATH. Outputs that require it have been disabled"
+            )
+    return ffmpeg_path
+
+
+def __getattr__(name):
+    # FFMPEG_PATH used to be resolved at import time.
+    if name == "FFMPEG_PATH":
+        return get_ffmpeg_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Placeholders resolved by AUNSaveVideo.determine_file_name (as %token% or legacy %token).
+_FILENAME_TOKENS = ("seed", "steps", "cfg", "model_short", "model", "sampler_name", "scheduler", "loras")
 
 class AUNSaveVideo():
     '''
@@ -123,7 +146,13 @@ class AUNSaveVideo():
                     "Output only (json)",
                     "Save to file (text)",
                     "Save to file (json)",
-                ], {"default": "Output only (text)", "tooltip": "Choose how to export sidecar info: Output only (text/json) returns it via node output; Save to file (text/json) also writes a .txt/.json next to the video."}),
+                    "Save to catalog (text)",
+                    "Save to catalog (json)",
+                ], {"default": "Output only (text)", "tooltip": "Choose how to export sidecar info: Output only (text/json) returns it via node output; Save to file (text/json) also writes a .txt/.json next to the video; Save to catalog records it in one indexed database (aun_output_catalog.sqlite3 in the output folder) instead of a file."}),
+                "gif_palette": (GIF_PALETTE_MODES, {"default": "per-frame", "tooltip": "GIF only. per-frame: adaptive palette for every frame (best colour). global: one palette built from a sample of frames and reused for all, which is faster and avoids palette flicker."}),
+                "encoder_speed": (SPEED_TIERS, {"default": "default", "tooltip": "Video outputs only. default: the format's own settings (or the AUN_VIDEO_ENCODER_SPEED tier). quality/balanced/fast/fastest: encoder speed presets (x264/x265 -preset, VP9/AV1 cpu-used, row-mt and tiles). fastest available: the fastest working encoder for the format's codec on this machine (hardware first), at the fast preset."}),
+                "parallel_segments": ("BOOLEAN", {"default": False, "tooltip": "Video outputs only. Encode the batch_size segments concurrently (up to AUN_FFMPEG_JOBS at once) and then join them, instead of one after another. Uses more memory: one converted segment per running encode."}),
+                "pipe_pixel_format": (PIPE_PIXEL_FORMATS, {"default": "rgb24", "tooltip": "Video outputs only. Raw pixel format sent to ffmpeg. rgb24: always 3 bytes per pixel. auto: send grayscale frames as gray (1 byte) and RGBA frames as rgba instead of converting them to RGB first."}),
                 
             },
             "hidden": {
@@ -719,24 +748,7 @@ class AUNSaveVideo():
 
     @staticmethod
     def _normalize_date_format(fmt: str) -> str:
-        normalized = str(fmt or "%Y-%m-%d")
-        mapping = [
-            ("yyyy", "%Y"),
-            ("MM", "%m"),
-            ("dd", "%d"),
-            ("HH", "%H"),
-            ("mm", "%M"),
-            ("ss", "%S"),
-            ("yy", "%y"),
-            ("M", "%m"),
-            ("d", "%d"),
-            ("H", "%H"),
-            ("m", "%M"),
-            ("s", "%S"),
-        ]
-        for java_token, python_token in mapping:
-            normalized = re.sub(rf"(?<!%)\b{java_token}\b", python_token, normalized)
-        return normalized
+        return java_to_python_datefmt(str(fmt or "%Y-%m-%d"))
 
     @classmethod
     def _build_sidecar_timestamp(cls, date_format: str) -> str:
@@ -748,6 +760,31 @@ class AUNSaveVideo():
         except Exception:
             return time.strftime("%Y-%m-%d %H:%M:%S")
 
+    @staticmethod
+    def _write_ffmetadata(video_metadata: dict, save_workflow: bool, directory: str) -> str:
+        """Write ``video_metadata`` as an ffmetadata file in ``directory`` and return its path."""
+        md = json.dumps(video_metadata)
+        # metadata from file should escape = ; # \\ and newline
+        md = md.replace("\\","\\\\")
+        md = md.replace(";","\\;")
+        md = md.replace("#","\\#")
+        md = md.replace("=","\\=")
+        md = md.replace("\n","\\\n")
+        md = md.replace(": NaN}", ": \"NaN\"}")
+        comment_line = "comment=" + md
+        workflow_line = None
+        if save_workflow and "workflow" in video_metadata:
+            wf = str(video_metadata.get("workflow", ""))
+            wf = wf.replace("\\","\\\\").replace(";","\\;").replace("#","\\#").replace("=","\\=").replace("\n","\\\n")
+            workflow_line = "workflow=" + wf
+        metadata_path = os.path.join(directory, "metadata.txt")
+        with open(metadata_path, "w") as f:
+            f.write(";FFMETADATA1\n")
+            f.write(comment_line + "\n")
+            if workflow_line:
+                f.write(workflow_line + "\n")
+        return metadata_path
+
     @staticmethod
     def _ensure_optional_dependencies() -> None:
         # Keep the pack importable even without these installed; fail only when the node executes.
@@ -766,7 +803,7 @@ class AUNSaveVideo():
         format_type, format_ext_mime = output_format.split("/")
         format_ext = format_ext_mime
 
-        for ext in ACCEPTED_IMAGE_AND_VIDEO_EXTENSIONS_COMPENDIUM:
+        for ext in get_image_and_video_extensions():
             if ext in format_ext_mime:
                 format_ext = ext 
                 break
@@ -777,81 +814,36 @@ class AUNSaveVideo():
 
     # Removed timestamp/counter support: AUN nodes now avoid auto time/counter in filenames
 
-        seed_tokens = ("%seed%", "%seed")
-        if any(token in new_filename for token in seed_tokens):
-            # 0 is a valid seed; only None means unset
-            if seed_value is not None and isinstance(seed_value, int):
-                repl = "seed-" + str(seed_value)
-            else:
-                repl = ""
-            for token in seed_tokens:
-                new_filename = new_filename.replace(token, repl)
-            file_path = os.path.join(full_output_folder, f"{new_filename}.{format_ext}")
-
-        steps_tokens = ("%steps%", "%steps")
-        if any(token in new_filename for token in steps_tokens):
-            if steps_value is not None and isinstance(steps_value, int) and steps_value > 0:
-                repl = "steps-" + str(steps_value)
-            else:
-                repl = ""
-            for token in steps_tokens:
-                new_filename = new_filename.replace(token, repl)
-            file_path = os.path.join(full_output_folder, f"{new_filename}.{format_ext}")
-
-        cfg_tokens = ("%cfg%", "%cfg")
-        if any(token in new_filename for token in cfg_tokens):
-            # Normalize cfg to trimmed value without trailing zeros where sensible
-            if cfg_value is not None and isinstance(cfg_value, (int, float)) and float(cfg_value) > 0:
-                cfg_str = ("%g" % cfg_value).rstrip()
-                repl = "cfg-" + cfg_str
-            else:
-                repl = ""
-            for token in cfg_tokens:
-                new_filename = new_filename.replace(token, repl)
-            file_path = os.path.join(full_output_folder, f"{new_filename}.{format_ext}")
-
-        model_short_tokens = ("%model_short%", "%model_short")
-        if any(token in new_filename for token in model_short_tokens):
-            # Order: explicit override -> auto-shortened from model
-            if short_manual_model_name:
-                short = short_manual_model_name
-            else:
-                short = get_model_short_name_common(model_name) if model_name else ""
-            repl = AUNSaveVideo._sanitize_token_str(short)
-            for token in model_short_tokens:
-                new_filename = new_filename.replace(token, repl)
-            file_path = os.path.join(full_output_folder, f"{new_filename}.{format_ext}")
-
-        model_tokens = ("%model%", "%model")
-        if any(token in new_filename for token in model_tokens):
-            repl = AUNSaveVideo._sanitize_token_str(model_name) if model_name else ""
-            for token in model_tokens:
-                new_filename = new_filename.replace(token, repl)
-            file_path = os.path.join(full_output_folder, f"{new_filename}.{format_ext}")
-
-        sampler_tokens = ("%sampler_name%", "%sampler_name")
-        if any(token in new_filename for token in sampler_tokens):
-            raw = sampler_name_value or ""
-            short = get_sampler_short_name(raw)
-            repl = AUNSaveVideo._sanitize_token_str(short)
-            for token in sampler_tokens:
-                new_filename = new_filename.replace(token, repl)
-            file_path = os.path.join(full_output_folder, f"{new_filename}.{format_ext}")
-
-        scheduler_tokens = ("%scheduler%", "%scheduler")
-        if any(token in new_filename for token in scheduler_tokens):
-            raw = scheduler_value or ""
-            short = get_scheduler_short_name(raw)
-            repl = AUNSaveVideo._sanitize_token_str(short)
-            for token in scheduler_tokens:
-                new_filename = new_filename.replace(token, repl)
-            file_path = os.path.join(full_output_folder, f"{new_filename}.{format_ext}")
-
-        loras_tokens = ("%loras%", "%loras")
-        if any(token in new_filename for token in loras_tokens):
-            repl = AUNSaveVideo._sanitize_token_str(loras_value) if loras_value else ""
-            for token in loras_tokens:
-                new_filename = new_filename.replace(token, repl)
+        plan = compile_template(new_filename, _FILENAME_TOKENS)
+        if plan.tokens:
+            values = {}
+            if "seed" in plan.tokens:
+                # 0 is a valid seed; only None means unset
+                values["seed"] = "seed-" + str(seed_value) if seed_value is not None and isinstance(seed_value, int) else ""
+            if "steps" in plan.tokens:
+                values["steps"] = "steps-" + str(steps_value) if steps_value is not None and isinstance(steps_value, int) and steps_value > 0 else ""
+            if "cfg" in plan.tokens:
+                # Normalize cfg to trimmed value without trailing zeros where sensible
+                if cfg_value is not None and isinstance(cfg_value, (int, float)) and float(cfg_value) > 0:
+                    values["cfg"] = "cfg-" + ("%g" % cfg_value).rstrip()
+                else:
+                    values["cfg"] = ""
+            if "model_short" in plan.tokens:
+                # Order: explicit override -> auto-shortened from model
+                if short_manual_model_name:
+                    short = short_manual_model_name
+                else:
+                    short = get_model_short_name_common(model_name) if model_name else ""
+                values["model_short"] = AUNSaveVideo._sanitize_token_str(short)
+            if "model" in plan.tokens:
+                values["model"] = AUNSaveVideo._sanitize_token_str(model_name) if model_name else ""
+            if "sampler_name" in plan.tokens:
+                values["sampler_name"] = AUNSaveVideo._sanitize_token_str(get_sampler_short_name(sampler_name_value or ""))
+            if "scheduler" in plan.tokens:
+                values["scheduler"] = AUNSaveVideo._sanitize_token_str(get_scheduler_short_name(scheduler_value or ""))
+            if "loras" in plan.tokens:
+                values["loras"] = AUNSaveVideo._sanitize_token_str(loras_value) if loras_value else ""
+            new_filename = plan.render(values)
             file_path = os.path.join(full_output_folder, f"{new_filename}.{format_ext}")
 
         # Final tidy: remove extra spaces that may result from empty token replacements
@@ -862,22 +854,21 @@ class AUNSaveVideo():
 
     # No filename truncation in AUNSaveVideo to match AUNSaveImage behavior
 
-        # Final safety: if file already exists, append an incrementing suffix
-        if os.path.exists(file_path):
-            base_name = new_filename
-            i = 1
-            while True:
-                suffix = f"_{i:03}"
-                candidate_name = f"{base_name}{suffix}"
-                candidate_path = os.path.join(full_output_folder, f"{candidate_name}.{format_ext}")
-                if not os.path.exists(candidate_path):
-                    new_filename = candidate_name
-                    file_path = candidate_path
-                    break
-                i += 1
+        # The name is only reserved (see _reserve_output_path) right before the first write
+        os.makedirs(full_output_folder, exist_ok=True)
 
         return file_path, format_type, format_ext_mime, format_ext
 
+    @staticmethod
+    def _reserve_output_path(file_path: str, format_ext: str) -> str:
+        """Atomically claim ``file_path``, or the next free ``_NNN`` name, and return the claimed path.
+
+        Creates the file empty; call immediately before writing it, and release
+        it with ``release_reserved_path`` if the write fails.
+        """
+        _, reserved = reserve_unique_path(os.path.dirname(file_path), get_clean_filename(file_path), format_ext, first_index=1)
+        return reserved
+
     def combine_video(
         self,
         images,
@@ -905,6 +896,10 @@ class AUNSaveVideo():
     sidecar_format="none",
         date_format="%Y-%m-%d",
         prompt=None,
+        gif_palette="per-frame",
+        encoder_speed="default",
+        parallel_segments=False,
+        pipe_pixel_format="rgb24",
     ):
 
         AUNSaveVideo._ensure_optional_dependencies()
@@ -1082,11 +1077,7 @@ class AUNSaveVideo():
             
         if format_type == "image":
             
-            frames = [tensor2pil(f)[0] for f in images]
-            
             args = {
-                "save_all": True,
-                "append_images": frames[1:],
                 "duration": round(1000 / frame_rate),
                 "loop": loop_count,
                 }
@@ -1111,10 +1102,19 @@ class AUNSaveVideo():
                                 piexif.ExifIFD.UserComment:piexif.helper.UserComment.dump(json.dumps(video_metadata, indent=2, sort_keys=True), encoding="unicode")}})
                     args["exif"] = exif_bytes 
                     
-            frames[0].save(file_path, **args)
+            # Frames are converted/quantized in parallel by a worker pool
+            file_path = self._reserve_output_path(file_path, format_ext)
+            try:
+                with perf_stage("video.encode") as perf:
+                    save_animated_image(images, file_path, format_ext, args, gif_palette=gif_palette)
+                    perf.add_bytes(os.path.getsize(file_path))
+            except Exception:
+                release_reserved_path(file_path)
+                raise
         else:
             # Use ffmpeg to save a video
-            if FFMPEG_PATH is None:
+            ffmpeg_path = get_ffmpeg_path()
+            if ffmpeg_path is None:
                 #Should never be reachable
                 raise ProcessLookupError("Could not find ffmpeg")
 
@@ -1123,21 +1123,8 @@ class AUNSaveVideo():
                 video_format = json.load(stream)
                 if "extension" in video_format:
                     format_ext = video_format["extension"]
-                    # If the final extension differs from what determine_file_name used, align and ensure uniqueness
-                    base_name = get_clean_filename(file_path)
-                    desired_path = os.path.join(full_output_folder, f"{base_name}.{format_ext}")
-                    if desired_path != file_path:
-                        file_path = desired_path
-                    # Ensure we don't overwrite an existing file
-                    if os.path.exists(file_path):
-                        i = 1
-                        while True:
-                            suffix = f"_{i:03}"
-                            candidate_path = os.path.join(full_output_folder, f"{base_name}{suffix}.{format_ext}")
-                            if not os.path.exists(candidate_path):
-                                file_path = candidate_path
-                                break
-                            i += 1
+                    # The final extension may differ from what determine_file_name used
+                    file_path = os.path.join(os.path.dirname(file_path), f"{get_clean_filename(file_path)}.{format_ext}")
             # Normalize dimensions from input regardless of tensor layout
             def _infer_w_h(imgs) -> tuple[int, int, str]:
                 # Returns (w, h, layout) where layout in {"BHWC","NCHW","HWC","CHW"}
@@ -1164,19 +1151,21 @@ class AUNSaveVideo():
 
             _w, _h, _layout = _infer_w_h(images)
             dimensions = f"{_w}x{_h}"
+            pipe_pix_fmt_name, pipe_channels = pipe_pix_fmt(source_channels(images), pipe_pixel_format)
             output_quality = map_to_range(quality, 0, 100, 50, 1) # ffmpeg quality maps from 50 (worst) to 1 (best)
+            encode_plan = resolve_encode_plan(video_format, ffmpeg_path, encoder_speed, _w, output_quality, quality)
             args = [
-                FFMPEG_PATH, 
+                ffmpeg_path, 
                 "-v", "error", 
                 "-f", "rawvideo", 
-                "-pix_fmt", "rgb24", 
+                "-pix_fmt", pipe_pix_fmt_name, 
                 '-loglevel', 'quiet',
                 "-s", dimensions, 
                 "-r", str(frame_rate), 
                 "-i", "-", 
-                "-crf", str(output_quality) 
+                *encode_plan.quality_args,
                 ] \
-                + video_format['main_pass']
+                + encode_plan.main_pass
 
             env=os.environ.copy()
             if  "environment" in video_format:
@@ -1188,136 +1177,108 @@ class AUNSaveVideo():
             full_output_folder_temp = os.path.join(temp_base, f"run_{uuid4().hex}")
             os.makedirs(full_output_folder_temp, exist_ok=True)
 
+            prepared_audio = (None, None)
+            file_path = self._reserve_output_path(file_path, format_ext)
             try:
-                interim_file_paths = []
                 total_passes = math.ceil(float(len(images)) / float(batch_size))
                 total_passes_digit_count = len(str(total_passes))
                 join_videos_instance = JoinVideosInDirectory()
+                # Serialized and escaped once; every batch pass and the final join reuse the same file
                 metadata_path = None
-                for start in range(0, len(images), batch_size):
+                if save_metadata:
+                    metadata_path = AUNSaveVideo._write_ffmetadata(video_metadata, save_workflow, full_output_folder_temp)
+                # The audio trim runs alongside the segment encodes
+                prepared_audio = join_videos_instance.start_audio(audio_options, full_output_folder_temp)
 
-                    batch_count = len(interim_file_paths) + 1
-                    logger.info(f"SaveVideo: Processing batch {str(batch_count).zfill(total_passes_digit_count)} of {total_passes}")
+                # Each encoder thread reuses its own uint8 staging buffers
+                frame_pipes = threading.local()
 
+                def _encode_segment(batch_index: int) -> None:
+                    logger.info(f"SaveVideo: Processing batch {str(batch_index + 1).zfill(total_passes_digit_count)} of {total_passes}")
+
+                    start = batch_index * batch_size
                     end = min(start + batch_size, len(images))
                     image_batch = images[start:end]
+                    frame_pipe = getattr(frame_pipes, "pipe", None)
+                    if frame_pipe is None:
+                        frame_pipe = frame_pipes.pipe = FramePipe()
+                    segment_bytes = (end - start) * _w * _h * pipe_channels
 
-                    # Normalize to (N,H,W,3) uint8 for ffmpeg rgb24
-                    def _to_bhwc_rgb_uint8(t: torch.Tensor) -> np.ndarray:
-                        # Accept (N,H,W,C) or (N,C,H,W). Handle C in {1,3,4}.
-                        if not isinstance(t, torch.Tensor):
-                            # Assume numpy-like; just coerce and fix channels
-                            arr = np.asarray(t)
-                            if arr.ndim == 4 and arr.shape[-1] in (1, 3, 4):
-                                pass
-                            elif arr.ndim == 4 and arr.shape[1] in (1, 3, 4):
-                                arr = np.transpose(arr, (0, 2, 3, 1))
-                            else:
-                                raise ValueError("Unsupported images array shape for video writing")
-                            if arr.shape[-1] == 1:
-                                arr = np.repeat(arr, 3, axis=-1)
-                            elif arr.shape[-1] >= 3:
-                                arr = arr[..., :3]
-                            arr = (arr * 255.0).astype(np.uint8) if arr.dtype != np.uint8 else arr
-                            return arr
-                        x = t
-                        # Ensure float range [0,1]
-                        if x.dtype not in (torch.float16, torch.float32, torch.float64):
-                            x = x.float()
-                        # Detect layout
-                        if x.dim() == 4 and x.shape[-1] in (1, 3, 4):
-                            # (N,H,W,C)
-                            bhwc = x
-                        elif x.dim() == 4 and x.shape[1] in (1, 3, 4):
-                            # (N,C,H,W) -> (N,H,W,C)
-                            bhwc = x.permute(0, 2, 3, 1).contiguous()
-                        else:
-                            # Try to interpret as batch of HWC frames
-                            raise ValueError(f"Unsupported image batch shape {tuple(x.shape)}; expected (N,H,W,C) or (N,C,H,W)")
-                        # Ensure 3 channels
-                        c = bhwc.shape[-1]
-                        if c == 1:
-                            bhwc = bhwc.repeat(1, 1, 1, 3)
-                        elif c >= 3:
-                            bhwc = bhwc[..., :3]
-                        bhwc = bhwc.clamp(0, 1)
-                        arr = (bhwc.detach().cpu().numpy() * 255.0 + 0.5).astype(np.uint8)
-                        return arr
-
-                    try:
-                        image_batch = _to_bhwc_rgb_uint8(image_batch)
-                    except Exception:
-                        # As a last resort, try per-frame conversion
-                        frames_np = []
-                        for f in image_batch:
-                            frames_np.append(_to_bhwc_rgb_uint8(f.unsqueeze(0))[0])
-                        image_batch = np.stack(frames_np, axis=0)
-
-                    interim_file_path = f"{full_output_folder_temp}/{get_clean_filename(file_path)}_{len(interim_file_paths)}.{format_ext}"
-                    interim_file_paths.append(interim_file_path)
+                    interim_file_path = interim_file_paths[batch_index]
 
                     res = None
-                    # images = images.tobytes()
-                    if save_metadata:
-                        os.makedirs(folder_paths.get_temp_directory(), exist_ok=True)
-                        md = json.dumps(video_metadata)
-                        metadata_path = os.path.join(folder_paths.get_temp_directory(), "metadata.txt")
-                        # metadata from file should escape = ; # \\ and newline
-                        md = md.replace("\\","\\\\")
-                        md = md.replace(";","\\;")
-                        md = md.replace("#","\\#")
-                        md = md.replace("=","\\=")
-                        md = md.replace("\n","\\\n")
-                        md = md.replace(": NaN}", ": \"NaN\"}")
-                        comment_line = "comment=" + md
-                        workflow_line = None
-                        if save_workflow and "workflow" in video_metadata:
-                            wf = str(video_metadata.get("workflow", ""))
-                            wf = wf.replace("\\","\\\\").replace(";","\\;").replace("#","\\#").replace("=","\\=").replace("\n","\\\n")
-                            workflow_line = "workflow=" + wf
-                        with open(metadata_path, "w") as f:
-                            f.write(";FFMETADATA1\n")
-                            f.write(comment_line + "\n")
-                            if workflow_line:
-                                f.write(workflow_line + "\n")
-
+                    if metadata_path:
                         # For MP4/MOV containers, enable using metadata tags
                         mov_like = format_ext.lower() in ("mp4", "mov", "m4v", "ismv")
                         args_with_metadata = [
-                            FFMPEG_PATH,
+                            ffmpeg_path,
                             "-v", "error",
                             "-f", "rawvideo",
-                            "-pix_fmt", "rgb24",
+                            "-pix_fmt", pipe_pix_fmt_name,
                             "-loglevel", "quiet",
                             "-s", dimensions,
                             "-r", str(frame_rate),
                             "-i", "-",
                             "-i", metadata_path,
-                            "-crf", str(output_quality),
-                        ] + video_format['main_pass'] + (["-movflags", "use_metadata_tags"] if mov_like else []) + [
+                            *encode_plan.quality_args,
+                        ] + encode_plan.main_pass + (["-movflags", "use_metadata_tags"] if mov_like else []) + [
                             "-map_metadata", "1",
                         ]
                         try:
-                            res = subprocess.run(args_with_metadata + [interim_file_path], input=image_batch.tobytes(),
-                                                capture_output=True, check=True, env=env)
+                            with perf_stage("video.encode") as perf:
+                                perf.add_bytes(segment_bytes)
+                                res = aun_ffmpeg.run_piped(args_with_metadata + [interim_file_path],
+                                                           frame_pipe.chunks(image_batch, pipe_channels), check=True, env=env)
                         except subprocess.CalledProcessError as e:
                             # Res was not set
                             print(e.stderr.decode("utf-8"), end="", file=sys.stderr)
                             logger.warn("An error occurred when saving with metadata")
+                            # ffmpeg may have created the file before failing; the retry must not trip over "-n"
+                            try:
+                                os.remove(interim_file_path)
+                            except OSError:
+                                pass
 
                     if not res:
                         try:
-                            res = subprocess.run(args + [interim_file_path], input=image_batch.tobytes(),
-                                                capture_output=True, check=True, env=env)
+                            with perf_stage("video.encode") as perf:
+                                perf.add_bytes(segment_bytes)
+                                res = aun_ffmpeg.run_piped(args + [interim_file_path],
+                                                           frame_pipe.chunks(image_batch, pipe_channels), check=True, env=env)
                         except subprocess.CalledProcessError as e:
                             raise Exception("An error occured in the ffmpeg subprocess:\n" \
                                     + e.stderr.decode("utf-8"))
                     if res.stderr:
                         print(res.stderr.decode("utf-8"), end="", file=sys.stderr)
 
+                # Every segment is a separate encode that starts on a keyframe with a closed
+                # GOP, so segments can be encoded in any order and still joined by stream copy.
+                interim_file_paths = [
+                    f"{full_output_folder_temp}/{get_clean_filename(file_path)}_{batch_index}.{format_ext}"
+                    for batch_index in range(total_passes)
+                ]
+                workers = min(total_passes, aun_ffmpeg.max_jobs()) if parallel_segments else 1
+                if workers > 1:
+                    logger.info(f"SaveVideo: Encoding {total_passes} segments, up to {workers} at a time")
+                    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aun_segment") as executor:
+                        # list() surfaces the first failed segment
+                        list(executor.map(_encode_segment, range(total_passes)))
+                else:
+                    for batch_index in range(total_passes):
+                        _encode_segment(batch_index)
+
                 use_mov_flags = format_ext.lower() in ("mp4", "mov", "m4v", "ismv")
-                join_videos_instance.join_videos_in_directory(full_output_folder_temp, file_path, audio_options, True, metadata_path, use_mov_flags)
+                join_videos_instance.join_videos_in_directory(full_output_folder_temp, file_path, audio_options, True, metadata_path, use_mov_flags, overwrite=True, prepared_audio=prepared_audio)
             finally:
+                # A failed encode can leave the audio trim running; let it finish before removing its folder
+                audio_job = prepared_audio[1]
+                if audio_job is not None and not audio_job.cancel():
+                    try:
+                        audio_job.result()
+                    except Exception:
+                        pass
+                # Drop the reserved name if ffmpeg never wrote the file
+                release_reserved_path(file_path)
                 removed = AUNSaveVideo._remove_dir_with_retry(full_output_folder_temp)
                 if not removed and os.path.exists(full_output_folder_temp):
                     logger.warning(f"AUNSaveVideo: Failed to remove temp directory {full_output_folder_temp}")
@@ -1346,6 +1307,10 @@ class AUNSaveVideo():
                 # Legacy "none" behaved like output-only text
                 return ("text", False)
 
+            # Catalog modes return the text like output-only; the record goes to the catalog instead of a file
+            if "catalog" in s:
+                return ("json" if "json" in s else "text", False)
+
             # New explicit modes
             if "output" in s and "json" in s:
                 return ("json", False)
@@ -1408,6 +1373,11 @@ class AUNSaveVideo():
                     f.write(sidecar_text)
         except Exception:
             pass
+        if "catalog" in str(sidecar_format or "").lower():
+            try:
+                record_outputs([(file_path, record)], kind="video")
+            except Exception as e:
+                print(f"[AUNSaveVideo] Could not write output catalog: {e}")
         return {"ui": {"images": previews}, "result": (images, sidecar_text)}
     
 class AudioInputOptions:
@@ -1506,18 +1476,44 @@ class JoinVideosInDirectory:
         return False
 
     def _probe_video_codec(self, file_path: str) -> str | None:
-        try:
-            result = subprocess.run(
-                [
-                    'ffprobe', '-v', 'error', '-select_streams', 'v:0',
-                    '-show_entries', 'stream=codec_name', '-of', 'default=nw=1:nk=1', file_path
-                ],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True
-            )
-            codec = result.stdout.strip().lower()
-            return codec or None
-        except Exception:
-            return None
+        return aun_ffmpeg.video_codec(file_path)
+
+    def start_audio(self, audio_input_options, work_directory):
+        """Start preparing the audio track for a join into ``work_directory``.
+
+        Returns ``(audio_path, job)``. ``audio_path`` is ``None`` when there is
+        no audio to add. When the audio has to be trimmed, ``job`` is the
+        background ffmpeg run writing ``audio_path``, so callers can start it
+        before encoding the video segments and wait for it at join time.
+        """
+        if not audio_input_options:
+            return None, None
+        audio_input_path = audio_input_options.get("audio_input_path")
+        if not (audio_input_path and os.path.isfile(audio_input_path) and self.has_audio_track(audio_input_path)):
+            return None, None
+
+        clip_audio = audio_input_options.get("clip_audio", False)
+        audio_clip_start_seconds = audio_input_options.get("audio_clip_start_seconds", 0)
+        audio_clip_duration = audio_input_options.get("audio_clip_duration", 0)
+        use_whole_audio = audio_clip_start_seconds == 0 and audio_clip_duration == 0
+        if not clip_audio or use_whole_audio:
+            return audio_input_path, None
+
+        audio_duration = self.get_audio_duration(audio_input_path)
+        if audio_clip_duration == 0 or audio_clip_start_seconds + audio_clip_duration > audio_duration:
+            audio_clip_duration = audio_duration - audio_clip_start_seconds
+        trimmed_audio_path = os.path.join(work_directory, 'trimmed_audio.aac')
+        audio_trim_command = [
+            'ffmpeg',
+            '-i', audio_input_path,
+            '-ss', str(audio_clip_start_seconds),
+            '-t', str(audio_clip_duration),
+            '-ac', '2', # Force stereo for now
+            '-c:a', 'aac',
+            '-loglevel', 'quiet',
+            trimmed_audio_path
+        ]
+        return trimmed_audio_path, aun_ffmpeg.submit(audio_trim_command, check=True, stdin=subprocess.DEVNULL)
 
     def join_videos_in_directory(
         self,
@@ -1527,6 +1523,8 @@ class JoinVideosInDirectory:
         delete_directory_containing_videos=False,
         metadata_path: str | None = None,
         use_mov_metadata_flags: bool = False,
+        overwrite: bool = False,
+        prepared_audio=None,
     ):
 
         directory_containing_videos = resolve_file_path(directory_containing_videos)
@@ -1542,10 +1540,11 @@ class JoinVideosInDirectory:
             print("No video files found in the folder.")
             return
 
-        should_apply_audio = False
-        if audio_input_options:
-            audio_input_path = audio_input_options.get("audio_input_path")
-            should_apply_audio = os.path.isfile(audio_input_path) and self.has_audio_track(audio_input_path)
+        # combine_video starts the audio trim before encoding; direct calls prepare it here
+        if prepared_audio is None:
+            prepared_audio = self.start_audio(audio_input_options, directory_containing_videos)
+        audio_path_to_use, audio_job = prepared_audio
+        should_apply_audio = audio_path_to_use is not None
 
         if not should_apply_audio and len(video_files) == 1:
             source_file = os.path.join(directory_containing_videos, video_files[0])
@@ -1592,40 +1591,17 @@ class JoinVideosInDirectory:
                 audio_codec = 'aac'
                 if output_file_path.endswith("webm"):
                     audio_codec = 'libopus'
-                audio_input_path = audio_input_options.get("audio_input_path")                
-                clip_audio = audio_input_options.get("clip_audio", False)
-                audio_clip_start_seconds = audio_input_options.get("audio_clip_start_seconds", 0)
-                audio_clip_duration = audio_input_options.get("audio_clip_duration", 0)
-
-                use_whole_audio = audio_clip_start_seconds == 0 and audio_clip_duration == 0
-
-                if clip_audio and not use_whole_audio:
-                    # Trim the audio first
-                    audio_duration = self.get_audio_duration(audio_input_path)
-                    if audio_clip_duration == 0 or audio_clip_start_seconds + audio_clip_duration > audio_duration:
-                        audio_clip_duration = audio_duration - audio_clip_start_seconds
-                    audio_trim_command = [
-                        'ffmpeg',
-                        '-i', audio_input_path,
-                        '-ss', str(audio_clip_start_seconds),
-                        '-t', str(audio_clip_duration),
-                        '-ac', '2', # Force stereo for now
-                        '-c:a', 'aac',
-                        '-loglevel', 'quiet',
-                        trimmed_audio_path
-                    ]
+                if audio_job is not None:
                     try:
-                        subprocess.run(audio_trim_command, check=True)
-                        print(f"Trimmed audio saved to {trimmed_audio_path}")
+                        audio_job.result()
+                        print(f"Trimmed audio saved to {audio_path_to_use}")
                     except subprocess.CalledProcessError as e:
                         print(f"An error occurred during audio trimming: {e}")
                         return
-                    audio_path_to_use = trimmed_audio_path
-                else:
-                    audio_path_to_use = audio_input_path
 
                 ffmpeg_command_final = [
                     'ffmpeg',
+                    *(['-y'] if overwrite else []),
                     '-f', 'concat',
                     '-safe', '0',
                     '-i', list_file_path,
@@ -1652,6 +1628,7 @@ class JoinVideosInDirectory:
                 # No audio file provided
                 ffmpeg_command_final = [
                     'ffmpeg',
+                    *(['-y'] if overwrite else []),
                     '-f', 'concat',
                     '-safe', '0',
                     '-i', list_file_path,
@@ -1671,32 +1648,16 @@ class JoinVideosInDirectory:
 
             try:
                 # Run ffmpeg to concatenate videos and optionally apply audio
-                process_final = subprocess.Popen(
-                    ffmpeg_command_final, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True
-                )
-
-                # Read the output and error streams
-                stdout, stderr = process_final.communicate()
-
-                # Wait for the process to finish
-                process_final.wait()
-                # Explicitly close streams and release process handles before file cleanup
-                try:
-                    if process_final.stdout:
-                        process_final.stdout.close()
-                except Exception:
-                    pass
-                try:
-                    if process_final.stderr:
-                        process_final.stderr.close()
-                except Exception:
-                    pass
+                with perf_stage("video.join"):
+                    returncode, stdout, stderr = aun_ffmpeg.popen_communicate(
+                        ffmpeg_command_final, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+                    )
                 # Small delay to allow OS/ffmpeg to release file locks on Windows
                 time.sleep(0.5)
-                if process_final.returncode == 0:
+                if returncode == 0:
                     print(f"\nProcessing complete. Output file: {output_file_path}")
                 else:
-                    print(f"\nAn error occurred during processing: ffmpeg process returned non-zero exit code {process_final.returncode}")
+                    print(f"\nAn error occurred during processing: ffmpeg process returned non-zero exit code {returncode}")
                     print(stdout)
                     print(stderr)
                     return
@@ -1759,44 +1720,13 @@ class JoinVideosInDirectory:
 
     def get_audio_duration(self, file_path):
         """Get the duration of an audio file in seconds."""
-        result = subprocess.run(
-            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', file_path],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-        )
-        info = json.loads(result.stdout)
-        return float(info['format']['duration'])
+        duration = aun_ffmpeg.duration(file_path)
+        if duration is None:
+            raise RuntimeError(f"Could not read the duration of {file_path}")
+        return duration
 
     def has_audio_track(self, file_path):
-        try:
-            # Run ffprobe command to get stream information in JSON format
-            result = subprocess.run(
-                [
-                    'ffprobe',
-                    '-v', 'error',
-                    '-show_entries', 'stream=codec_type',
-                    '-of', 'json',
-                    file_path
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True,
-                text=True
-            )
-
-            # Parse the JSON output
-            output = json.loads(result.stdout)
-            streams = output.get('streams', [])
-
-            # Check if any of the streams are of type 'audio'
-            for stream in streams:
-                if stream.get('codec_type') == 'audio':
-                    return True
-            
-            return False
-
-        except subprocess.CalledProcessError as e:
-            print(f"An error occurred while running ffprobe: {e}")
-            return False
+        return aun_ffmpeg.has_audio(file_path)
 
 
 NODE_CLASS_MAPPINGS = {
@@ -1,8 +1,7 @@
-import re
 from datetime import datetime
 
 from .AUNSaveVideo import AUNSaveVideo
-from .aun_path_filename_shared import strip_lora_filename_tokens
+from .aun_path_filename_shared import compile_template, java_to_python_datefmt, strip_lora_filename_tokens
 
 
 class AUNSaveVideoV2(AUNSaveVideo):
@@ -48,6 +47,10 @@ class AUNSaveVideoV2(AUNSaveVideo):
                 "tooltip": "Date format used for %date% and %time% placeholders in path_filename. Explicit %date:<format>% and %time:<format>% placeholders override this per token.",
             },
             ),
+            "gif_palette": legacy_optional["gif_palette"],
+            "encoder_speed": legacy_optional["encoder_speed"],
+            "parallel_segments": legacy_optional["parallel_segments"],
+            "pipe_pixel_format": legacy_optional["pipe_pixel_format"],
         }
         hidden = dict(legacy.get("hidden", {}))
         return {
@@ -65,41 +68,14 @@ class AUNSaveVideoV2(AUNSaveVideo):
 
     @staticmethod
     def _normalize_date_format(fmt: str) -> str:
-        normalized = str(fmt or "%Y-%m-%d")
-        mapping = [
-            ("yyyy", "%Y"),
-            ("MM", "%m"),
-            ("dd", "%d"),
-            ("HH", "%H"),
-            ("mm", "%M"),
-            ("ss", "%S"),
-            ("yy", "%y"),
-            ("M", "%m"),
-            ("d", "%d"),
-            ("H", "%H"),
-            ("m", "%M"),
-            ("s", "%S"),
-        ]
-        for java_token, python_token in mapping:
-            normalized = re.sub(rf"(?<!%)\b{java_token}\b", python_token, normalized)
-        return normalized
+        return java_to_python_datefmt(str(fmt or "%Y-%m-%d"))
 
     @classmethod
     def _resolve_datetime_tokens(cls, path_filename: str, date_format: str) -> str:
-        resolved = str(path_filename or "")
+        plan = compile_template(path_filename, ("date", "time"), datetime_tokens=True)
         now = datetime.now()
-
-        def _replace_explicit(match):
-            token_type = match.group(1)
-            raw_format = match.group(2)
-            normalized = cls._normalize_date_format(raw_format)
-            try:
-                return now.strftime(normalized)
-            except Exception:
-                fallback = "%Y-%m-%d" if token_type == "date" else "%H-%M-%S"
-                return now.strftime(fallback)
-
-        resolved = re.sub(r"%(date|time):([^%]+)%", _replace_explicit, resolved)
+        if not plan.tokens:
+            return plan.render({}, now)
 
         normalized_default = cls._normalize_date_format(date_format)
         try:
@@ -117,11 +93,7 @@ class AUNSaveVideoV2(AUNSaveVideo):
         except Exception:
             time_value = now.strftime("%Y-%m-%d %H:%M:%S")
 
-        for token in ("%date%", "%date"):
-            resolved = resolved.replace(token, date_value)
-        for token in ("%time%", "%time"):
-            resolved = resolved.replace(token, time_value)
-        return resolved
+        return plan.render({"date": date_value, "time": time_value}, now)
 
     def combine_video_v2(
         self,
@@ -147,6 +119,10 @@ class AUNSaveVideoV2(AUNSaveVideo):
         sidecar_format="none",
         date_format="%Y-%m-%d",
         prompt=None,
+        gif_palette="per-frame",
+        encoder_speed="default",
+        parallel_segments=False,
+        pipe_pixel_format="rgb24",
         **kwargs,
     ):
         if sampler_name is None:
@@ -178,6 +154,10 @@ class AUNSaveVideoV2(AUNSaveVideo):
             sidecar_format=sidecar_format,
             date_format=date_format,
             prompt=prompt,
+            gif_palette=gif_palette,
+            encoder_speed=encoder_speed,
+            parallel_segments=parallel_segments,
+            pipe_pixel_format=pipe_pixel_format,
         )
 
 
@@ -1,3 +1,6 @@
+from .aun_event_bus import BYPASS_EVENT, MUTE_EVENT, queue_event, queue_node_mode
+
+
 class AUNSetCollapseAndBypassStateAdvanced:
     @classmethod
     def INPUT_TYPES(cls):
@@ -44,8 +47,6 @@ class AUNSetCollapseAndBypassStateAdvanced:
 
     def set_state(self, node_ids, combined, use_mute, collapse, active):
         try:
-            from server import PromptServer
-
             # Parse node ids
             node_id_list = []
             for s in node_ids.split(','):
@@ -68,26 +69,12 @@ class AUNSetCollapseAndBypassStateAdvanced:
                 collapse_state = bool(collapse)
                 is_active_state = bool(active)
 
+            mode_event = MUTE_EVENT if bool(use_mute) else BYPASS_EVENT
             for node_id in node_id_list:
-                if bool(combined):
-                    # Combined: collapse then disable via chosen mode only
-                    PromptServer.instance.send_sync("AUN_set_collapse_state", {"node_id": node_id, "collapse": True})
-                    if bool(use_mute):
-                        PromptServer.instance.send_sync("AUN-node-mute-state", {"node_id": node_id, "is_active": False})
-                    else:
-                        PromptServer.instance.send_sync("AUN_node_bypass_state", {"node_id": node_id, "is_active": False})
-                else:
-                    # Non-combined: enable/disable via chosen mode first
-                    if bool(use_mute):
-                        PromptServer.instance.send_sync("AUN-node-mute-state", {"node_id": node_id, "is_active": is_active_state})
-                        # Clear bypass to active to avoid leftover bypass state
-                        PromptServer.instance.send_sync("AUN_node_bypass_state", {"node_id": node_id, "is_active": True})
-                    else:
-                        PromptServer.instance.send_sync("AUN_node_bypass_state", {"node_id": node_id, "is_active": is_active_state})
-                        # Clear mute to active to avoid leftover mute state
-                        PromptServer.instance.send_sync("AUN-node-mute-state", {"node_id": node_id, "is_active": True})
-                    # Then adjust collapse/expand
-                    PromptServer.instance.send_sync("AUN_set_collapse_state", {"node_id": node_id, "collapse": collapse_state})
+                # Bypass and mute both set the node mode, so writing the chosen
+                # state also clears the other one (no separate clear event).
+                queue_node_mode(mode_event, node_id, is_active_state)
+                queue_event("AUN_set_collapse_state", {"node_id": node_id, "collapse": collapse_state}, key=("collapse", str(node_id)))
 
             mode = "mute" if bool(use_mute) else "bypass"
             #print(f"[AUNSetCollapseAndBypassStateAdvanced] Set nodes {node_id_list} collapse={collapse_state} active={is_active_state} via {mode}")
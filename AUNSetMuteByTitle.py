@@ -1,3 +1,6 @@
+from .aun_event_bus import queue_event
+
+
 class AUNSetMuteByTitle:
     @classmethod
     def INPUT_TYPES(cls):
@@ -32,12 +35,11 @@ class AUNSetMuteByTitle:
 
     def doit(self, titles, Switch):
         try:
-            from server import PromptServer
             import re
             items = [t.strip() for t in re.split(r'[,\n;]+', titles) if t.strip()]
             if not items:
                 return ()
-            PromptServer.instance.send_sync(
+            queue_event(
                 "AUN_set_mute_by_titles",
                 {"titles": items, "is_active": bool(Switch)}
             )
@@ -1,210 +1,130 @@
 # Alphabetically organized imports
 import logging
-from . import aun_lora_info_server as _aun_lora_info_server
-from . import aun_lora_multi_setup_server as _aun_lora_multi_setup_server
-from .AUNAddToPrompt import AUNAddToPrompt
-from .AUNAddToPromptMulti import AUNAddToPromptMulti
-from .AUNAny import AUNAny
-from .AUNAnyIndexSwitch import AUNAnyIndexSwitch
-from .AUNBookmark import AUNBookmark
-from .AUNBoolean import AUNBoolean
-from .AUNCFG import AUNCFG
-from .AUNCkptClipSkip import AUNCheckpointLoaderWithClipSkip
-from .AUNCollapseConnectionsController import AUNCollapseConnectionsController
-from .AUNEmptyLatent import AUNEmptyLatent
-from .AUNExtractModelName import AUNExtractModelName
-from .AUNExtractPowerLoras import AUNExtractPowerLoras
-from .AUNExtractWidgetValue import AUNExtractWidgetValue
-from .AUNModelNamePass import AUNModelNamePass
-from .AUNModelShorten import AUNModelShorten
-from .AUNLoraLoaderModelOnlyFromString import AUNLoraLoaderModelOnlyFromString
-from .AUNLoRAsByPromptIndex import AUNLoRAsByPromptIndex
-from .AUNGetActiveNodeTitle import AUNGetActiveNodeTitle
-from .AUNGetConnectedNodeTitles import AUNGetConnectedNodeTitles
-from .AUNGraphScraper import AUNGraphScraper
-from .AUNImageLoadResize import AUNImageLoadResize
-from .AUNImageResize import AUNImageResize
-from .AUNImageSingleBatch3 import AUNImageSingleBatch3
-from .AUNImageSliderComparer import AUNImageSliderComparer
-from .AUNImg2Img import AUNImg2Img
-from .AUNImgLoader import AUNImgLoader
-from .AUNInputs import AUNInputs
-from .AUNInputsBasic import AUNInputsBasic
-from .AUNInputsBasicSwitch import AUNInputsBasicSwitch
-from .AUNInputsDiffusers import AUNInputsDiffusers
-from .AUNInputsDiffusersBasic import AUNInputsDiffusersBasic
-from .AUNInputsDiffusersRefineBasic import AUNInputsDiffusersRefineBasic
-from .AUNInputsHybrid import AUNInputsHybrid
-from .AUNInputsRefine import AUNInputsRefine
-from .AUNInputsRefineBasic import AUNInputsRefineBasic
-from .AUNKSamplerPlusV2 import AUNKSamplerPlusV2
-from .AUNKSamplerPlusv3 import AUNKSamplerPlusv3
-from .AUNKSamplerPlusv4 import AUNKSamplerPlusv4
-from .AUNKeywordFaceIDSettings import AUNKeywordFaceIDSettings
-from .AUNKeywordPresetSelector import AUNKeywordPresetSelector
-from .AUNLoraStackWithTriggers import AUNLoraStackWithTriggers
-from .AUNLoraStackWithTriggersModelClip import AUNLoraStackWithTriggersModelClip
-from .AUNManualAutoImageSwitch import AUNManualAutoImageSwitch
-from .AUNManualAutoTextSwitch import AUNManualAutoTextSwitch
-from .AUNMultiBypassIndex import AUNMultiBypassIndex
-from .AUNMultiGroupUniversal import AUNMultiGroupUniversal
-from .AUNMultiMuteIndex import AUNMultiMuteIndex
-from .AUNMultiNegPrompt import AUNMultiNegPrompt
-from .AUNMultiPromptCycler import AUNMultiPromptCycler
-from .AUNMultiUniversal import AUNMultiUniversal
-from .AUNNameCrop import AUNNameCrop
-from .AUNNodeStateController import AUNNodeStateController
-from .AUNPathFilename import AUNPathFilename
-from .AUNPromptCycler import AUNPromptCycler
-from .AUNPathFilenameV2 import AUNPathFilenameV2
-from .AUNPathFilenameVideo import AUNPathFilenameVideo
-from .AUNPathFilenameVideoV2 import AUNPathFilenameVideoV2
-from .AUNPathFilenameVideoResolved import AUNPathFilenameVideoResolved
-from .AUNFilenameResolverPreviewV2 import AUNFilenameResolverPreviewV2
-from .AUNRandomAnySwitch import AUNRandomAnySwitch
-from .AUNRandomIndexSwitch import AUNRandomIndexSwitch
-from .AUNRandomLoraModelOnly import AUNRandomLoraModelOnly
-from .AUNRandomLoraModelOnlyMulti import AUNRandomLoraModelOnlyMulti
-from .AUNRandomModelBundleSwitch import AUNRandomModelBundleSwitch
-from .AUNRandomNumber import AUNRandomNumber
-from .AUNRandomTextIndexSwitch import AUNRandomTextIndexSwitch
-from .AUNRandomTextIndexSwitchV2 import AUNRandomTextIndexSwitchV2
-from .AUNRIFE import AUNRIFE
-from .AUNScanAndShowWidgets import AUNScanAndShowWidgets
-from .AUNSaveImage import AUNSaveImage
-from .AUNSaveImageV2 import AUNSaveImageV2
-from .AUNSaveVideo import AUNSaveVideo
-from .AUNSaveVideo import AudioInputOptions
-from .AUNSaveVideoV2 import AUNSaveVideoV2
-from .AUNSetBypassByTitle import AUNSetBypassByTitle
-from .AUNSetBypassStateGroup import AUNSetBypassStateGroup
-from .AUNSetCollapseAndBypassStateAdvanced import AUNSetCollapseAndBypassStateAdvanced
-from .AUNSetMuteByTitle import AUNSetMuteByTitle
-from .AUNSetMuteStateGroup import AUNSetMuteStateGroup
-from .AUNShowAnyMulti import AUNShowAnyMulti
-from .AUNPassthroughAnyMulti import AUNPassthroughAnyMulti
-from .AUNShowTextWithTitle import AUNShowTextWithTitle
-from .AUNSingleLabelSwitch import AUNSingleLabelSwitch
-from .AUNStringListBuilder import AUNStringListBuilder
-from .AUNStringListIndex import AUNStringListIndex
-from .AUNStrip import AUNStrip
-from .AUNSwitchFloat import AUNSwitchFloat
-from .AUNTextIndexSwitch import AUNTextIndexSwitch
-from .AUNTextIndexSwitch3 import AUNTextIndexSwitch3
-from .AUNTextIndexSwitch4 import AUNTextIndexSwitch4
-from .AUNTextIndexSwitch5 import AUNTextIndexSwitch5
-from .AUNTextIndexSwitch5Diffusers import AUNTextIndexSwitch5Diffusers
-from .AUNImageTitleMultiPreview import AUNImageTitleMultiPreview
-from .AUNTitleImagePreview import AUNTitleImagePreview
-from .AUNWildcardAddToPrompt import AUNWildcardAddToPrompt
-from .KSamplerInputs import KSamplerInputs
-from .MainFolderManualName import MainFolderManualName
-from .TextSwitch2InputWithTextOutput import TextSwitch2InputWithTextOutput
+import time
 
+_STARTED = time.perf_counter()
 
-WEB_DIRECTORY = "./web"
+from .aun_lazy_registry import build_node_mappings, mark_startup_complete, timed_import
+from .logger import logger
+
+# Route modules register their handlers at import, before the server starts.
+for _route_module in (
+    "aun_import_report_server",
+    "aun_lora_info_server",
+    "aun_lora_multi_setup_server",
+    "aun_output_catalog_server",
+    "aun_perf_server",
+    "aun_slider_preview_server",
+):
+    timed_import("." + _route_module, __name__)
 
-NODE_CLASS_MAPPINGS = {
-    "AudioInputOptions": AudioInputOptions,
-    "AUNAddToPrompt": AUNAddToPrompt,
-    "AUNAddToPromptMulti": AUNAddToPromptMulti,
-    "AUNAny": AUNAny,
-    "AUNAnyIndexSwitch": AUNAnyIndexSwitch,
-    "AUNBookmark": AUNBookmark,
-    "AUNBoolean": AUNBoolean,
-    "AUNCFG": AUNCFG,
-    "AUNCheckpointLoaderWithClipSkip": AUNCheckpointLoaderWithClipSkip,
-    "AUNCollapseConnectionsController": AUNCollapseConnectionsController,
-    "AUNEmptyLatent": AUNEmptyLatent,
-    "AUNExtractModelName": AUNExtractModelName,
-    "AUNExtractPowerLoras": AUNExtractPowerLoras,
-    "AUNExtractWidgetValue": AUNExtractWidgetValue,
-    "AUNModelNamePass": AUNModelNamePass,
-    "AUNModelShorten": AUNModelShorten,
-    "AUNLoraLoaderModelOnlyFromString": AUNLoraLoaderModelOnlyFromString,
-    "AUNLoRAsByPromptIndex": AUNLoRAsByPromptIndex,
-    "AUNGetActiveNodeTitle": AUNGetActiveNodeTitle,
-    "AUNGetConnectedNodeTitles": AUNGetConnectedNodeTitles,
-    "AUNGraphScraper": AUNGraphScraper,
-    "AUNImageLoadResize": AUNImageLoadResize,
-    "AUNImageResize": AUNImageResize,
-    "AUNImageSingleBatch3": AUNImageSingleBatch3,
-    "AUNImageSliderComparer": AUNImageSliderComparer,
-    "AUNImg2Img": AUNImg2Img,
-    "AUNImgLoader": AUNImgLoader,
-    "AUNInputs": AUNInputs,
-    "AUNInputsBasic": AUNInputsBasic,
-    "AUNInputsBasicSwitch": AUNInputsBasicSwitch,
-    "AUNInputsDiffusers": AUNInputsDiffusers,
-    "AUNInputsDiffusersBasic": AUNInputsDiffusersBasic,
-    "AUNInputsDiffusersRefineBasic": AUNInputsDiffusersRefineBasic,
-    "AUNInputsHybrid": AUNInputsHybrid,
-    "AUNInputsRefine": AUNInputsRefine,
-    "AUNInputsRefineBasic": AUNInputsRefineBasic,
-    "AUNKSamplerPlusV2": AUNKSamplerPlusV2,
-    "AUNKSamplerPlusv3": AUNKSamplerPlusv3,
-    "AUNKSamplerPlusv4": AUNKSamplerPlusv4,
-    "AUNKeywordFaceIDSettings": AUNKeywordFaceIDSettings,
-    "AUNKeywordPresetSelector": AUNKeywordPresetSelector,
-    "AUNLoraStackWithTriggers": AUNLoraStackWithTriggers,
-    "AUNLoraStackWithTriggersModelClip": AUNLoraStackWithTriggersModelClip,
-    "AUNManualAutoImageSwitch": AUNManualAutoImageSwitch,
-    "AUNManualAutoTextSwitch": AUNManualAutoTextSwitch,
-    "AUNMultiBypassIndex": AUNMultiBypassIndex,
-    "AUNMultiGroupUniversal": AUNMultiGroupUniversal,
-    "AUNMultiMuteIndex": AUNMultiMuteIndex,
-    "AUNMultiNegPrompt": AUNMultiNegPrompt,
-    "AUNMultiPromptCycler": AUNMultiPromptCycler,
-    "AUNMultiUniversal": AUNMultiUniversal,
-    "AUNNameCrop": AUNNameCrop,
-    "AUNNodeStateController": AUNNodeStateController,
-    "AUNPathFilename": AUNPathFilename,
-    "AUNPromptCycler": AUNPromptCycler,
-    "AUNPathFilenameV2": AUNPathFilenameV2,
-    "AUNPathFilenameVideo": AUNPathFilenameVideo,
-    "AUNPathFilenameVideoV2": AUNPathFilenameVideoV2,
-    "AUNPathFilenameVideoResolved": AUNPathFilenameVideoResolved,
-    "AUNFilenameResolverPreviewV2": AUNFilenameResolverPreviewV2,
-    "AUNRandomAnySwitch": AUNRandomAnySwitch,
-    "AUNRandomIndexSwitch": AUNRandomIndexSwitch,
-    "AUNRandomLoraModelOnly": AUNRandomLoraModelOnly,
-    "AUNRandomLoraModelOnlyMulti": AUNRandomLoraModelOnlyMulti,
-    "AUNRandomModelBundleSwitch": AUNRandomModelBundleSwitch,
-    "AUNRandomNumber": AUNRandomNumber,
-    "AUNRandomTextIndexSwitch": AUNRandomTextIndexSwitch,
-    "AUNRandomTextIndexSwitchV2": AUNRandomTextIndexSwitchV2,
-    "AUNRIFE": AUNRIFE,
-    "AUNScanAndShowWidgets": AUNScanAndShowWidgets,
-    "AUNSaveImage": AUNSaveImage,
-    "AUNSaveImageV2": AUNSaveImageV2,
-    "AUNSaveVideo": AUNSaveVideo,
-    "AUNSaveVideoV2": AUNSaveVideoV2,
-    "AUNSetBypassByTitle": AUNSetBypassByTitle,
-    "AUNSetBypassStateGroup": AUNSetBypassStateGroup,
-    "AUNSetCollapseAndBypassStateAdvanced": AUNSetCollapseAndBypassStateAdvanced,
-    "AUNSetMuteByTitle": AUNSetMuteByTitle,
-    "AUNSetMuteStateGroup": AUNSetMuteStateGroup,
-    "AUNShowAnyMulti": AUNShowAnyMulti,
-    "AUNPassthroughAnyMulti": AUNPassthroughAnyMulti,
-    "AUNShowTextWithTitle": AUNShowTextWithTitle,
-    "AUNSingleLabelSwitch": AUNSingleLabelSwitch,
-    "AUNStringListBuilder": AUNStringListBuilder,
-    "AUNStringListIndex": AUNStringListIndex,
-    "AUNStrip": AUNStrip,
-    "AUNSwitchFloat": AUNSwitchFloat,
-    "AUNTextIndexSwitch": AUNTextIndexSwitch,
-    "AUNTextIndexSwitch3": AUNTextIndexSwitch3,
-    "AUNTextIndexSwitch4": AUNTextIndexSwitch4,
-    "AUNTextIndexSwitch5": AUNTextIndexSwitch5,
-    "AUNTextIndexSwitch5Diffusers": AUNTextIndexSwitch5Diffusers,
-    "AUNImageTitleMultiPreview": AUNImageTitleMultiPreview,
-    "AUNTitleImagePreview": AUNTitleImagePreview,
-    "AUNWildcardAddToPrompt": AUNWildcardAddToPrompt,
-    "KSamplerInputs": KSamplerInputs,
-    "MainFolderManualName": MainFolderManualName,
-    "TextSwitch2InputWithTextOutput": TextSwitch2InputWithTextOutput,
+# Node class name -> module that defines it. The classes are imported on first use.
+_NODE_MODULES = {
+    "AudioInputOptions": "AUNSaveVideo",
+    "AUNAddToPrompt": "AUNAddToPrompt",
+    "AUNAddToPromptMulti": "AUNAddToPromptMulti",
+    "AUNAny": "AUNAny",
+    "AUNAnyIndexSwitch": "AUNAnyIndexSwitch",
+    "AUNBookmark": "AUNBookmark",
+    "AUNBoolean": "AUNBoolean",
+    "AUNCFG": "AUNCFG",
+    "AUNCheckpointLoaderWithClipSkip": "AUNCkptClipSkip",
+    "AUNCollapseConnectionsController": "AUNCollapseConnectionsController",
+    "AUNEmptyLatent": "AUNEmptyLatent",
+    "AUNExtractModelName": "AUNExtractModelName",
+    "AUNExtractPowerLoras": "AUNExtractPowerLoras",
+    "AUNExtractWidgetValue": "AUNExtractWidgetValue",
+    "AUNModelNamePass": "AUNModelNamePass",
+    "AUNModelShorten": "AUNModelShorten",
+    "AUNLoraLoaderModelOnlyFromString": "AUNLoraLoaderModelOnlyFromString",
+    "AUNLoRAsByPromptIndex": "AUNLoRAsByPromptIndex",
+    "AUNGetActiveNodeTitle": "AUNGetActiveNodeTitle",
+    "AUNGetConnectedNodeTitles": "AUNGetConnectedNodeTitles",
+    "AUNGraphScraper": "AUNGraphScraper",
+    "AUNImageLoadResize": "AUNImageLoadResize",
+    "AUNImageResize": "AUNImageResize",
+    "AUNImageSingleBatch3": "AUNImageSingleBatch3",
+    "AUNImageSliderComparer": "AUNImageSliderComparer",
+    "AUNImg2Img": "AUNImg2Img",
+    "AUNImgLoader": "AUNImgLoader",
+    "AUNInputs": "AUNInputs",
+    "AUNInputsBasic": "AUNInputsBasic",
+    "AUNInputsBasicSwitch": "AUNInputsBasicSwitch",
+    "AUNInputsDiffusers": "AUNInputsDiffusers",
+    "AUNInputsDiffusersBasic": "AUNInputsDiffusersBasic",
+    "AUNInputsDiffusersRefineBasic": "AUNInputsDiffusersRefineBasic",
+    "AUNInputsHybrid": "AUNInputsHybrid",
+    "AUNInputsRefine": "AUNInputsRefine",
+    "AUNInputsRefineBasic": "AUNInputsRefineBasic",
+    "AUNKSamplerPlusV2": "AUNKSamplerPlusV2",
+    "AUNKSamplerPlusv3": "AUNKSamplerPlusv3",
+    "AUNKSamplerPlusv4": "AUNKSamplerPlusv4",
+    "AUNKeywordFaceIDSettings": "AUNKeywordFaceIDSettings",
+    "AUNKeywordPresetSelector": "AUNKeywordPresetSelector",
+    "AUNLoraStackWithTriggers": "AUNLoraStackWithTriggers",
+    "AUNLoraStackWithTriggersModelClip": "AUNLoraStackWithTriggersModelClip",
+    "AUNManualAutoImageSwitch": "AUNManualAutoImageSwitch",
+    "AUNManualAutoTextSwitch": "AUNManualAutoTextSwitch",
+    "AUNMultiBypassIndex": "AUNMultiBypassIndex",
+    "AUNMultiGroupUniversal": "AUNMultiGroupUniversal",
+    "AUNMultiMuteIndex": "AUNMultiMuteIndex",
+    "AUNMultiNegPrompt": "AUNMultiNegPrompt",
+    "AUNMultiPromptCycler": "AUNMultiPromptCycler",
+    "AUNMultiUniversal": "AUNMultiUniversal",
+    "AUNNameCrop": "AUNNameCrop",
+    "AUNNodeStateController": "AUNNodeStateController",
+    "AUNPathFilename": "AUNPathFilename",
+    "AUNPromptCycler": "AUNPromptCycler",
+    "AUNPathFilenameV2": "AUNPathFilenameV2",
+    "AUNPathFilenameVideo": "AUNPathFilenameVideo",
+    "AUNPathFilenameVideoV2": "AUNPathFilenameVideoV2",
+    "AUNPathFilenameVideoResolved": "AUNPathFilenameVideoResolved",
+    "AUNFilenameResolverPreviewV2": "AUNFilenameResolverPreviewV2",
+    "AUNRandomAnySwitch": "AUNRandomAnySwitch",
+    "AUNRandomIndexSwitch": "AUNRandomIndexSwitch",
+    "AUNRandomLoraModelOnly": "AUNRandomLoraModelOnly",
+    "AUNRandomLoraModelOnlyMulti": "AUNRandomLoraModelOnlyMulti",
+    "AUNRandomModelBundleSwitch": "AUNRandomModelBundleSwitch",
+    "AUNRandomNumber": "AUNRandomNumber",
+    "AUNRandomTextIndexSwitch": "AUNRandomTextIndexSwitch",
+    "AUNRandomTextIndexSwitchV2": "AUNRandomTextIndexSwitchV2",
+    "AUNRIFE": "AUNRIFE",
+    "AUNScanAndShowWidgets": "AUNScanAndShowWidgets",
+    "AUNSaveImage": "AUNSaveImage",
+    "AUNSaveImageV2": "AUNSaveImageV2",
+    "AUNSaveVideo": "AUNSaveVideo",
+    "AUNSaveVideoV2": "AUNSaveVideoV2",
+    "AUNSetBypassByTitle": "AUNSetBypassByTitle",
+    "AUNSetBypassStateGroup": "AUNSetBypassStateGroup",
+    "AUNSetCollapseAndBypassStateAdvanced": "AUNSetCollapseAndBypassStateAdvanced",
+    "AUNSetMuteByTitle": "AUNSetMuteByTitle",
+    "AUNSetMuteStateGroup": "AUNSetMuteStateGroup",
+    "AUNShowAnyMulti": "AUNShowAnyMulti",
+    "AUNPassthroughAnyMulti": "AUNPassthroughAnyMulti",
+    "AUNShowTextWithTitle": "AUNShowTextWithTitle",
+    "AUNSingleLabelSwitch": "AUNSingleLabelSwitch",
+    "AUNStringListBuilder": "AUNStringListBuilder",
+    "AUNStringListIndex": "AUNStringListIndex",
+    "AUNStrip": "AUNStrip",
+    "AUNSwitchFloat": "AUNSwitchFloat",
+    "AUNTextIndexSwitch": "AUNTextIndexSwitch",
+    "AUNTextIndexSwitch3": "AUNTextIndexSwitch3",
+    "AUNTextIndexSwitch4": "AUNTextIndexSwitch4",
+    "AUNTextIndexSwitch5": "AUNTextIndexSwitch5",
+    "AUNTextIndexSwitch5Diffusers": "AUNTextIndexSwitch5Diffusers",
+    "AUNImageTitleMultiPreview": "AUNImageTitleMultiPreview",
+    "AUNTitleImagePreview": "AUNTitleImagePreview",
+    "AUNWildcardAddToPrompt": "AUNWildcardAddToPrompt",
+    "KSamplerInputs": "KSamplerInputs",
+    "MainFolderManualName": "MainFolderManualName",
+    "TextSwitch2InputWithTextOutput": "TextSwitch2InputWithTextOutput",
 }
 
+
+WEB_DIRECTORY = "./web"
+
+NODE_CLASS_MAPPINGS = build_node_mappings(_NODE_MODULES, __name__)
+
 NODE_DISPLAY_NAME_MAPPINGS = {
     "AudioInputOptions": "Audio Input Options",
     "AUNAddToPrompt": "Add-To-Prompt",
@@ -304,4 +224,7 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "MainFolderManualName": "Manual Name",
     "TextSwitch2InputWithTextOutput": "Text Switch 2 Input With Text Output",
 }
+
+logger.debug(f"Registered {len(NODE_CLASS_MAPPINGS)} nodes in {mark_startup_complete(_STARTED):.1f} ms")
+
 __all__ = ["NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS", "WEB_DIRECTORY"]
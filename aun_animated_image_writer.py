@@ -0,0 +1,105 @@
+"""Animated GIF/WebP/APNG writer used by the AUN video savers.
+
+Frames are converted (and, for GIF, quantized) in a small thread pool.
+Pillow releases the GIL for conversion/quantization, so the pool scales
+across cores. The converted frames are collected into a list before saving:
+Pillow's APNG writer reads ``append_images`` more than once, and the WebP
+writer buffers every frame anyway. GIF frames are stored as 8-bit palette
+images, a third of the RGB size.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+GIF_PALETTE_MODES = ["per-frame", "global"]
+
+# Frames sampled (evenly across the clip) to build a shared GIF palette.
+_GLOBAL_PALETTE_SAMPLES = 16
+# Longest side of each sample frame used for palette construction.
+_GLOBAL_PALETTE_SAMPLE_SIZE = 256
+
+
+def _default_workers() -> int:
+    return max(1, min(8, (os.cpu_count() or 1)))
+
+
+def _frame_to_pil(frame) -> Image.Image:
+    array = frame.detach().cpu().numpy()
+    if array.ndim == 4:
+        array = array[0]
+    pixels = np.clip(255.0 * array, 0, 255).astype(np.uint8)
+    if pixels.ndim == 3 and pixels.shape[-1] == 1:
+        pixels = pixels[..., 0]
+    return Image.fromarray(pixels)
+
+
+def _build_global_palette(images) -> Image.Image:
+    """Quantize an even subsample of the clip into one 256-colour palette image."""
+    count = len(images)
+    step = max(1, count // _GLOBAL_PALETTE_SAMPLES)
+    samples = []
+    for index in range(0, count, step):
+        sample = _frame_to_pil(images[index]).convert("RGB")
+        sample.thumbnail((_GLOBAL_PALETTE_SAMPLE_SIZE, _GLOBAL_PALETTE_SAMPLE_SIZE))
+        samples.append(sample)
+        if len(samples) >= _GLOBAL_PALETTE_SAMPLES:
+            break
+    width = max(sample.width for sample in samples)
+    height = sum(sample.height for sample in samples)
+    mosaic = Image.new("RGB", (width, height))
+    offset = 0
+    for sample in samples:
+        mosaic.paste(sample, (0, offset))
+        offset += sample.height
+    return mosaic.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+
+
+def _make_converter(format_ext: str, palette: Image.Image | None):
+    if format_ext == "gif":
+        if palette is not None:
+            def convert(frame):
+                return _frame_to_pil(frame).convert("RGB").quantize(palette=palette)
+        else:
+            def convert(frame):
+                # Same adaptive conversion Pillow's GIF plugin applies to RGB frames.
+                return _frame_to_pil(frame).convert("RGB").convert("P", palette=Image.Palette.ADAPTIVE)
+        return convert
+    return _frame_to_pil
+
+
+def save_animated_image(
+    images,
+    file_path: str,
+    format_ext: str,
+    save_args: dict[str, Any],
+    gif_palette: str = "per-frame",
+    workers: int | None = None,
+) -> None:
+    """Encode an IMAGE batch as an animated GIF/WebP/APNG.
+
+    ``save_args`` carries the Pillow save options (duration, loop, metadata,
+    quality...); ``save_all``/``append_images`` are filled in here.
+    """
+    count = len(images)
+    if count == 0:
+        raise ValueError("No frames to save.")
+
+    palette = None
+    if format_ext == "gif" and gif_palette == "global" and count > 1:
+        palette = _build_global_palette(images)
+    convert = _make_converter(format_ext, palette)
+
+    workers = workers or _default_workers()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aun_anim") as executor:
+        # executor.map keeps frame order
+        frames = list(executor.map(convert, images))
+    args = dict(save_args)
+    args["save_all"] = True
+    args["append_images"] = frames[1:]
+    frames[0].save(file_path, **args)
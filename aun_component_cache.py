@@ -0,0 +1,210 @@
+"""Shared cache of diffusion-model components for the AUN Inputs loaders.
+
+``AUNInputsHybrid`` (Diffusion model source) and the ``AUNInputsDiffusers*``
+nodes load a diffusion model, a text encoder and a VAE on every execution.
+Workflows often pair one large text encoder (T5 and similar) and one VAE
+with several diffusion models. With this cache, switching the diffusion
+model reloads only that file.
+
+Components are cached separately:
+
+- ``("diffusion", name)``
+- ``("clip", name, clip_type)``
+- ``("vae", name)``
+
+Each node instance holds its components in named slots (``"model"``,
+``"refine_model"``, ``"clip"``, ``"vae"``). An entry is referenced while at
+least one slot points at it. Loading a different file into a slot releases
+the old entry, and so does the node being deleted. Referenced entries are
+never evicted. Unreferenced entries stay cached until the cache exceeds its
+budget, and are then evicted least recently used first.
+
+The budget is ``AUN_COMPONENT_CACHE_GB``. It defaults to half the system
+RAM (16 GB when ``psutil`` is missing). ``0`` keeps only referenced entries.
+Entry sizes are the file sizes on disk.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable
+
+from .aun_perf import stage as perf_stage
+from .logger import logger
+
+_BUDGET_ENV = "AUN_COMPONENT_CACHE_GB"
+_GB = 1024 ** 3
+
+# One lock for lookups and loads: ComfyUI executes one node at a time, and
+# loading the same file twice at once would defeat the cache.
+_lock = threading.RLock()
+_entries: dict[tuple, "_Entry"] = {}
+# Holder id -> {slot: entry key}.
+_holders: dict[int, dict[str, tuple]] = {}
+_budget_bytes: int | None = None
+
+
+class _Entry:
+    __slots__ = ("value", "size", "refs", "last_used")
+
+    def __init__(self, value: Any, size: int):
+        self.value = value
+        self.size = size
+        self.refs = 0
+        self.last_used = time.monotonic()
+
+
+def _budget() -> int:
+    global _budget_bytes
+    if _budget_bytes is None:
+        raw = os.environ.get(_BUDGET_ENV, "").strip()
+        budget = None
+        if raw:
+            try:
+                budget = max(0, int(float(raw) * _GB))
+            except ValueError:
+                logger.warning(f"Ignoring invalid {_BUDGET_ENV}={raw!r}")
+        if budget is None:
+            try:
+                import psutil  # type: ignore[import-not-found]
+
+                budget = psutil.virtual_memory().total // 2
+            except Exception:
+                budget = 16 * _GB
+        _budget_bytes = budget
+    return _budget_bytes
+
+
+def _file_size(path: str | None) -> int:
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+
+def _release_slot(holder_id: int, slot: str) -> None:
+    key = _holders.get(holder_id, {}).pop(slot, None)
+    entry = _entries.get(key) if key is not None else None
+    if entry is not None:
+        entry.refs = max(0, entry.refs - 1)
+
+
+def _release_holder(holder_id: int) -> None:
+    with _lock:
+        for slot in list(_holders.get(holder_id, ())):
+            _release_slot(holder_id, slot)
+        _holders.pop(holder_id, None)
+        _evict()
+
+
+def _evict() -> None:
+    budget = _budget()
+    total = sum(entry.size for entry in _entries.values())
+    if total <= budget:
+        return
+    idle = sorted((entry.last_used, key) for key, entry in _entries.items() if entry.refs == 0)
+    for _last_used, key in idle:
+        if total <= budget:
+            break
+        entry = _entries.pop(key)
+        total -= entry.size
+        logger.debug(f"Component cache: evicted {key} ({entry.size / _GB:.2f} GB)")
+
+
+def _acquire(holder: object, slot: str, key: tuple, path: str | None, load: Callable[[], Any]) -> Any:
+    holder_id = id(holder)
+    with _lock:
+        slots = _holders.get(holder_id)
+        if slots is None:
+            slots = _holders[holder_id] = {}
+            weakref.finalize(holder, _release_holder, holder_id)
+
+        entry = _entries.get(key)
+        if entry is None:
+            with perf_stage(f"component.load_{key[0]}") as st:
+                value = load()
+                st.add_bytes(_file_size(path))
+            entry = _entries[key] = _Entry(value, _file_size(path))
+        entry.last_used = time.monotonic()
+
+        if slots.get(slot) != key:
+            _release_slot(holder_id, slot)
+            slots[slot] = key
+            entry.refs += 1
+        _evict()
+        return entry.value
+
+
+def release(holder: object, slot: str | None = None) -> None:
+    """Drop ``holder``'s reference in ``slot`` (all slots when ``None``)."""
+    with _lock:
+        if slot is None:
+            for name in list(_holders.get(id(holder), ())):
+                _release_slot(id(holder), name)
+        else:
+            _release_slot(id(holder), slot)
+        _evict()
+
+
+def load_diffusion_model(holder: object, slot: str, diffusion_name: str):
+    """``comfy.sd.load_diffusion_model`` for a ``diffusion_models`` file, cached."""
+    import comfy.sd  # type: ignore[import-not-found]
+    import folder_paths  # type: ignore[import-not-found]
+
+    path = folder_paths.get_full_path("diffusion_models", diffusion_name)
+    return _acquire(
+        holder,
+        slot,
+        ("diffusion", diffusion_name),
+        path,
+        lambda: comfy.sd.load_diffusion_model(path, model_options={}),
+    )
+
+
+def load_clip(holder: object, slot: str, clip_name: str, clip_type: str):
+    """The core ``CLIPLoader`` result for ``(clip_name, clip_type)``, cached."""
+    import folder_paths  # type: ignore[import-not-found]
+    import nodes  # type: ignore[import-not-found]
+
+    def load():
+        clip_tuple = nodes.CLIPLoader().load_clip(clip_name=clip_name, type=clip_type)
+        return clip_tuple[0] if isinstance(clip_tuple, (list, tuple)) else clip_tuple
+
+    path = folder_paths.get_full_path("text_encoders", clip_name) or folder_paths.get_full_path("clip", clip_name)
+    return _acquire(holder, slot, ("clip", clip_name, clip_type), path, load)
+
+
+def load_vae(holder: object, slot: str, vae_name: str):
+    """The core ``VAELoader`` result for ``vae_name``, cached."""
+    import folder_paths  # type: ignore[import-not-found]
+    import nodes  # type: ignore[import-not-found]
+
+    def load():
+        vae_tuple = nodes.VAELoader().load_vae(vae_name=vae_name)
+        return vae_tuple[0] if isinstance(vae_tuple, (list, tuple)) else vae_tuple
+
+    return _acquire(holder, slot, ("vae", vae_name), folder_paths.get_full_path("vae", vae_name), load)
+
+
+def stats() -> dict[str, Any]:
+    """Cached entries with sizes and reference counts, plus the budget."""
+    with _lock:
+        entries = [
+            {"key": list(key), "size_bytes": entry.size, "refs": entry.refs}
+            for key, entry in sorted(_entries.items(), key=lambda item: item[1].last_used, reverse=True)
+        ]
+    return {
+        "budget_bytes": _budget(),
+        "total_bytes": sum(item["size_bytes"] for item in entries),
+        "entries": entries,
+    }
+
+
+def clear() -> None:
+    """Forget every cached component (held objects stay alive until their users drop them)."""
+    with _lock:
+        _entries.clear()
+        _holders.clear()
@@ -0,0 +1,153 @@
+"""Coalesced node-to-frontend event bus.
+
+Controller nodes used to call ``PromptServer.instance.send_sync`` once per
+target (or per state change). During a prompt those calls are now queued
+here and sent as a single ``AUN_event_batch`` websocket message when the
+prompt finishes (succeeds, fails or is interrupted), which
+``web/event-bus.js`` replays in order in one pass. The end of a prompt is
+detected by wrapping the server's ``send_sync`` once and flushing just
+before the executor's own completion message goes out. If the wrapper
+cannot be installed, events are flushed after a short time window instead.
+
+Queued events may carry a ``key``. A later event with the same key replaces
+the earlier one (it moves to the later position), so superseded state for a
+node is never sent. Bypass and mute share one key per node because both
+write the node's mode: only the last write for a node survives.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Hashable
+
+BATCH_EVENT = "AUN_event_batch"
+BYPASS_EVENT = "AUN_node_bypass_state"
+MUTE_EVENT = "AUN-node-mute-state"
+
+# Fallback only: without the prompt-end hook, events queued within this window are sent together.
+_FLUSH_DELAY_SEC = 0.1
+
+# Executor messages that end a prompt; "executing" with no node does too.
+_PROMPT_END_EVENTS = frozenset({"execution_success", "execution_error", "execution_interrupted"})
+_HOOK_ATTR = "_aun_event_bus_hooked"
+
+_lock = threading.Lock()
+_items: list[tuple[str, Any, bool] | None] = []
+_keyed: dict[Hashable, int] = {}
+
+
+def _get_server():
+    try:
+        from server import PromptServer  # type: ignore[import-not-found]
+
+        return PromptServer.instance
+    except Exception:
+        return None
+
+
+def _append(event: str, data: Any, key: Hashable | None, node_update: bool) -> bool:
+    """Queue one item; returns True when the queue was empty (a flush must be scheduled)."""
+    with _lock:
+        was_empty = not _items
+        if key is not None:
+            previous = _keyed.pop(key, None)
+            if previous is not None:
+                _items[previous] = None
+        _items.append((event, data, node_update))
+        if key is not None:
+            _keyed[key] = len(_items) - 1
+        return was_empty
+
+
+def _is_prompt_end(event: str, data: Any) -> bool:
+    if event in _PROMPT_END_EVENTS:
+        return True
+    return event == "executing" and isinstance(data, dict) and data.get("node") is None
+
+
+def _install_prompt_hook(server) -> bool:
+    """Wrap ``server.send_sync`` so queued events flush when a prompt ends; True when in place."""
+    if getattr(server, _HOOK_ATTR, False):
+        return True
+    send_sync = getattr(server, "send_sync", None)
+    if not callable(send_sync):
+        return False
+
+    def send_sync_with_flush(event, data, *args, **kwargs):
+        if _is_prompt_end(event, data):
+            flush_events()
+        return send_sync(event, data, *args, **kwargs)
+
+    try:
+        server.send_sync = send_sync_with_flush
+        setattr(server, _HOOK_ATTR, True)
+    except Exception:
+        return False
+    return True
+
+
+def _schedule_flush() -> None:
+    server = _get_server()
+    if server is None:
+        flush_events()
+        return
+    if _install_prompt_hook(server):
+        return
+    loop = getattr(server, "loop", None)
+    if loop is None:
+        flush_events()
+        return
+    try:
+        loop.call_soon_threadsafe(loop.call_later, _FLUSH_DELAY_SEC, flush_events)
+    except Exception:
+        flush_events()
+
+
+def queue_event(event: str, data: Any, key: Hashable | None = None) -> None:
+    """Queue a frontend event; ``key`` identifies state a later event may supersede."""
+    if _append(event, data, key, False):
+        _schedule_flush()
+
+
+def queue_node_mode(event: str, node_id: Any, is_active: bool) -> None:
+    """Queue a bypass/mute state for one node (last write per node wins)."""
+    update = {"node_id": node_id, "is_active": bool(is_active)}
+    if _append(event, update, ("node_mode", str(node_id)), True):
+        _schedule_flush()
+
+
+def _drain() -> list[dict[str, Any]]:
+    with _lock:
+        items = [item for item in _items if item is not None]
+        _items.clear()
+        _keyed.clear()
+
+    # Consecutive per-node bypass/mute updates of the same event are packed
+    # into one {"updates": [...]} message, which both handlers accept.
+    events: list[dict[str, Any]] = []
+    for event, data, node_update in items:
+        if node_update:
+            last = events[-1] if events else None
+            if last is not None and last.get("_updates") and last["type"] == event:
+                last["data"]["updates"].append(data)
+                continue
+            events.append({"type": event, "data": {"updates": [data]}, "_updates": True})
+            continue
+        events.append({"type": event, "data": data})
+    for entry in events:
+        entry.pop("_updates", None)
+    return events
+
+
+def flush_events() -> None:
+    """Send everything queued so far as one batch message."""
+    events = _drain()
+    if not events:
+        return
+    server = _get_server()
+    if server is None:
+        return
+    try:
+        server.send_sync(BATCH_EVENT, {"events": events})
+    except Exception as e:
+        print(f"[AUN] Could not send event batch: {e}")
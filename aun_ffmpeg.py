@@ -0,0 +1,217 @@
+"""ffmpeg/ffprobe process manager for the AUN video savers.
+
+Probes
+    :func:`probe` runs a single ``ffprobe -show_format -show_streams`` JSON
+    call per file and caches the result by path, size and mtime. The codec,
+    duration and audio-track checks all read from it, so a file is probed
+    once, however many questions are asked about it.
+
+Process limit
+    :func:`run`, :func:`run_piped`, :func:`popen_communicate` and
+    :func:`submit` pass every ffmpeg process through one shared semaphore.
+    Several saves running at once (multi-output workflows, parallel segment
+    encodes) then queue instead of oversubscribing the CPU. The limit is ``AUN_FFMPEG_JOBS``
+    (default: a quarter of the CPU count, at least 2). ffmpeg threads
+    internally, so a few processes already use most cores.
+
+Background jobs
+    :func:`submit` starts a command on a small thread pool and returns a
+    ``Future``. The video saver trims audio this way while the video
+    segments encode.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from .aun_perf import stage as perf_stage
+from .logger import logger
+
+_JOBS_ENV = "AUN_FFMPEG_JOBS"
+_MAX_PROBES = 256
+
+_probe_lock = threading.Lock()
+_probes: "OrderedDict[tuple[str, int, int], dict]" = OrderedDict()
+
+_slots_lock = threading.Lock()
+_slots: threading.BoundedSemaphore | None = None
+_executor: ThreadPoolExecutor | None = None
+
+
+def max_jobs() -> int:
+    """How many ffmpeg processes may run at once."""
+    raw = os.environ.get(_JOBS_ENV, "").strip()
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            logger.warning(f"Ignoring invalid {_JOBS_ENV}={raw!r}")
+    return max(2, (os.cpu_count() or 1) // 4)
+
+
+def _semaphore() -> threading.BoundedSemaphore:
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(max_jobs())
+        return _slots
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _slots_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_jobs(), thread_name_prefix="aun_ffmpeg")
+        return _executor
+
+
+def ffprobe_path() -> str:
+    """``ffprobe`` next to ffmpeg on PATH, else the bare name."""
+    return shutil.which("ffprobe") or "ffprobe"
+
+
+def run(args: list[str], **kwargs) -> subprocess.CompletedProcess:
+    """``subprocess.run`` inside the shared process limit."""
+    with _semaphore():
+        return subprocess.run(args, **kwargs)
+
+
+def popen_communicate(args: list[str], **kwargs) -> tuple[int, Any, Any]:
+    """Run ``args`` with ``Popen``/``communicate`` inside the process limit.
+
+    Returns ``(returncode, stdout, stderr)``. The pipes are closed before
+    returning so Windows releases the output files straight away.
+    """
+    with _semaphore():
+        process = subprocess.Popen(args, **kwargs)
+        try:
+            stdout, stderr = process.communicate()
+        finally:
+            for stream in (process.stdout, process.stderr, process.stdin):
+                try:
+                    if stream:
+                        stream.close()
+                except Exception:
+                    pass
+        return process.returncode, stdout, stderr
+
+
+def run_piped(args: list[str], chunks, check: bool = False, **kwargs) -> subprocess.CompletedProcess:
+    """Run ``args`` inside the process limit, writing each buffer from ``chunks`` to its stdin.
+
+    Like ``subprocess.run(..., capture_output=True)``, but the input is
+    streamed, so the caller never has to join it into one ``bytes`` object.
+    """
+    with _semaphore():
+        process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+        output: dict[str, bytes] = {}
+
+        def drain(name, stream):
+            output[name] = stream.read()
+
+        # ffmpeg blocks once a pipe it writes is full, so both are read while we feed stdin.
+        readers = [
+            threading.Thread(target=drain, args=(name, stream), daemon=True)
+            for name, stream in (("stdout", process.stdout), ("stderr", process.stderr))
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its return code and stderr say why
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            returncode = process.wait()
+            for reader in readers:
+                reader.join()
+            for stream in (process.stdout, process.stderr):
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+    stdout, stderr = output.get("stdout", b""), output.get("stderr", b"")
+    if check and returncode:
+        raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+
+def submit(args: list[str], **kwargs) -> Future:
+    """Start :func:`run` in the background; the future resolves to its ``CompletedProcess``."""
+    return _pool().submit(run, args, **kwargs)
+
+
+def probe(path: str) -> dict | None:
+    """``ffprobe`` format and stream info for ``path`` (cached), or ``None`` when it cannot be read."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _probe_lock:
+        info = _probes.get(key)
+        if info is not None:
+            _probes.move_to_end(key)
+            return info
+    try:
+        with perf_stage("video.probe"):
+            result = subprocess.run(
+                [ffprobe_path(), "-v", "error", "-show_format", "-show_streams", "-of", "json", path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=True,
+            )
+        info = json.loads(result.stdout or "{}")
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        logger.debug(f"ffprobe failed for {path}: {e}")
+        return None
+    with _probe_lock:
+        _probes[key] = info
+        while len(_probes) > _MAX_PROBES:
+            _probes.popitem(last=False)
+    return info
+
+
+def _streams(path: str, codec_type: str) -> list[dict]:
+    info = probe(path) or {}
+    return [s for s in info.get("streams", []) or [] if isinstance(s, dict) and s.get("codec_type") == codec_type]
+
+
+def video_codec(path: str) -> str | None:
+    """Codec name of the first video stream, lowercased."""
+    streams = _streams(path, "video")
+    codec = str(streams[0].get("codec_name") or "").strip().lower() if streams else ""
+    return codec or None
+
+
+def has_audio(path: str) -> bool:
+    return bool(_streams(path, "audio"))
+
+
+def duration(path: str) -> float | None:
+    """Container duration in seconds."""
+    info = probe(path) or {}
+    try:
+        return float(info["format"]["duration"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def clear_probe_cache() -> None:
+    with _probe_lock:
+        _probes.clear()
@@ -0,0 +1,120 @@
+"""Unique output filename allocation shared by the AUN savers.
+
+Names follow the savers' existing scheme: the bare ``<stem>.<ext>`` first,
+then ``<stem>_NNN.<ext>`` counting up from ``first_index``. Instead of
+probing ``os.path.exists`` for every counter value, the highest counter in
+use is remembered per (directory, stem, extension). It is seeded by a
+single ``os.scandir`` the first time a stem is seen. Only suffixes this
+module writes count: three-digit ``_NNN`` values, plus longer ones that
+continue an unbroken run past ``_999``. Seeds, dates and other numeric
+suffixes (``img_12345``, ``img_240101``) never move the counter.
+
+Names are reserved by creating the file with ``O_CREAT | O_EXCL``, so two
+concurrent saves (threads or processes) can never get the same name. A
+file created by someone else after the index was seeded makes the create
+fail, and allocation just moves on to the next counter.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# Sentinel counter meaning "only the bare name is taken".
+_BARE = 0
+_MAX_ENTRIES = 4096
+# Suffixes are zero-padded to this width; wider ones only count as a run continuing past 999.
+_WIDTH = 3
+
+_lock = threading.Lock()
+# (directory, stem, ext) -> highest counter known to be in use.
+_high_water: "OrderedDict[tuple[str, str, str], int]" = OrderedDict()
+
+
+def _scan(directory: str, stem: str, ext: str) -> int | None:
+    """Highest counter in use for ``stem``/``ext`` (``_BARE`` for the bare name only)."""
+    pattern = re.compile(re.escape(stem) + r"(?:_(\d{3,}))?\." + re.escape(ext) + r"$")
+    highest = None
+    wide: set[int] = set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                match = pattern.match(entry.name)
+                if not match:
+                    continue
+                digits = match.group(1)
+                if digits and len(digits) > _WIDTH:
+                    # Counted below only if it continues the run past 999; leading zeros are never ours.
+                    if not digits.startswith("0"):
+                        wide.add(int(digits))
+                    continue
+                counter = int(digits) if digits else _BARE
+                if highest is None or counter > highest:
+                    highest = counter
+    except FileNotFoundError:
+        return None
+    if highest is not None:
+        while highest + 1 in wide:
+            highest += 1
+    return highest
+
+
+def _try_create(path: str) -> bool:
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    return True
+
+
+def reserve_unique_path(directory: str, stem: str, ext: str, first_index: int = 1) -> tuple[str, str]:
+    """Reserve a free ``<stem>[_NNN].<ext>`` in ``directory``.
+
+    Returns ``(unique_stem, full_path)``. The file is created empty; the
+    caller overwrites it. ``first_index`` is the counter used after the bare
+    name (AUNSaveImage continues at ``_002``, AUNSaveVideo at ``_001``).
+    """
+    subdir, stem = os.path.split(stem)
+    if subdir:
+        directory = os.path.join(directory, subdir)
+    key = (os.path.normcase(os.path.abspath(directory)), stem, ext)
+    with _lock:
+        highest = _high_water.get(key)
+        if highest is None:
+            highest = _scan(directory, stem, ext)
+        else:
+            _high_water.move_to_end(key)
+
+        candidate = None if highest is None else max(highest + 1, first_index)
+        while True:
+            name = stem if candidate is None else f"{stem}_{candidate:03}"
+            path = os.path.join(directory, f"{name}.{ext}")
+            if _try_create(path):
+                _high_water[key] = _BARE if candidate is None else candidate
+                if len(_high_water) > _MAX_ENTRIES:
+                    _high_water.popitem(last=False)
+                return os.path.join(subdir, name) if subdir else name, path
+            candidate = first_index if candidate is None else candidate + 1
+
+
+def release_reserved_path(path: str) -> None:
+    """Remove a reserved file that was never written (still empty).
+
+    The folder's remembered counters for that extension are dropped too, so
+    the next save rescans and reuses the freed name instead of skipping it.
+    """
+    try:
+        if os.path.getsize(path) != 0:
+            return
+        os.remove(path)
+    except OSError:
+        return
+    directory, name = os.path.split(path)
+    directory = os.path.normcase(os.path.abspath(directory))
+    ext = name.rpartition(".")[2]
+    with _lock:
+        for key in [k for k in _high_water if k[0] == directory and k[2] == ext]:
+            del _high_water[key]
@@ -0,0 +1,123 @@
+"""Frame conversion for piping IMAGE batches into ffmpeg.
+
+The video saver used to build a float->uint8 numpy copy of a whole segment
+and then a second full copy with ``tobytes()`` for ``subprocess.run``.
+:class:`FramePipe` converts a few frames at a time into preallocated uint8
+buffers and yields ``memoryview`` slices of them. The caller writes those
+straight to ffmpeg's stdin (:func:`aun_ffmpeg.run_piped`), so no
+segment-sized copy is ever made.
+
+For CUDA tensors the conversion runs on the GPU. The buffers are pinned,
+and the device->host copy of the next chunk overlaps the pipe write of the
+current one. The pipe has two buffers, which is enough because each chunk
+is fully written before the generator resumes.
+
+``pixel_format="auto"`` sends single-channel batches as ``gray`` and
+four-channel batches as ``rgba`` instead of expanding/cropping to
+``rgb24``; grayscale output then moves a third of the bytes.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy as np
+import torch
+
+PIPE_PIXEL_FORMATS = ["rgb24", "auto"]
+
+_PIX_FMT_BY_CHANNELS = {1: "gray", 3: "rgb24", 4: "rgba"}
+_CHUNK_FRAMES = 8
+
+
+def _as_bhwc(batch) -> torch.Tensor:
+    """``batch`` as an (N,H,W,C) tensor, accepting NCHW, frame lists and numpy arrays."""
+    if isinstance(batch, (list, tuple)):
+        batch = torch.stack([torch.as_tensor(np.asarray(f)) if not isinstance(f, torch.Tensor) else f for f in batch])
+    elif not isinstance(batch, torch.Tensor):
+        batch = torch.as_tensor(np.asarray(batch))
+    if batch.dim() == 3:
+        batch = batch.unsqueeze(0)
+    if batch.dim() == 4 and batch.shape[-1] in (1, 3, 4):
+        return batch
+    if batch.dim() == 4 and batch.shape[1] in (1, 3, 4):
+        return batch.permute(0, 2, 3, 1)
+    raise ValueError(f"Unsupported image batch shape {tuple(batch.shape)}; expected (N,H,W,C) or (N,C,H,W)")
+
+
+def source_channels(images) -> int:
+    """Channel count of the frames in ``images``."""
+    return int(_as_bhwc(images[:1]).shape[-1])
+
+
+def pipe_pix_fmt(channels: int, pixel_format: str = "rgb24") -> tuple[str, int]:
+    """ffmpeg ``-pix_fmt`` for the raw input and the channels written per pixel."""
+    if pixel_format == "auto" and channels in _PIX_FMT_BY_CHANNELS:
+        return _PIX_FMT_BY_CHANNELS[channels], channels
+    return "rgb24", 3
+
+
+class FramePipe:
+    """Reusable uint8 staging buffers for one encoder thread."""
+
+    def __init__(self, chunk_frames: int = _CHUNK_FRAMES):
+        self.chunk_frames = max(1, int(chunk_frames))
+        self._buffers: list[torch.Tensor] = []
+        self._key = None
+
+    def _staging(self, shape: tuple[int, ...], pinned: bool) -> list[torch.Tensor]:
+        key = (shape, pinned)
+        if self._key != key:
+            self._buffers = [torch.empty(shape, dtype=torch.uint8, pin_memory=pinned) for _ in range(2)]
+            self._key = key
+        return self._buffers
+
+    @staticmethod
+    def _to_uint8(chunk: torch.Tensor, channels: int) -> torch.Tensor:
+        if chunk.dtype == torch.uint8:
+            pixels = chunk
+        else:
+            if not chunk.is_floating_point():
+                chunk = chunk.float()
+            pixels = chunk.clamp(0, 1).mul(255.0).add_(0.5).to(torch.uint8)
+        have = pixels.shape[-1]
+        if have == channels:
+            return pixels
+        if have == 1:
+            return pixels.expand(*pixels.shape[:-1], channels)
+        return pixels[..., :channels]
+
+    def chunks(self, images, channels: int = 3) -> Iterator[memoryview]:
+        """Yield ``images`` as raw ``channels``-per-pixel bytes, a few frames per view.
+
+        A view is only valid until the next one is requested.
+        """
+        frames = _as_bhwc(images)
+        count = int(frames.shape[0])
+        if count == 0:
+            return
+        height, width = int(frames.shape[1]), int(frames.shape[2])
+        on_gpu = frames.is_cuda
+        step = self.chunk_frames
+        buffers = self._staging((step, height, width, channels), on_gpu)
+
+        pending = None
+        for index, start in enumerate(range(0, count, step)):
+            n = min(step, count - start)
+            target = buffers[index % 2][:n]
+            target.copy_(self._to_uint8(frames[start:start + n], channels), non_blocking=on_gpu)
+            event = None
+            if on_gpu:
+                event = torch.cuda.Event()
+                event.record()
+            if pending is not None:
+                yield self._view(*pending)
+            pending = (target, event)
+        if pending is not None:
+            yield self._view(*pending)
+
+    @staticmethod
+    def _view(target: torch.Tensor, event) -> memoryview:
+        if event is not None:
+            event.synchronize()
+        return memoryview(target.numpy()).cast("B")
@@ -0,0 +1,117 @@
+"""Image decoding for the AUN image loaders.
+
+The loaders used to open every file with ``ImageSequence.Iterator`` and
+convert each frame to float32 at full resolution, one file after another.
+That is the right thing for a single image batch, but list outputs keep
+only frame 0 of each file. :func:`load_first_frames` decodes just that
+frame, on a thread pool (Pillow releases the GIL while decoding), and
+returns the tensors in input order.
+
+With a ``size_hint`` (the longest side the consumer needs), JPEGs are
+decoded with ``Image.draft``, which uses the codec's DCT scaling to decode
+at 1/2, 1/4 or 1/8 size directly. The draft never goes below the hint, so
+the result is at least ``size_hint`` pixels on its longest side; other
+formats decode at full size.
+
+Load-and-resize nodes know their exact output size up front. They call
+:func:`draft_scale` before decoding and :func:`reduce_scale` on the decoded
+frame, so a 6000x4000 photo headed for 1024 pixels is decoded at 1/2 or
+1/4 size and box-reduced before the float conversion; the node then runs
+its usual exact resize. Both stop at :data:`RESIZE_GAP` times the target,
+the margin Pillow's own ``thumbnail`` keeps, so the final filter still
+sees more pixels than it outputs.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+import numpy as np
+import torch
+from PIL import Image, ImageOps
+
+# Reduced decodes stay at least this many times larger than the resize target.
+RESIZE_GAP = 2.0
+
+# Modes Image.reduce handles; palette and bilevel frames are left alone.
+_REDUCE_MODES = frozenset({"L", "LA", "La", "RGB", "RGBA", "RGBa", "RGBX", "CMYK", "YCbCr", "I", "F"})
+
+# EXIF orientations that swap width and height.
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def _default_workers() -> int:
+    return max(1, min(8, (os.cpu_count() or 1)))
+
+
+def oriented_size(image: Image.Image) -> tuple[int, int]:
+    """``image.size`` after ``ImageOps.exif_transpose``, without decoding."""
+    width, height = image.size
+    try:
+        orientation = image.getexif().get(0x0112)
+    except Exception:
+        orientation = None
+    if orientation in _TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def draft_scale(image: Image.Image, scale: float) -> Image.Image:
+    """Let the JPEG decoder skip detail below ``scale`` of the full size (no-op for other formats).
+
+    The decoded size is never smaller than ``scale`` times the original. Call
+    before the first pixel access.
+    """
+    if scale >= 1.0 or scale <= 0.0 or image.format != "JPEG":
+        return image
+    width, height = image.size
+    image.draft(image.mode, (max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))))
+    return image
+
+
+def reduce_scale(image: Image.Image, scale: float) -> Image.Image:
+    """Box-reduce ``image`` by the largest integer factor that keeps it at least ``scale`` of its size."""
+    if scale <= 0.0 or image.mode not in _REDUCE_MODES:
+        return image
+    factor = int(1.0 / scale)
+    if factor < 2:
+        return image
+    return image.reduce(factor)
+
+
+def draft(image: Image.Image, size_hint: int) -> Image.Image:
+    """Ask the JPEG decoder for a reduced-size decode no smaller than ``size_hint`` (no-op otherwise)."""
+    longest = max(image.size)
+    if size_hint > 0 and longest > size_hint:
+        draft_scale(image, size_hint / longest)
+    return image
+
+
+def frame_to_tensor(frame: Image.Image) -> torch.Tensor:
+    """One PIL frame as a ``[1, H, W, 3]`` float32 tensor, oriented and in RGB."""
+    frame = ImageOps.exif_transpose(frame)
+    if frame.mode == 'I':
+        frame = frame.point(lambda i: i * (1 / 255))
+    image = frame.convert("RGB")
+    image_np = np.array(image).astype(np.float32) / 255.0
+    return torch.from_numpy(image_np)[None,]
+
+
+def load_first_frame(path: str, size_hint: int = 0) -> torch.Tensor:
+    """Frame 0 of the image at ``path`` as a ``[1, H, W, 3]`` tensor."""
+    with Image.open(path) as image:
+        draft(image, size_hint)
+        return frame_to_tensor(image)
+
+
+def load_first_frames(paths: Iterable[str], size_hint: int = 0, workers: int | None = None) -> list[torch.Tensor]:
+    """:func:`load_first_frame` for each of ``paths``, decoded in parallel, in order."""
+    paths = list(paths)
+    workers = min(workers or _default_workers(), len(paths))
+    if workers <= 1:
+        return [load_first_frame(path, size_hint) for path in paths]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aun_decode") as executor:
+        return list(executor.map(lambda path: load_first_frame(path, size_hint), paths))
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from aiohttp import web
+
+from server import PromptServer
+
+from .aun_lazy_registry import import_report
+
+
+@PromptServer.instance.routes.get("/aun/import_times")
+async def aun_import_times(request: web.Request) -> web.Response:
+    return web.json_response(import_report())
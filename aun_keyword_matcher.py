@@ -0,0 +1,168 @@
+"""Compiled multi-keyword matcher for the keyword preset nodes.
+
+The keyword nodes take numbered rows of comma-separated keywords and pick
+the first row (top to bottom) with a keyword in the reference phrase; within
+a row the first listed keyword wins. :func:`get_matcher` compiles one
+configuration into an Aho-Corasick automaton (cached), so the phrase is
+scanned once no matter how many keywords there are, instead of one
+substring test per keyword.
+
+Match modes:
+
+- ``substring``: a keyword matches anywhere (the original behaviour).
+- ``whole word``: a keyword must not touch a letter, digit or ``_`` on
+  either side.
+- ``regex``: each keyword is a regular expression. Patterns are compiled
+  once and tried in priority order; Aho-Corasick does not apply.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from typing import NamedTuple
+
+MATCH_MODES = ["substring", "whole word", "regex"]
+
+
+class KeywordMatch(NamedTuple):
+    """One keyword occurrence. ``row`` is 1-based; ``start``/``end`` index the searched text."""
+
+    row: int
+    keyword: str
+    start: int
+    end: int
+
+
+def split_keywords(raw) -> tuple[str, ...]:
+    """Comma-separated keywords of one row, stripped, empties dropped."""
+    return tuple(k.strip() for k in str(raw or "").split(",") if k.strip())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Matches the keywords of ``rows`` (tuples of keywords, row 1 first)."""
+
+    def __init__(self, rows: tuple[tuple[str, ...], ...], case_sensitive: bool = False, mode: str = "substring"):
+        self.case_sensitive = bool(case_sensitive)
+        self.mode = mode if mode in MATCH_MODES else "substring"
+        # Keywords in priority order as (row, keyword); the index is the priority.
+        self._keywords: list[tuple[int, str]] = [
+            (row, keyword) for row, keywords in enumerate(rows, start=1) for keyword in keywords if keyword
+        ]
+        self._regexes: list[re.Pattern | None] = []
+        if self.mode == "regex":
+            flags = 0 if self.case_sensitive else re.IGNORECASE
+            for row, keyword in self._keywords:
+                try:
+                    self._regexes.append(re.compile(keyword, flags))
+                except re.error as e:
+                    print(f"[AUN Keyword Matcher] Invalid regex {keyword!r} in row {row}: {e}")
+                    self._regexes.append(None)
+        else:
+            self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        # Trie nodes: goto transitions, failure link and the priorities of
+        # the keywords ending at the node (including via failure links).
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        for priority, (_row, keyword) in enumerate(self._keywords):
+            state = 0
+            for ch in keyword if self.case_sensitive else keyword.lower():
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(priority)
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def _prepare(self, text) -> str:
+        text = str(text or "")
+        return text if self.case_sensitive or self.mode == "regex" else text.lower()
+
+    def _scan(self, text: str):
+        """Yield ``(priority, start, end)`` for every keyword occurrence, in text order."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        whole_word = self.mode == "whole word"
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for priority in outputs[state]:
+                end = i + 1
+                start = end - len(self._keywords[priority][1])
+                if whole_word and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (end < len(text) and _is_word_char(text[end]))
+                ):
+                    continue
+                yield priority, start, end
+
+    def first(self, text) -> KeywordMatch | None:
+        """The highest-priority keyword found in ``text`` (first row, then first listed)."""
+        text = self._prepare(text)
+        if not text or not self._keywords:
+            return None
+        if self.mode == "regex":
+            for (row, keyword), regex in zip(self._keywords, self._regexes):
+                found = regex.search(text) if regex is not None else None
+                if found:
+                    return KeywordMatch(row, keyword, found.start(), found.end())
+            return None
+
+        best = None
+        for priority, start, end in self._scan(text):
+            if best is None or priority < best[0]:
+                best = (priority, start, end)
+                if priority == 0:
+                    break
+        if best is None:
+            return None
+        row, keyword = self._keywords[best[0]]
+        return KeywordMatch(row, keyword, best[1], best[2])
+
+    def find_all(self, text) -> list[KeywordMatch]:
+        """Every keyword occurrence in ``text``, ordered by position."""
+        text = self._prepare(text)
+        if not text or not self._keywords:
+            return []
+        if self.mode == "regex":
+            matches = [
+                KeywordMatch(row, keyword, found.start(), found.end())
+                for (row, keyword), regex in zip(self._keywords, self._regexes)
+                if regex is not None
+                for found in regex.finditer(text)
+            ]
+            matches.sort(key=lambda m: (m.start, m.row))
+            return matches
+        matches = [KeywordMatch(*self._keywords[priority], start, end) for priority, start, end in self._scan(text)]
+        matches.sort(key=lambda m: (m.start, m.row))
+        return matches
+
+
+@functools.lru_cache(maxsize=64)
+def get_matcher(rows: tuple[tuple[str, ...], ...], case_sensitive: bool = False, mode: str = "substring") -> KeywordMatcher:
+    """Cached :class:`KeywordMatcher` for one keyword configuration."""
+    return KeywordMatcher(rows, case_sensitive, mode)
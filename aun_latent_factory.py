@@ -0,0 +1,172 @@
+"""Empty latents for the AUN Inputs and Empty Latent nodes.
+
+The nodes used to build ``torch.zeros([batch, 4, h // 8, w // 8])`` on the
+CPU. When a node matched the model's latent channels, it then passed that
+tensor through ``comfy.sample.fix_empty_latent_channels``, which allocates a
+second tensor for 16-channel (and 3D) latent formats. :func:`empty_latent`
+reads the model's latent format first and allocates the final shape once, on
+ComfyUI's intermediate device, like the core ``EmptyLatentImage`` node.
+
+Latent specs are cached per model. LoRA clones of a model share the inner
+model object, so a spec is looked up once per loaded model file.
+
+Set ``AUN_LATENT_EXPAND_BATCH=<n>`` to return batches of at least ``n``
+latents as an expanded view of a single zero latent, with no per-item
+memory. It is off by default because nodes that write to a latent in place,
+or save it without copying, fail on expanded tensors.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+from typing import NamedTuple
+
+import torch
+
+from .logger import logger
+
+_EXPAND_ENV = "AUN_LATENT_EXPAND_BATCH"
+
+
+class LatentSpec(NamedTuple):
+    channels: int
+    downscale: int
+    dimensions: int
+
+
+# The core EmptyLatentImage layout, used without a model.
+DEFAULT_SPEC = LatentSpec(4, 8, 2)
+
+_lock = threading.Lock()
+_specs: "weakref.WeakKeyDictionary[object, LatentSpec]" = weakref.WeakKeyDictionary()
+_expand_min: int | None = None
+
+
+def _expand_min_batch() -> int:
+    global _expand_min
+    if _expand_min is None:
+        raw = os.environ.get(_EXPAND_ENV, "").strip()
+        value = 0
+        if raw:
+            try:
+                value = max(0, int(raw))
+            except ValueError:
+                logger.warning(f"Ignoring invalid {_EXPAND_ENV}={raw!r}")
+        _expand_min = value
+    return _expand_min
+
+
+def _latent_format(model):
+    getter = getattr(model, "get_model_object", None)
+    if callable(getter):
+        try:
+            return getter("latent_format")
+        except Exception:
+            pass
+    return getattr(getattr(model, "model", None), "latent_format", None)
+
+
+def _read_spec(model) -> LatentSpec | None:
+    latent_format = _latent_format(model)
+    channels = getattr(latent_format, "latent_channels", None)
+    if channels is None:
+        channels = getattr(model, "latent_channels", None)
+        if channels is None:
+            channels = getattr(getattr(model, "model", None), "latent_channels", None)
+    if channels is None:
+        return None
+    return LatentSpec(
+        int(channels),
+        int(getattr(latent_format, "spacial_downscale_ratio", 8) or 8),
+        int(getattr(latent_format, "latent_dimensions", 2) or 2),
+    )
+
+
+def latent_spec(model) -> LatentSpec | None:
+    """Latent channels, spatial downscale and dimensions of ``model``, or ``None`` when unknown."""
+    if model is None:
+        return None
+    # ModelPatcher clones (LoRAs, clip skip) share the inner model.
+    owner = getattr(model, "model", None)
+    if owner is None:
+        owner = model
+    with _lock:
+        try:
+            spec = _specs.get(owner)
+        except TypeError:
+            spec = None
+    if spec is not None:
+        return spec
+    spec = _read_spec(model)
+    if spec is not None:
+        with _lock:
+            try:
+                _specs[owner] = spec
+            except TypeError:
+                pass
+        try:
+            # Read by the KSampler Plus nodes when they match latent channels.
+            setattr(model, "_aun_latent_channels", spec.channels)
+        except Exception:
+            pass
+    return spec
+
+
+def _device():
+    try:
+        import comfy.model_management  # type: ignore[import-not-found]
+
+        return comfy.model_management.intermediate_device()
+    except Exception:
+        return torch.device("cpu")
+
+
+def _zeros(shape: list[int], dtype: torch.dtype, expand: bool) -> torch.Tensor:
+    device = _device()
+    batch = shape[0]
+    threshold = _expand_min_batch()
+    if expand and threshold and batch >= threshold and batch > 1:
+        return torch.zeros([1, *shape[1:]], dtype=dtype, device=device).expand(shape)
+    return torch.zeros(shape, dtype=dtype, device=device)
+
+
+def empty_latent(
+    batch_size: int,
+    width: int,
+    height: int,
+    model=None,
+    dtype: torch.dtype = torch.float32,
+    expand: bool = True,
+) -> torch.Tensor:
+    """A zero latent for a ``width`` x ``height`` image, allocated once in its final shape.
+
+    Without ``model`` (or when its latent format is unknown) the shape is the
+    core ``[batch, 4, h // 8, w // 8]``. With a model it uses the model's
+    latent channels and downscale, plus the frame axis of 3D latent formats.
+    """
+    batch_size = max(1, int(batch_size))
+    spec = latent_spec(model)
+    if spec is None:
+        shape = [batch_size, DEFAULT_SPEC.channels, height // 8, width // 8]
+        if model is None:
+            return _zeros(shape, dtype, expand)
+        # Unknown format: let ComfyUI fix the channels the old way.
+        latent = torch.zeros(shape, dtype=dtype, device=_device())
+        try:
+            import comfy.sample  # type: ignore[import-not-found]
+
+            return comfy.sample.fix_empty_latent_channels(model, latent)
+        except Exception:
+            return latent
+    shape = [batch_size, spec.channels, height // spec.downscale, width // spec.downscale]
+    if spec.dimensions == 3:
+        shape.insert(2, 1)
+    return _zeros(shape, dtype, expand)
+
+
+def clear() -> None:
+    """Forget the cached latent specs."""
+    with _lock:
+        _specs.clear()
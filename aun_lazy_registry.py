@@ -0,0 +1,121 @@
+"""Lazy ``NODE_CLASS_MAPPINGS`` for the pack.
+
+While ComfyUI loads custom nodes it only needs the mapping keys. Each entry
+is a proxy class that imports its implementing module the first time a node
+attribute is read (``INPUT_TYPES``, ``RETURN_TYPES``, ...) or the node is
+instantiated for execution. The node modules (and torch, PIL, cv2, piexif,
+``comfy.sd`` with them) are therefore imported when the frontend first asks
+for ``/object_info`` or a prompt uses them, not while the server starts.
+
+Every import made through this module is timed. :func:`import_report` lists
+the per-module cost and ``/aun/import_times`` serves it. Set
+``AUN_EAGER_NODES=1`` to import every node module at startup instead.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import threading
+import time
+from typing import Any
+
+from .aun_perf import instrument_node
+
+_EAGER_ENV = "AUN_EAGER_NODES"
+
+_lock = threading.RLock()
+# Module name -> (milliseconds, phase). Phase is "startup" or "lazy".
+_import_times: dict[str, tuple[float, str]] = {}
+_startup_ms: float | None = None
+
+
+def _eager() -> bool:
+    return os.environ.get(_EAGER_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def timed_import(module_name: str, package: str):
+    """``importlib.import_module`` that records how long the first import took."""
+    key = module_name.lstrip(".")
+    start = time.perf_counter()
+    module = importlib.import_module(module_name, package)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    with _lock:
+        if key not in _import_times:
+            _import_times[key] = (elapsed, "startup" if _startup_ms is None else "lazy")
+    return module
+
+
+class _LazyNodeMeta(type):
+    """Forwards class attribute reads and instantiation to the real node class."""
+
+    def __getattr__(cls, name: str) -> Any:
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        return getattr(cls._aun_load(), name)
+
+    def __call__(cls, *args, **kwargs):
+        return cls._aun_load()(*args, **kwargs)
+
+    def _aun_load(cls) -> type:
+        real = cls._aun_real
+        if real is None:
+            with _lock:
+                real = cls._aun_real
+                if real is None:
+                    module = timed_import("." + cls._aun_module, cls._aun_package)
+                    real = instrument_node(getattr(module, cls.__name__))
+                    cls._aun_real = real
+        return real
+
+
+def _lazy_node(class_name: str, module_name: str, package: str) -> type:
+    return _LazyNodeMeta(
+        class_name,
+        (),
+        {
+            "__module__": f"{package}.{module_name}",
+            "_aun_module": module_name,
+            "_aun_package": package,
+            "_aun_real": None,
+        },
+    )
+
+
+def build_node_mappings(nodes: dict[str, str], package: str) -> dict[str, type]:
+    """Map each node class name in ``nodes`` (class name -> module name) to its class.
+
+    The classes are lazy proxies unless ``AUN_EAGER_NODES`` is set.
+    """
+    eager = _eager()
+    mappings: dict[str, type] = {}
+    for class_name, module_name in nodes.items():
+        if eager:
+            mappings[class_name] = instrument_node(getattr(timed_import("." + module_name, package), class_name))
+        else:
+            mappings[class_name] = _lazy_node(class_name, module_name, package)
+    return mappings
+
+
+def mark_startup_complete(started: float) -> float:
+    """Record the pack's startup time (``started`` is a ``time.perf_counter()`` value)."""
+    global _startup_ms
+    with _lock:
+        _startup_ms = (time.perf_counter() - started) * 1000.0
+        return _startup_ms
+
+
+def import_report() -> dict[str, Any]:
+    """Startup time and per-module import times, slowest first."""
+    with _lock:
+        modules = [
+            {"module": name, "ms": round(ms, 2), "phase": phase}
+            for name, (ms, phase) in _import_times.items()
+        ]
+        startup_ms = _startup_ms
+    modules.sort(key=lambda item: item["ms"], reverse=True)
+    return {
+        "startup_ms": None if startup_ms is None else round(startup_ms, 2),
+        "lazy": not _eager(),
+        "modules": modules,
+    }
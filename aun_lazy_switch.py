@@ -0,0 +1,49 @@
+"""Slot selection for the switch nodes with lazy inputs.
+
+ComfyUI only evaluates a lazy input when the node's ``check_lazy_status``
+asks for it. A linked input that has not been evaluated yet is passed as
+``None``, and an unlinked one is not passed at all. A switch can therefore
+see which slots are connected, choose one and request just that branch.
+
+Random, Increment and Range selection must happen once per execution:
+``check_lazy_status`` runs again after each requested input arrives, and
+the node's ``FUNCTION`` has to output the same slot. :class:`SlotChoice`
+keeps one pick per node instance. The pick is tied to the hidden ``PROMPT``
+dict, which ComfyUI creates once per queued prompt and passes to both
+calls, and to the selection settings.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+
+def pending_inputs(kwargs: dict, names: Iterable[str]) -> list[str]:
+    """The ``names`` that are linked but not evaluated yet (the list ``check_lazy_status`` returns)."""
+    return [name for name in names if name in kwargs and kwargs[name] is None]
+
+
+class SlotChoice:
+    """One node's selection, shared between ``check_lazy_status`` and execution."""
+
+    __slots__ = ("_token", "_key", "_value", "_held")
+
+    def __init__(self):
+        self._token = None
+        self._key = None
+        self._value = None
+        self._held = False
+
+    def pick(self, token: Any, key: Any, choose: Callable[[], Any]) -> Any:
+        """``choose()`` once per execution; later calls with the same ``token`` and ``key`` reuse it."""
+        if self._held and self._token is token and self._key == key:
+            return self._value
+        value = choose()
+        # Holding the token keeps it alive, so a later prompt cannot reuse its identity.
+        self._token, self._key, self._value, self._held = token, key, value, True
+        return value
+
+    def release(self) -> None:
+        """Forget the pick once the node has executed."""
+        self._token = self._key = self._value = None
+        self._held = False
@@ -0,0 +1,162 @@
+"""Shared folder listings for node ``INPUT_TYPES``.
+
+ComfyUI calls every node's ``INPUT_TYPES`` when it builds ``/object_info``.
+The image loaders all list the input folder and the LoRA nodes all list the
+LoRA folders, so this module keeps one snapshot of each for all of them.
+
+Folder listings are keyed by the folder's ``st_mtime_ns``, which changes
+whenever an entry is added, removed or renamed. One ``stat`` replaces the
+``listdir`` plus an ``isfile`` per entry. A snapshot taken within
+``_RACY_WINDOW_NS`` of the folder's mtime is not kept, because a change in
+the same timestamp tick would not move the mtime.
+
+LoRA names come from ``folder_paths.get_filename_list``, which already
+tracks subfolders itself. The result is shared for ``_LORA_TTL_SEC`` so one
+``/object_info`` build reads it once.
+
+With ``AUN_LISTING_WATCHER=1`` and the optional ``watchdog`` package
+installed, filesystem events invalidate the snapshots instead, and cached
+listings are served without touching the disk.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+_WATCHER_ENV = "AUN_LISTING_WATCHER"
+_RACY_WINDOW_NS = 2_000_000_000
+_LORA_TTL_SEC = 2.0
+
+_lock = threading.Lock()
+# Absolute folder -> (mtime_ns, sorted file names).
+_listings: dict[str, tuple[int, tuple[str, ...]]] = {}
+# Bumped by the watcher whenever a folder changes.
+_generations: dict[str, int] = {}
+# (monotonic time taken, LoRA names); the time is None while watched.
+_loras: tuple[float | None, tuple[str, ...]] | None = None
+_lora_generation = 0
+
+_watch_lock = threading.Lock()
+_watched: set[str] = set()
+_observer = None
+
+
+def _watcher_enabled() -> bool:
+    return os.environ.get(_WATCHER_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _watch(directory: str, recursive: bool, on_change) -> bool:
+    """Start watching ``directory`` if the watcher is enabled and available."""
+    global _observer
+    if not _watcher_enabled():
+        return False
+    with _watch_lock:
+        if directory in _watched:
+            return True
+        try:
+            from watchdog.events import FileSystemEventHandler  # type: ignore[import-not-found]
+            from watchdog.observers import Observer  # type: ignore[import-not-found]
+        except ImportError:
+            return False
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ("created", "deleted", "moved"):
+                    on_change()
+
+        try:
+            if _observer is None:
+                _observer = Observer()
+                _observer.daemon = True
+                _observer.start()
+            _observer.schedule(_Handler(), directory, recursive=recursive)
+        except Exception as e:
+            print(f"[AUN] Could not watch {directory}: {e}")
+            return False
+        _watched.add(directory)
+        return True
+
+
+def _folder_changed(directory: str) -> None:
+    with _lock:
+        _generations[directory] = _generations.get(directory, 0) + 1
+        _listings.pop(directory, None)
+
+
+def _loras_changed() -> None:
+    global _loras, _lora_generation
+    with _lock:
+        _lora_generation += 1
+        _loras = None
+
+
+def _scan(directory: str) -> tuple[str, ...]:
+    with os.scandir(directory) as entries:
+        return tuple(sorted(entry.name for entry in entries if entry.is_file()))
+
+
+def list_files(directory: str) -> list[str]:
+    """Sorted names of the files directly inside ``directory`` (``[]`` if it is missing)."""
+    key = os.path.abspath(directory)
+    watched = _watch(key, False, lambda: _folder_changed(key))
+    with _lock:
+        cached = _listings.get(key)
+        generation = _generations.get(key, 0)
+    if cached is not None and watched:
+        return list(cached[1])
+
+    try:
+        mtime_ns = os.stat(key).st_mtime_ns
+    except OSError:
+        return []
+    if cached is not None and cached[0] == mtime_ns:
+        return list(cached[1])
+
+    try:
+        files = _scan(key)
+    except OSError:
+        return []
+    if watched or time.time_ns() - mtime_ns > _RACY_WINDOW_NS:
+        with _lock:
+            if _generations.get(key, 0) == generation:
+                _listings[key] = (mtime_ns, files)
+    return list(files)
+
+
+def list_input_files() -> list[str]:
+    """Sorted file names in ComfyUI's input folder (the image loaders' choices)."""
+    import folder_paths  # type: ignore[import-not-found]
+
+    return list_files(folder_paths.get_input_directory())
+
+
+def lora_names() -> list[str]:
+    """``folder_paths.get_filename_list("loras")``, shared across nodes (``[]`` on error)."""
+    global _loras
+    import folder_paths  # type: ignore[import-not-found]
+
+    try:
+        folders = [os.path.abspath(f) for f in folder_paths.get_folder_paths("loras") if os.path.isdir(f)]
+    except Exception:
+        folders = []
+    # Cached names are only trusted indefinitely when every LoRA folder is watched.
+    watched = bool(folders) and all([_watch(folder, True, _loras_changed) for folder in folders])
+
+    with _lock:
+        cached = _loras
+        generation = _lora_generation
+    if cached is not None and (cached[0] is None or time.monotonic() - cached[0] < _LORA_TTL_SEC):
+        return list(cached[1])
+
+    try:
+        files = folder_paths.get_filename_list("loras")
+    except Exception:
+        files = []
+    if not isinstance(files, list):
+        files = []
+    with _lock:
+        if _lora_generation == generation:
+            _loras = (None if watched else time.monotonic(), tuple(files))
+    return list(files)
@@ -0,0 +1,229 @@
+"""Append-only output catalog for the AUN savers.
+
+Instead of one ``.txt``/``.json`` sidecar per output, the savers can record
+the same sidecar context in a single SQLite database in the output folder
+(``aun_output_catalog.sqlite3``). Rows for a batch are inserted in one
+transaction. Seed, model, sampler, LoRA and creation time are indexed, so
+lookups like "all outputs with LoRA X at seed Y" don't crawl the output
+folder. ``/aun/catalog`` (see ``aun_output_catalog_server.py``) exposes
+:func:`query_outputs` to the frontend.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable
+
+CATALOG_FILENAME = "aun_output_catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    kind TEXT,
+    created_at REAL NOT NULL,
+    seed INTEGER,
+    steps INTEGER,
+    cfg REAL,
+    model TEXT,
+    model_short TEXT,
+    sampler_name TEXT,
+    scheduler TEXT,
+    width INTEGER,
+    height INTEGER,
+    positive_prompt TEXT,
+    negative_prompt TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outputs_seed ON outputs (seed);
+CREATE INDEX IF NOT EXISTS outputs_model_short ON outputs (model_short COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS outputs_sampler ON outputs (sampler_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS outputs_created ON outputs (created_at);
+CREATE INDEX IF NOT EXISTS outputs_path ON outputs (path);
+CREATE TABLE IF NOT EXISTS output_loras (
+    output_id INTEGER NOT NULL REFERENCES outputs (id),
+    lora TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS output_loras_lora ON output_loras (lora, output_id);
+"""
+
+_LORA_TAG = re.compile(r"<lora:([^:>]+)", re.IGNORECASE)
+_QUERY_COLUMNS = "o.id, o.path, o.created_at, o.record"
+_MAX_QUERY_LIMIT = 1000
+
+_lock = threading.Lock()
+_initialized: set[str] = set()
+
+
+def default_catalog_path() -> str:
+    import folder_paths  # type: ignore[import-not-found]
+
+    return os.path.join(folder_paths.get_output_directory(), CATALOG_FILENAME)
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30)
+    if db_path not in _initialized:
+        # Rollback journal: output folders are often network shares, where WAL (which needs
+        # shared memory between writers) is unsupported. Also converts catalogs created in WAL mode.
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.executescript(_SCHEMA)
+        _initialized.add(db_path)
+    return conn
+
+
+def _as_int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _lora_names(value: Any) -> list[str]:
+    """LoRA base names from a Power Lora Loader style ``<lora:name:...>`` block."""
+    if isinstance(value, (list, tuple)):
+        value = "\n".join(str(item) for item in value)
+    names = []
+    for name in _LORA_TAG.findall(str(value or "")):
+        name = os.path.splitext(os.path.basename(name.strip().replace("\\", "/")))[0]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def _relative_path(file_path: str, db_path: str) -> str:
+    root = os.path.dirname(os.path.abspath(db_path))
+    full = os.path.abspath(file_path)
+    try:
+        if os.path.commonpath([root, full]) == root:
+            return os.path.relpath(full, root).replace(os.sep, "/")
+    except ValueError:
+        pass
+    return full
+
+
+def record_outputs(entries: Iterable[tuple[str, dict[str, Any]]], kind: str = "image", db_path: str | None = None) -> int:
+    """Append ``(file_path, sidecar_record)`` pairs to the catalog in one transaction.
+
+    Returns the number of rows written.
+    """
+    entries = list(entries)
+    if not entries:
+        return 0
+    db_path = db_path or default_catalog_path()
+    now = time.time()
+    with _lock:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                for file_path, record in entries:
+                    cursor = conn.execute(
+                        "INSERT INTO outputs (path, kind, created_at, seed, steps, cfg, model, model_short,"
+                        " sampler_name, scheduler, width, height, positive_prompt, negative_prompt, record)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            _relative_path(file_path, db_path),
+                            kind,
+                            now,
+                            _as_int(record.get("seed")),
+                            _as_int(record.get("steps")),
+                            _as_float(record.get("cfg")),
+                            record.get("model") or None,
+                            record.get("model_short") or None,
+                            record.get("sampler_name") or None,
+                            record.get("scheduler") or None,
+                            _as_int(record.get("width")),
+                            _as_int(record.get("height")),
+                            record.get("positive_prompt") or None,
+                            record.get("negative_prompt") or None,
+                            json.dumps(record, ensure_ascii=False, default=str),
+                        ),
+                    )
+                    loras = _lora_names(record.get("loras"))
+                    if loras:
+                        conn.executemany(
+                            "INSERT INTO output_loras (output_id, lora) VALUES (?, ?)",
+                            [(cursor.lastrowid, lora) for lora in loras],
+                        )
+        finally:
+            conn.close()
+    return len(entries)
+
+
+def query_outputs(
+    seed: int | None = None,
+    lora: str | None = None,
+    model: str | None = None,
+    sampler: str | None = None,
+    prompt: str | None = None,
+    since: float | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    db_path: str | None = None,
+) -> list[dict[str, Any]]:
+    """Return catalogued outputs matching every given filter, newest first.
+
+    ``lora``, ``model`` and ``sampler`` match exactly (case-insensitive;
+    ``model`` checks both the full and the short model name). ``prompt`` is a
+    substring match on the positive prompt. ``since`` is a Unix timestamp.
+    """
+    db_path = db_path or default_catalog_path()
+    if not os.path.exists(db_path):
+        return []
+
+    joins = ""
+    where = []
+    params: list[Any] = []
+    if lora:
+        joins = " JOIN output_loras l ON l.output_id = o.id"
+        where.append("l.lora = ?")
+        params.append(str(lora))
+    if seed is not None:
+        where.append("o.seed = ?")
+        params.append(int(seed))
+    if model:
+        where.append("(o.model_short = ? COLLATE NOCASE OR o.model = ? COLLATE NOCASE)")
+        params.extend([str(model), str(model)])
+    if sampler:
+        where.append("o.sampler_name = ? COLLATE NOCASE")
+        params.append(str(sampler))
+    if prompt:
+        where.append("o.positive_prompt LIKE ?")
+        params.append(f"%{prompt}%")
+    if since is not None:
+        where.append("o.created_at >= ?")
+        params.append(float(since))
+
+    sql = f"SELECT DISTINCT {_QUERY_COLUMNS} FROM outputs o{joins}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY o.id DESC LIMIT ? OFFSET ?"
+    params.extend([max(1, min(int(limit), _MAX_QUERY_LIMIT)), max(0, int(offset))])
+
+    with _lock:
+        conn = _connect(db_path)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    results = []
+    for row_id, path, created_at, record in rows:
+        try:
+            data = json.loads(record)
+        except ValueError:
+            data = {}
+        results.append({"id": row_id, "path": path, "created_at": created_at, "record": data})
+    return results
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import web
+
+from server import PromptServer
+
+from .aun_output_catalog import query_outputs
+
+
+def _optional(query, name: str, cast):
+    value = str(query.get(name) or "").strip()
+    return cast(value) if value else None
+
+
+@PromptServer.instance.routes.get("/aun/catalog")
+async def aun_output_catalog(request: web.Request) -> web.Response:
+    query = request.rel_url.query
+    try:
+        filters = {
+            "seed": _optional(query, "seed", int),
+            "lora": _optional(query, "lora", str),
+            "model": _optional(query, "model", str),
+            "sampler": _optional(query, "sampler", str),
+            "prompt": _optional(query, "prompt", str),
+            "since": _optional(query, "since", float),
+            "limit": _optional(query, "limit", int) or 100,
+            "offset": _optional(query, "offset", int) or 0,
+        }
+    except ValueError as exc:
+        return web.json_response({"error": f"Invalid query: {exc}"}, status=400)
+    try:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, lambda: query_outputs(**filters))
+    except Exception as exc:
+        return web.json_response({"error": f"Catalog query failed: {exc}"}, status=500)
+    return web.json_response({"results": results})
@@ -1,6 +1,8 @@
 import datetime
+import functools
 import json
 import os
+import re
 
 
 PLACEHOLDER_TOKENS = {
@@ -27,6 +29,115 @@ PLACEHOLDER_TOKENS_VIDEO = {
 }
 
 
+BATCH_TOKENS = ("batch_num", "batch_number")
+
+_JAVA_DATE_TOKENS = [
+    ("yyyy", "%Y"),
+    ("MM", "%m"),
+    ("dd", "%d"),
+    ("HH", "%H"),
+    ("mm", "%M"),
+    ("ss", "%S"),
+    ("yy", "%y"),
+    ("M", "%m"),
+    ("d", "%d"),
+    ("H", "%H"),
+    ("m", "%M"),
+    ("s", "%S"),
+]
+_JAVA_DATE_PATTERNS = [
+    (re.compile(rf"(?<!%)\b{java_token}\b"), python_token)
+    for java_token, python_token in _JAVA_DATE_TOKENS
+]
+_DATETIME_PATTERN = r"%(date|time):([^%]+)%"
+
+
+@functools.lru_cache(maxsize=256)
+def java_to_python_datefmt(fmt):
+    """Convert Java-style date tokens (yyyy-MM-dd HH:mm:ss) to strftime codes."""
+    out = str(fmt)
+    for pattern, python_token in _JAVA_DATE_PATTERNS:
+        out = pattern.sub(python_token, out)
+    return out
+
+
+class TemplatePlan:
+    """A filename/path template parsed into literal segments and token slots.
+
+    Slots are ``("token", name)`` for ``%name%``/``%name`` placeholders and
+    ``("datetime", kind, strftime_format)`` for ``%date:fmt%``/``%time:fmt%``.
+    """
+
+    __slots__ = ("parts", "tokens")
+
+    def __init__(self, parts):
+        self.parts = parts
+        self.tokens = frozenset(part[1] for part in parts if not isinstance(part, str) and part[0] == "token")
+
+    def render(self, values, now=None):
+        """Fill the slots from ``values`` (token name -> value; None renders empty)."""
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+            elif part[0] == "token":
+                value = values.get(part[1])
+                out.append("" if value is None else str(value))
+            else:
+                if now is None:
+                    now = datetime.datetime.now()
+                try:
+                    out.append(now.strftime(part[2]))
+                except Exception:
+                    out.append(now.strftime("%Y-%m-%d" if part[1] == "date" else "%H-%M-%S"))
+        return "".join(out)
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_template(template, tokens, datetime_tokens):
+    alternatives = []
+    if datetime_tokens:
+        alternatives.append(_DATETIME_PATTERN)
+    if tokens:
+        # Longer names first so %model_short wins over %model.
+        names = "|".join(re.escape(name) for name in sorted(tokens, key=len, reverse=True))
+        alternatives.append(rf"%({names})%?")
+    if not alternatives:
+        return TemplatePlan((template,) if template else ())
+
+    parts = []
+    position = 0
+    for match in re.finditer("|".join(f"(?:{alt})" for alt in alternatives), template):
+        if match.start() > position:
+            parts.append(template[position:match.start()])
+        if datetime_tokens and match.group(1) is not None:
+            parts.append(("datetime", match.group(1), java_to_python_datefmt(match.group(2))))
+        else:
+            parts.append(("token", match.group(match.lastindex)))
+        position = match.end()
+    if position < len(template):
+        parts.append(template[position:])
+    return TemplatePlan(tuple(parts))
+
+
+def compile_template(template, tokens=(), datetime_tokens=False):
+    """Parse ``template`` once into a cached :class:`TemplatePlan`.
+
+    ``tokens`` are the placeholder names to recognise (without ``%``); other
+    ``%text`` stays literal. ``datetime_tokens`` also recognises
+    ``%date:fmt%``/``%time:fmt%`` with Java- or strftime-style formats.
+    """
+    return _compile_template(str(template or ""), frozenset(tokens), bool(datetime_tokens))
+
+
+def resolve_batch_tokens(template, batch_num):
+    """Replace ``%batch_num%``/``%batch_number%`` (and legacy forms) with ``batch_num``."""
+    plan = compile_template(template, BATCH_TOKENS)
+    if not plan.tokens:
+        return plan.render({})
+    return plan.render({"batch_num": batch_num, "batch_number": batch_num})
+
+
 def join_nonempty(parts, delimiter):
     return delimiter.join([part for part in parts if part not in (None, "")])
 
@@ -183,11 +294,9 @@ def format_resolved_tokens(
 
 
 def resolve_template(template, replacements, delimiter):
-    resolved = str(template)
-    # Replace longer placeholders first so %token% is resolved before %token.
-    for placeholder in sorted(replacements.keys(), key=len, reverse=True):
-        value = replacements[placeholder]
-        resolved = resolved.replace(placeholder, value or "")
+    # Placeholder keys may be given as %token% or %token; both forms match either spelling.
+    values = {placeholder.strip("%"): value or "" for placeholder, value in replacements.items()}
+    resolved = compile_template(template, values.keys()).render(values)
     collapsed = [part for part in resolved.split(delimiter) if part]
     return delimiter.join(collapsed)
 
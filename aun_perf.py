@@ -0,0 +1,224 @@
+"""Opt-in execution profiler for the pack.
+
+Set ``AUN_PROFILE=1`` before starting ComfyUI to enable it. The node
+registry then wraps every node's ``FUNCTION`` with a timer (``node.<Class>``),
+and a few internal stages report their own timings and byte counts:
+
+- ``hash.sha256``: model hashing in ``misc.get_sha256``
+- ``graph.extract_loras`` / ``graph.extract_prompts``: graph scraping for the savers
+- ``save_image.write``: image encode + disk write in the image savers
+- ``video.encode``: ffmpeg segment encodes and animated image writes
+- ``video.probe`` / ``video.join``: ffprobe calls and the final concat in the video savers
+- ``lora.load``: reading LoRA files in the LoRA loader nodes
+- ``component.load_<kind>``: diffusion model / CLIP / VAE loads in the AUN Inputs loaders
+
+Aggregates are kept as fixed-bucket latency histograms and served by
+``/aun/perf`` (JSON, or Prometheus text with ``?format=prometheus``; see
+``aun_perf_server.py``). When profiling is off, :func:`stage` returns a
+shared no-op context and nothing is wrapped.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import threading
+import time
+from typing import Any
+
+_ENV = "AUN_PROFILE"
+
+# Upper bounds of the latency buckets, in milliseconds.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+_lock = threading.Lock()
+_stats: dict[str, "_Histogram"] = {}
+_enabled = os.environ.get(_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class _Histogram:
+    __slots__ = ("count", "errors", "total_ms", "min_ms", "max_ms", "bytes", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.bytes = 0
+        # One count per bucket plus the overflow bucket.
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms: float, nbytes: int, error: bool) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.bytes += nbytes
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms or 0.0, 3),
+            "max_ms": round(self.max_ms, 3),
+            "bytes": self.bytes,
+            "buckets": {
+                **{str(bound): n for bound, n in zip(BUCKETS_MS, self.buckets)},
+                "+Inf": self.buckets[-1],
+            },
+        }
+
+
+def record(name: str, seconds: float, nbytes: int = 0, error: bool = False) -> None:
+    """Add one timing (and optional byte count) to the ``name`` histogram."""
+    with _lock:
+        histogram = _stats.get(name)
+        if histogram is None:
+            histogram = _stats[name] = _Histogram()
+        histogram.add(seconds * 1000.0, int(nbytes or 0), error)
+
+
+class _Stage:
+    __slots__ = ("name", "nbytes", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.nbytes = 0
+
+    def add_bytes(self, nbytes: int) -> None:
+        self.nbytes += int(nbytes or 0)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self._start, self.nbytes, exc_type is not None)
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def add_bytes(self, nbytes: int) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str):
+    """``with stage("video.encode") as st: ...; st.add_bytes(n)`` (no-op unless profiling)."""
+    return _Stage(name) if _enabled else _NO_STAGE
+
+
+def timed(name: str):
+    """Decorator form of :func:`stage` for internal helpers."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def instrument_node(cls: type) -> type:
+    """Wrap ``cls.FUNCTION`` with a ``node.<Class>`` timer (once; only when profiling)."""
+    if not _enabled or cls.__dict__.get("_aun_profiled"):
+        return cls
+    function_name = getattr(cls, "FUNCTION", None)
+    if not function_name:
+        return cls
+    raw = inspect.getattr_static(cls, function_name, None)
+    func = raw.__func__ if isinstance(raw, (classmethod, staticmethod)) else raw
+    if not callable(func):
+        return cls
+    # A FUNCTION inherited from an instrumented node class is timed only once.
+    func = getattr(func, "_aun_untimed", func)
+    name = f"node.{cls.__name__}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with _Stage(name):
+                return await func(*args, **kwargs)
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Stage(name):
+                return func(*args, **kwargs)
+
+    wrapper._aun_untimed = func
+    if isinstance(raw, classmethod):
+        wrapper = classmethod(wrapper)
+    elif isinstance(raw, staticmethod):
+        wrapper = staticmethod(wrapper)
+    setattr(cls, function_name, wrapper)
+    cls._aun_profiled = True
+    return cls
+
+
+def snapshot() -> dict[str, Any]:
+    """All histograms, slowest total first."""
+    with _lock:
+        stats = {name: histogram.to_dict() for name, histogram in _stats.items()}
+    ordered = dict(sorted(stats.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+    return {"enabled": _enabled, "buckets_ms": list(BUCKETS_MS), "stats": ordered}
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def prometheus_text() -> str:
+    """The histograms in the Prometheus text exposition format."""
+    with _lock:
+        items = [
+            (name.replace("\\", "\\\\").replace('"', '\\"'), h.count, h.errors, h.total_ms, h.bytes, list(h.buckets))
+            for name, h in sorted(_stats.items())
+        ]
+    lines = [
+        "# HELP aun_stage_seconds Time spent in AUN nodes and internal stages.",
+        "# TYPE aun_stage_seconds histogram",
+    ]
+    for label, count, _errors, total_ms, _nbytes, buckets in items:
+        cumulative = 0
+        for bound, n in zip(BUCKETS_MS, buckets):
+            cumulative += n
+            lines.append(f'aun_stage_seconds_bucket{{stage="{label}",le="{bound / 1000.0:g}"}} {cumulative}')
+        lines.append(f'aun_stage_seconds_bucket{{stage="{label}",le="+Inf"}} {count}')
+        lines.append(f'aun_stage_seconds_sum{{stage="{label}"}} {total_ms / 1000.0:.6f}')
+        lines.append(f'aun_stage_seconds_count{{stage="{label}"}} {count}')
+    lines += ["# HELP aun_stage_bytes_total Bytes processed by AUN stages.", "# TYPE aun_stage_bytes_total counter"]
+    lines += [f'aun_stage_bytes_total{{stage="{item[0]}"}} {item[4]}' for item in items]
+    lines += ["# HELP aun_stage_errors_total Stage runs that raised.", "# TYPE aun_stage_errors_total counter"]
+    lines += [f'aun_stage_errors_total{{stage="{item[0]}"}} {item[2]}' for item in items]
+    return "\n".join(lines) + "\n"
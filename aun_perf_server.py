@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from aiohttp import web
+
+from server import PromptServer
+
+from .aun_perf import prometheus_text, reset, snapshot
+
+
+@PromptServer.instance.routes.get("/aun/perf")
+async def aun_perf(request: web.Request) -> web.Response:
+    if request.rel_url.query.get("format", "").lower() == "prometheus":
+        return web.Response(text=prometheus_text(), content_type="text/plain", charset="utf-8")
+    return web.json_response(snapshot())
+
+
+@PromptServer.instance.routes.post("/aun/perf/reset")
+async def aun_perf_reset(request: web.Request) -> web.Response:
+    reset()
+    return web.json_response({"ok": True})
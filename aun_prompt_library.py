@@ -0,0 +1,255 @@
+"""Parsed and indexed prompt lists for the prompt cyclers.
+
+``AUNPromptCycler`` and ``AUNMultiPromptCycler`` take prompts one per line
+(``Title: prompt`` or just ``prompt``). Parsing and search indexing happen
+once per distinct prompt text (keyed by a content hash) instead of on every
+execution, so stepping through a large list costs the same as a small one.
+
+Prompt libraries can also come from a text file in the same format. A file
+is streamed once to record where each prompt line starts. After that, a
+prompt is read with a single seek, so 100k+ line files are never held in
+memory. Indices are the position among the non-empty lines, the same
+numbering as pasted text, so they stay stable as long as the file is
+unchanged.
+
+Search uses an inverted index over whitespace-separated tokens of the
+lowercased prompts. A query word matches exactly when it is a substring of
+some token, because a word without whitespace can never span two tokens.
+This keeps the cyclers' substring semantics: space = AND, comma = OR.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+
+_MAX_LIBRARIES = 16
+_MAX_QUERIES = 64
+_MAX_WORDS = 1024
+
+_lock = threading.Lock()
+_libraries: "OrderedDict[object, PromptLibrary]" = OrderedDict()
+
+
+def _split_title(line: str, line_number: int) -> tuple[str, str]:
+    if ":" in line:
+        title, _, prompt = line.partition(":")
+        return prompt.strip(), title.strip()
+    return line, f"Prompt {line_number}"
+
+
+def parse_query(query: str) -> list[list[str]]:
+    """OR groups of AND words: ``"mountain sunset, forest"`` -> ``[["mountain", "sunset"], ["forest"]]``."""
+    return [g.strip().lower().split() for g in str(query or "").split(",") if g.strip()]
+
+
+class PromptLibrary(ABC):
+    """A list of ``(prompt, title)`` pairs with 1-based indices.
+
+    Subclasses provide ``__len__`` and :meth:`get`; search and batch reads
+    are built on those two.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, array] | None = None
+        self._word_hits: dict[str, frozenset[int]] = {}
+        self._queries: "OrderedDict[str, tuple[int, ...]]" = OrderedDict()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of prompts."""
+
+    @abstractmethod
+    def get(self, index: int) -> tuple[str, str]:
+        """``(prompt, title)`` for a 1-based index."""
+
+    def get_many(self, indices) -> list[tuple[str, str]]:
+        """``(prompt, title)`` pairs for several 1-based indices."""
+        return [self.get(index) for index in indices]
+
+    def _iter_prompts(self):
+        """Yield every prompt text in index order (used to build the search index)."""
+        for index in range(1, len(self) + 1):
+            yield self.get(index)[0]
+
+    def _build_postings(self) -> dict[str, array]:
+        postings: dict[str, array] = {}
+        for index, prompt in enumerate(self._iter_prompts(), start=1):
+            for token in set(prompt.lower().split()):
+                hits = postings.get(token)
+                if hits is None:
+                    hits = postings[token] = array("I")
+                hits.append(index)
+        return postings
+
+    def _hits_for_word(self, word: str) -> frozenset[int]:
+        hits = self._word_hits.get(word)
+        if hits is None:
+            if len(self._word_hits) >= _MAX_WORDS:
+                self._word_hits.clear()
+            found: set[int] = set()
+            for token, postings in self._postings.items():
+                if word in token:
+                    found.update(postings)
+            hits = self._word_hits[word] = frozenset(found)
+        return hits
+
+    def search(self, query: str) -> tuple[int, ...]:
+        """Ascending 1-based indices of prompts matching ``query`` (space = AND, comma = OR)."""
+        key = str(query or "").strip()
+        with self._lock:
+            cached = self._queries.get(key)
+            if cached is not None:
+                self._queries.move_to_end(key)
+                return cached
+            or_groups = parse_query(key)
+            matched: set[int] = set()
+            if or_groups:
+                if self._postings is None:
+                    self._postings = self._build_postings()
+                for group in or_groups:
+                    hits = None
+                    for word in group:
+                        word_hits = self._hits_for_word(word)
+                        hits = set(word_hits) if hits is None else hits & word_hits
+                        if not hits:
+                            break
+                    matched.update(hits or ())
+            result = tuple(sorted(matched))
+            self._queries[key] = result
+            if len(self._queries) > _MAX_QUERIES:
+                self._queries.popitem(last=False)
+            return result
+
+
+class TextPromptLibrary(PromptLibrary):
+    """Prompts held in memory."""
+
+    def __init__(self, prompts: list[str], titles: list[str]):
+        super().__init__()
+        self.prompts = prompts
+        self.titles = titles
+
+    @classmethod
+    def parse(cls, text: str) -> "TextPromptLibrary":
+        prompts: list[str] = []
+        titles: list[str] = []
+        for i, line in enumerate(str(text).split("\n"), 1):
+            line = line.strip()
+            if not line:
+                continue
+            prompt, title = _split_title(line, i)
+            prompts.append(prompt)
+            titles.append(title)
+        return cls(prompts, titles)
+
+    def __len__(self) -> int:
+        return len(self.prompts)
+
+    def get(self, index: int) -> tuple[str, str]:
+        return self.prompts[index - 1], self.titles[index - 1]
+
+    def _iter_prompts(self):
+        return iter(self.prompts)
+
+
+class FilePromptLibrary(PromptLibrary):
+    """Prompts read on demand from a UTF-8 text file, one per line."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        # Byte offset and 1-based line number of every non-empty line.
+        self._offsets = array("q")
+        self._line_numbers = array("q")
+        offset = 0
+        with open(path, "rb") as f:
+            for line_number, raw in enumerate(f, 1):
+                if raw.strip():
+                    self._offsets.append(offset)
+                    self._line_numbers.append(line_number)
+                offset += len(raw)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @staticmethod
+    def _decode(raw: bytes) -> str:
+        return raw.decode("utf-8-sig" if raw.startswith(b"\xef\xbb\xbf") else "utf-8", errors="replace").strip()
+
+    def get(self, index: int) -> tuple[str, str]:
+        return self.get_many((index,))[0]
+
+    def get_many(self, indices) -> list[tuple[str, str]]:
+        pairs = []
+        with open(self.path, "rb") as f:
+            for index in indices:
+                f.seek(self._offsets[index - 1])
+                pairs.append(_split_title(self._decode(f.readline()), self._line_numbers[index - 1]))
+        return pairs
+
+    def _iter_prompts(self):
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if raw.strip():
+                    yield _split_title(self._decode(raw), 0)[0]
+
+
+def _cached(key, build) -> PromptLibrary:
+    with _lock:
+        library = _libraries.get(key)
+        if library is not None:
+            _libraries.move_to_end(key)
+            return library
+    library = build()
+    with _lock:
+        _libraries[key] = library
+        while len(_libraries) > _MAX_LIBRARIES:
+            _libraries.popitem(last=False)
+    return library
+
+
+def get_text_library(text: str) -> TextPromptLibrary:
+    """Parsed library for pasted prompt text, cached by content hash."""
+    digest = hashlib.sha1(str(text).encode("utf-8", errors="surrogatepass")).hexdigest()
+    return _cached(("text", digest), lambda: TextPromptLibrary.parse(text))
+
+
+def get_file_library(path: str) -> FilePromptLibrary:
+    """Library for a prompt file, rebuilt when the file's size or mtime changes."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _cached(("file", path, stat.st_mtime_ns, stat.st_size), lambda: FilePromptLibrary(path))
+
+
+def resolve_prompt_file(path: str) -> str:
+    """Absolute path for a prompt file; relative paths are taken from ComfyUI's input folder."""
+    path = os.path.expanduser(str(path).strip().strip('"'))
+    if os.path.isabs(path):
+        return path
+    import folder_paths  # type: ignore[import-not-found]
+
+    return os.path.join(folder_paths.get_input_directory(), path)
+
+
+def select_library(custom_prompts: str, prompt_file: str, fallback: PromptLibrary, node_name: str) -> PromptLibrary:
+    """The prompt file if given and non-empty, else the pasted prompts if any, else ``fallback``."""
+    if prompt_file and str(prompt_file).strip():
+        path = resolve_prompt_file(prompt_file)
+        try:
+            library = get_file_library(path)
+        except OSError as e:
+            print(f"[{node_name}] Could not read prompt file {path}: {e}")
+        else:
+            if len(library):
+                return library
+    if custom_prompts and custom_prompts.strip():
+        library = get_text_library(custom_prompts)
+        if len(library):
+            return library
+    return fallback
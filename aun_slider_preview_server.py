@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+from aiohttp import web
+from PIL import Image, features
+
+import folder_paths
+from server import PromptServer
+
+_PREVIEW_SUBFOLDER = "aun_slider_comparer"
+_PREVIEW_QUALITY = 95
+# Pending frames are kept as CPU uint8 pixels, keyed by content digest.
+_MAX_LAZY_BYTES = 512 * 1024 * 1024
+_LAZY_FRAMES: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_lazy_bytes = 0
+_LAZY_LOCK = threading.Lock()
+
+
+def _preview_format() -> tuple[str, str]:
+    """Return (PIL format, extension) for previews; WebP when Pillow supports it, else JPEG."""
+    try:
+        if features.check("webp"):
+            return "WEBP", "webp"
+    except Exception:
+        pass
+    return "JPEG", "jpg"
+
+
+_FORMAT, _EXTENSION = _preview_format()
+
+
+def _frame_to_array(frame) -> np.ndarray:
+    array = frame.detach().float().cpu().numpy()
+    if array.ndim == 4:
+        array = array[0]
+    return np.ascontiguousarray(array)
+
+
+def _content_digest(array: np.ndarray) -> str:
+    """Hash the raw frame values plus shape/dtype so identical tensors map to one file."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.shape}|{array.dtype}".encode("ascii"))
+    digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def _to_pixels(array: np.ndarray) -> np.ndarray:
+    return np.clip(array * 255.0, 0, 255).astype(np.uint8)
+
+
+def _encode_preview(pixels: np.ndarray, path: str) -> None:
+    if pixels.ndim == 3 and pixels.shape[-1] == 1:
+        pixels = pixels[..., 0]
+    image = Image.fromarray(pixels)
+    if _FORMAT == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    if _FORMAT == "WEBP":
+        # method=0 is libwebp's fastest encoder setting; previews are throwaway.
+        image.save(tmp_path, format=_FORMAT, quality=_PREVIEW_QUALITY, method=0)
+    else:
+        image.save(tmp_path, format=_FORMAT, quality=_PREVIEW_QUALITY)
+    os.replace(tmp_path, path)
+
+
+def _preview_path(digest: str) -> tuple[str, str]:
+    filename = f"aun_cmp_{digest}.{_EXTENSION}"
+    return filename, os.path.join(folder_paths.get_temp_directory(), _PREVIEW_SUBFOLDER, filename)
+
+
+def _view_info(filename: str) -> dict[str, str]:
+    return {"filename": filename, "subfolder": _PREVIEW_SUBFOLDER, "type": "temp"}
+
+
+def _write_preview(pixels: np.ndarray, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _encode_preview(pixels, path)
+
+
+def export_frame(frame) -> dict[str, str]:
+    """Write a single frame to the temp folder (once per unique content) and return its /view info."""
+    array = _frame_to_array(frame)
+    filename, path = _preview_path(_content_digest(array))
+    if not os.path.isfile(path):
+        _write_preview(_to_pixels(array), path)
+    return _view_info(filename)
+
+
+def register_lazy_frame(frame) -> dict[str, str]:
+    """Keep a frame in memory and return a placeholder the frontend resolves on demand.
+
+    Frames already exported (identical content from an earlier run) return
+    their /view info directly. The rest are held as uint8 pixels under their
+    content digest, so re-runs share one entry, and the oldest entries are
+    dropped once the store exceeds ``_MAX_LAZY_BYTES``.
+    """
+    global _lazy_bytes
+    array = _frame_to_array(frame)
+    key = _content_digest(array)
+    filename, path = _preview_path(key)
+    if os.path.isfile(path):
+        return _view_info(filename)
+    pixels = _to_pixels(array)
+    with _LAZY_LOCK:
+        previous = _LAZY_FRAMES.pop(key, None)
+        if previous is not None:
+            _lazy_bytes -= previous.nbytes
+        _LAZY_FRAMES[key] = pixels
+        _lazy_bytes += pixels.nbytes
+        while _lazy_bytes > _MAX_LAZY_BYTES and len(_LAZY_FRAMES) > 1:
+            _, dropped = _LAZY_FRAMES.popitem(last=False)
+            _lazy_bytes -= dropped.nbytes
+    return {"lazy_key": key}
+
+
+def _export_lazy_frame(key: str) -> dict[str, str] | None:
+    # Keys are content digests; anything else never came from register_lazy_frame.
+    if len(key) != 32 or any(c not in "0123456789abcdef" for c in key):
+        return None
+    filename, path = _preview_path(key)
+    if os.path.isfile(path):
+        return _view_info(filename)
+    with _LAZY_LOCK:
+        pixels = _LAZY_FRAMES.get(key)
+        if pixels is not None:
+            _LAZY_FRAMES.move_to_end(key)
+    if pixels is None:
+        return None
+    _write_preview(pixels, path)
+    return _view_info(filename)
+
+
+@PromptServer.instance.routes.get("/aun/slider-comparer/frame")
+async def aun_slider_comparer_frame(request: web.Request) -> web.StreamResponse:
+    key = str(request.rel_url.query.get("key") or "").strip()
+    if not key:
+        return web.json_response({"error": "No frame key given."}, status=400)
+    try:
+        loop = asyncio.get_running_loop()
+        info = await loop.run_in_executor(None, _export_lazy_frame, key)
+    except Exception as exc:
+        return web.json_response({"error": f"Failed to export frame: {exc}"}, status=500)
+    if info is None:
+        return web.json_response({"error": "Frame expired; re-run the prompt."}, status=404)
+    path = os.path.join(folder_paths.get_temp_directory(), info["subfolder"], info["filename"])
+    return web.FileResponse(path)
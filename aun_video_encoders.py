@@ -0,0 +1,262 @@
+"""Encoder selection and speed tiers for the AUN video savers.
+
+Each ``video_formats/*.json`` file names one encoder with fixed
+``main_pass`` arguments. :func:`resolve` adapts them per save:
+
+- ``quality`` / ``balanced`` / ``fast`` / ``fastest`` add the encoder's own
+  speed options: ``-preset`` for x264/x265/SVT-AV1/NVENC/QSV,
+  ``-deadline``/``-cpu-used`` with row-mt and tile columns for VP9, and
+  ``-cpu-used`` with row-mt and tiles for libaom.
+- ``fastest available`` swaps the format's encoder for the first working
+  encoder of the same codec (hardware first, then software) and uses the
+  ``fast`` tier. For example, H.264 on a CPU-only box uses libx264
+  ``veryfast``; on an NVIDIA box it uses ``h264_nvenc``.
+- ``default`` keeps the format's arguments as they are, unless
+  ``AUN_VIDEO_ENCODER_SPEED`` names one of the tiers above for the whole
+  deployment.
+
+``AUN_ENCODER_THREADS`` adds ``-threads N`` to software encodes. It helps
+when several saves run at once (see ``AUN_FFMPEG_JOBS``). A format JSON can
+replace the built-in tier arguments with a ``"speed_tiers"`` object that
+maps tier names to argument lists.
+
+Encoders are checked once per ffmpeg binary and cached for the process.
+``ffmpeg -encoders`` lists what was compiled in. Hardware encoders also get
+a one-frame test encode, because static builds list NVENC/QSV/AMF even
+without the device. The check runs on the first save that needs it, not at
+startup, so a pack import never waits on ffmpeg.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import subprocess
+import threading
+from typing import NamedTuple
+
+from .logger import logger
+
+SPEED_TIERS = ["default", "quality", "balanced", "fast", "fastest", "fastest available"]
+
+_SPEED_ENV = "AUN_VIDEO_ENCODER_SPEED"
+_THREADS_ENV = "AUN_ENCODER_THREADS"
+
+_TIER_INDEX = {"quality": 0, "balanced": 1, "fast": 2, "fastest": 3}
+
+# Per-encoder speed options as (quality, balanced, fast, fastest).
+_PRESETS = {
+    "libx264": ("slow", "medium", "veryfast", "ultrafast"),
+    "libx265": ("slow", "medium", "veryfast", "ultrafast"),
+    "libsvtav1": ("4", "7", "10", "12"),
+    "h264_nvenc": ("p7", "p5", "p3", "p1"),
+    "hevc_nvenc": ("p7", "p5", "p3", "p1"),
+    "av1_nvenc": ("p7", "p5", "p3", "p1"),
+    "h264_qsv": ("veryslow", "medium", "faster", "veryfast"),
+    "hevc_qsv": ("veryslow", "medium", "faster", "veryfast"),
+    "av1_qsv": ("veryslow", "medium", "faster", "veryfast"),
+}
+_AMF_QUALITY = ("quality", "balanced", "speed", "speed")
+_VP9_CPU_USED = ("1", "2", "5", "8")
+_AOM_CPU_USED = ("3", "5", "7", "8")
+
+# Candidates per codec, fastest first; software encoders last.
+_FAMILIES = {
+    "h264": ("h264_nvenc", "h264_qsv", "h264_amf", "h264_videotoolbox", "libx264"),
+    "hevc": ("hevc_nvenc", "hevc_qsv", "hevc_amf", "hevc_videotoolbox", "libx265"),
+    "av1": ("av1_nvenc", "av1_qsv", "av1_amf", "libsvtav1", "libaom-av1"),
+    "vp9": ("vp9_qsv", "libvpx-vp9"),
+}
+_FAMILY_OF = {encoder: family for family, encoders in _FAMILIES.items() for encoder in encoders}
+_SOFTWARE = {"libx264", "libx265", "libsvtav1", "libaom-av1", "libvpx-vp9", "prores_ks"}
+
+_lock = threading.Lock()
+_compiled: dict[str, frozenset[str]] = {}
+_usable: dict[tuple[str, str], bool] = {}
+
+
+class EncodePlan(NamedTuple):
+    encoder: str | None
+    main_pass: list[str]
+    quality_args: list[str]
+
+
+def _is_hardware(encoder: str) -> bool:
+    return encoder.endswith(("_nvenc", "_qsv", "_amf", "_videotoolbox", "_vaapi"))
+
+
+def compiled_encoders(ffmpeg_path: str) -> frozenset[str]:
+    """Video encoders listed by ``ffmpeg -encoders`` (cached per binary)."""
+    with _lock:
+        cached = _compiled.get(ffmpeg_path)
+    if cached is not None:
+        return cached
+    names: set[str] = set()
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=30,
+        )
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            # " V....D libx264  libx264 H.264 / AVC ..."
+            if len(parts) >= 2 and parts[0].startswith("V") and len(parts[0]) == 6:
+                names.add(parts[1])
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Could not list ffmpeg encoders: {e}")
+    cached = frozenset(names)
+    with _lock:
+        _compiled[ffmpeg_path] = cached
+    return cached
+
+
+def is_usable(ffmpeg_path: str, encoder: str) -> bool:
+    """Whether ``encoder`` is compiled in and, for hardware encoders, can encode a frame here."""
+    key = (ffmpeg_path, encoder)
+    with _lock:
+        cached = _usable.get(key)
+    if cached is not None:
+        return cached
+    usable = encoder in compiled_encoders(ffmpeg_path)
+    if usable and _is_hardware(encoder):
+        try:
+            result = subprocess.run(
+                [
+                    ffmpeg_path, "-hide_banner", "-loglevel", "error",
+                    "-f", "lavfi", "-i", "color=black:s=256x256:d=0.04",
+                    "-frames:v", "1", "-c:v", encoder, "-f", "null", "-",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                timeout=30,
+            )
+            usable = result.returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            usable = False
+    with _lock:
+        _usable[key] = usable
+    return usable
+
+
+def _deployment_tier() -> str:
+    raw = os.environ.get(_SPEED_ENV, "").strip().lower()
+    if raw and raw not in SPEED_TIERS:
+        logger.warning(f"Ignoring invalid {_SPEED_ENV}={raw!r}")
+        return "default"
+    return raw or "default"
+
+
+def _software_threads() -> list[str]:
+    raw = os.environ.get(_THREADS_ENV, "").strip()
+    if not raw:
+        return []
+    try:
+        return ["-threads", str(max(0, int(raw)))]
+    except ValueError:
+        logger.warning(f"Ignoring invalid {_THREADS_ENV}={raw!r}")
+        return []
+
+
+def _tile_columns_log2(width: int) -> int:
+    # VP9/AV1 tiles must be at least 256 pixels wide.
+    return max(0, min(6, int(math.log2(max(1, width // 256))))) if width >= 256 else 0
+
+
+def tier_args(encoder: str, tier: str, width: int) -> list[str]:
+    """Built-in speed options of ``encoder`` for ``tier`` (empty for ``default``)."""
+    index = _TIER_INDEX.get(tier)
+    if index is None:
+        return []
+    if encoder in _PRESETS:
+        args = ["-preset", _PRESETS[encoder][index]]
+    elif encoder.endswith("_amf"):
+        args = ["-quality", _AMF_QUALITY[index]]
+    elif encoder == "libvpx-vp9":
+        args = [
+            "-deadline", "good" if index < 2 else "realtime",
+            "-cpu-used", _VP9_CPU_USED[index],
+            "-row-mt", "1",
+            "-tile-columns", str(_tile_columns_log2(width)),
+        ]
+    elif encoder == "libaom-av1":
+        cols = _tile_columns_log2(width)
+        args = ["-cpu-used", _AOM_CPU_USED[index], "-row-mt", "1", "-tiles", f"{2 ** min(cols, 2)}x1"]
+    elif encoder.endswith("_videotoolbox"):
+        args = ["-prio_speed", "1"] if index >= 2 else []
+    else:
+        args = []
+    if not _is_hardware(encoder):
+        args += _software_threads()
+    return args
+
+
+def quality_args(encoder: str | None, crf: int, quality: int) -> list[str]:
+    """Rate-control arguments for ``encoder``.
+
+    ``crf`` is the saver's 50 (worst) to 1 (best) value, ``quality`` the raw
+    0-100 widget.
+    """
+    if encoder == "libaom-av1":
+        return ["-crf", str(crf), "-b:v", "0"]
+    if encoder is None or encoder in _SOFTWARE:
+        return ["-crf", str(crf)]
+    if encoder.endswith("_nvenc"):
+        return ["-rc", "vbr", "-cq", str(crf), "-b:v", "0"]
+    if encoder.endswith("_qsv"):
+        return ["-global_quality", str(crf)]
+    if encoder.endswith("_amf"):
+        return ["-rc", "cqp", "-qp_i", str(crf), "-qp_p", str(crf)]
+    if encoder.endswith("_videotoolbox"):
+        return ["-q:v", str(max(1, min(100, int(quality))))]
+    return ["-crf", str(crf)]
+
+
+def _encoder_index(main_pass: list[str]) -> int | None:
+    """Position of the encoder name in ``main_pass``."""
+    for flag in ("-c:v", "-vcodec", "-codec:v"):
+        if flag in main_pass:
+            index = main_pass.index(flag) + 1
+            if index < len(main_pass):
+                return index
+    return None
+
+
+def resolve(video_format: dict, ffmpeg_path: str, tier: str, width: int, crf: int, quality: int) -> EncodePlan:
+    """The encoder, ``main_pass`` and rate-control arguments for one save."""
+    main_pass = [str(arg) for arg in video_format.get("main_pass", [])]
+    encoder_index = _encoder_index(main_pass)
+    encoder = main_pass[encoder_index] if encoder_index is not None else None
+    if tier not in SPEED_TIERS or tier == "default":
+        tier = _deployment_tier()
+    if tier == "default" or encoder is None:
+        # The format's own arguments, exactly as before speed tiers existed.
+        return EncodePlan(encoder, main_pass, ["-crf", str(crf)])
+
+    swapped = False
+    if tier == "fastest available":
+        family = _FAMILIES.get(_FAMILY_OF.get(encoder, ""), ())
+        chosen = next((candidate for candidate in family if is_usable(ffmpeg_path, candidate)), encoder)
+        if chosen != encoder:
+            main_pass[encoder_index] = chosen
+            logger.info(f"SaveVideo: using {chosen} instead of {encoder}")
+            encoder, swapped = chosen, True
+        tier = "fast"
+
+    # Format overrides describe the format's own encoder.
+    overrides = video_format.get("speed_tiers")
+    if not swapped and isinstance(overrides, dict) and isinstance(overrides.get(tier), list):
+        extra = [str(arg) for arg in overrides[tier]]
+    else:
+        extra = tier_args(encoder, tier, width)
+    return EncodePlan(encoder, main_pass + extra, quality_args(encoder, crf, quality))
+
+
+def clear() -> None:
+    """Forget the cached encoder checks (e.g. after installing another ffmpeg)."""
+    with _lock:
+        _compiled.clear()
+        _usable.clear()
@@ -0,0 +1,153 @@
+"""Per-workflow lookup index built from ``extra_pnginfo["workflow"]``.
+
+Every node of a prompt receives the same ``extra_pnginfo`` object, so the
+index is built once per queued workflow and reused by every node that
+executes in that prompt. Title queries are memoized on the index itself.
+
+The node, link and input-slot maps behind :meth:`WorkflowIndex.node` and
+:meth:`WorkflowIndex.origin` are built on first use, so nodes that only
+match titles do not pay for them.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+_lock = threading.Lock()
+# Most recently indexed workflows as (workflow object, index) pairs.
+_recent: list[tuple[Any, "WorkflowIndex"]] = []
+_MAX_RECENT = 4
+
+
+def _display_names() -> dict:
+    try:
+        import nodes  # type: ignore[import-not-found]
+
+        return getattr(nodes, "NODE_DISPLAY_NAME_MAPPINGS", {}) or {}
+    except Exception:
+        return {}
+
+
+class WorkflowIndex:
+    """Node titles and links of a workflow's root graph."""
+
+    def __init__(self, workflow: dict):
+        self._workflow = workflow
+        self._nodes: dict[str, dict] | None = None
+        self._links: dict[str, tuple[Any, Any]] | None = None
+        self._inputs: dict[str, dict[str, dict]] = {}
+        display_names = _display_names()
+        self.titles: list[tuple[str, str]] = []
+        for node in workflow.get("nodes", []) or []:
+            if not isinstance(node, dict) or node.get("id") is None:
+                continue
+            # The frontend only serializes titles that differ from the default,
+            # which is the display name of the node type.
+            node_type = str(node.get("type") or "")
+            title = node.get("title") or display_names.get(node_type) or node_type
+            self.titles.append((str(node["id"]), str(title).lower()))
+
+        definitions = workflow.get("definitions", {})
+        subgraphs = definitions.get("subgraphs", []) if isinstance(definitions, dict) else []
+        # Subgraph node IDs are only unique per subgraph, so title matches
+        # inside subgraphs cannot be turned into concrete IDs.
+        self.resolvable = not any(
+            isinstance(subgraph, dict) and subgraph.get("nodes") for subgraph in subgraphs
+        )
+        self._matches: dict[tuple[tuple[str, ...], tuple[str, ...]], tuple[str, ...]] = {}
+
+    def match_titles(self, includes: tuple[str, ...], excludes: tuple[str, ...]) -> tuple[str, ...]:
+        """Return IDs of nodes whose title contains any include and no exclude (lowercase needles)."""
+        key = (includes, excludes)
+        cached = self._matches.get(key)
+        if cached is None:
+            cached = tuple(
+                node_id
+                for node_id, title in self.titles
+                if any(needle in title for needle in includes)
+                and not any(needle in title for needle in excludes)
+            )
+            self._matches[key] = cached
+        return cached
+
+    def _node_map(self) -> dict[str, dict]:
+        if self._nodes is None:
+            nodes: dict[str, dict] = {}
+            for node in self._workflow.get("nodes", []) or []:
+                if isinstance(node, dict) and node.get("id") is not None:
+                    nodes.setdefault(str(node["id"]), node)
+            self._nodes = nodes
+        return self._nodes
+
+    def node_ids(self) -> list[str]:
+        """IDs of the root graph's nodes, in workflow order."""
+        return list(self._node_map())
+
+    def node(self, node_id: Any) -> dict | None:
+        """The serialized node with ``node_id``, or ``None``."""
+        return self._node_map().get(str(node_id))
+
+    def link(self, link_id: Any) -> tuple[Any, Any] | None:
+        """``(origin_id, origin_slot)`` of the link ``link_id``, or ``None``."""
+        if self._links is None:
+            links: dict[str, tuple[Any, Any]] = {}
+            for link in self._workflow.get("links", []) or []:
+                # Links are [id, origin_id, origin_slot, target_id, target_slot, type]
+                # in the classic format and dicts in the newer one.
+                if isinstance(link, dict):
+                    if link.get("id") is not None:
+                        links.setdefault(str(link["id"]), (link.get("origin_id"), link.get("origin_slot")))
+                elif isinstance(link, list) and len(link) >= 5:
+                    links.setdefault(str(link[0]), (link[1], link[2]))
+            self._links = links
+        return self._links.get(str(link_id))
+
+    def input_slot(self, node_id: Any, name: str) -> dict | None:
+        """The input slot ``name`` of node ``node_id``, or ``None``."""
+        key = str(node_id)
+        slots = self._inputs.get(key)
+        if slots is None:
+            node = self.node(key)
+            inputs = node.get("inputs", []) if node is not None else []
+            if isinstance(inputs, dict):
+                inputs = list(inputs.values())
+            slots = {}
+            if isinstance(inputs, list):
+                for slot in inputs:
+                    if isinstance(slot, dict) and slot.get("name") is not None:
+                        slots.setdefault(slot["name"], slot)
+            self._inputs[key] = slots
+        return slots.get(name)
+
+    def origin(self, node_id: Any, name: str) -> tuple[dict, Any] | None:
+        """``(origin node, origin slot index)`` linked into input ``name`` of ``node_id``."""
+        slot = self.input_slot(node_id, name)
+        link_id = slot.get("link") if slot is not None else None
+        if link_id is None:
+            return None
+        link = self.link(link_id)
+        if link is None:
+            return None
+        origin_node = self.node(link[0])
+        if origin_node is None:
+            return None
+        return origin_node, link[1]
+
+
+def get_workflow_index(extra_pnginfo: Any) -> WorkflowIndex | None:
+    """Return the (cached) index for the workflow in ``extra_pnginfo``, if any."""
+    if not isinstance(extra_pnginfo, dict):
+        return None
+    workflow = extra_pnginfo.get("workflow")
+    if not isinstance(workflow, dict):
+        return None
+    with _lock:
+        for cached_workflow, index in _recent:
+            if cached_workflow is workflow:
+                return index
+    index = WorkflowIndex(workflow)
+    with _lock:
+        _recent.insert(0, (workflow, index))
+        del _recent[_MAX_RECENT:]
+    return index
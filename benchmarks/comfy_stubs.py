@@ -0,0 +1,232 @@
+"""Minimal stand-ins for the ComfyUI runtime, for running nodes headless.
+
+The benchmarks import node modules directly, outside a ComfyUI install.
+:func:`install` registers just enough of ``folder_paths``, ``comfy.sd``,
+``comfy.utils``, ``comfy.model_management``, ``server.PromptServer``,
+``nodes`` and ``node_helpers`` for the measured code paths. Everything
+points at a scratch directory and runs on the CPU. The real torch, numpy
+and Pillow are still required.
+
+:func:`load_pack` then makes the repository importable as a package under
+a private name without running its ``__init__.py`` (no routes, no node
+registry); :func:`import_node_module` imports single modules from it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import types
+from pathlib import Path
+
+PACK_ROOT = Path(__file__).resolve().parents[1]
+PACK_NAME = "aun_bench_pack"
+
+SUPPORTED_PT_EXTENSIONS = {".ckpt", ".pt", ".pt2", ".bin", ".pth", ".safetensors", ".pkl", ".sft"}
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def _folder_paths(base: Path) -> types.ModuleType:
+    output_dir = base / "output"
+    temp_dir = base / "temp"
+    input_dir = base / "input"
+    models_dir = base / "models"
+    for folder in (output_dir, temp_dir, input_dir, models_dir):
+        folder.mkdir(parents=True, exist_ok=True)
+
+    def get_output_directory():
+        return str(output_dir)
+
+    def get_temp_directory():
+        return str(temp_dir)
+
+    def get_input_directory():
+        return str(input_dir)
+
+    def get_directory_by_type(type_name):
+        return {"output": str(output_dir), "temp": str(temp_dir), "input": str(input_dir)}.get(type_name)
+
+    def get_folder_paths(folder_name):
+        return [str(models_dir / folder_name)]
+
+    def get_filename_list(folder_name):
+        root = models_dir / folder_name
+        if not root.is_dir():
+            return []
+        return sorted(
+            path.relative_to(root).as_posix()
+            for path in root.rglob("*")
+            if path.is_file() and path.suffix.lower() in SUPPORTED_PT_EXTENSIONS
+        )
+
+    def get_full_path(folder_name, filename):
+        path = models_dir / folder_name / str(filename)
+        return str(path) if path.is_file() else None
+
+    def get_save_image_path(filename_prefix, output_dir, image_width=0, image_height=0):
+        # Same contract as ComfyUI: (folder, filename, counter, subfolder, prefix).
+        subfolder, filename = os.path.split(os.path.normpath(filename_prefix))
+        full_output_folder = os.path.join(output_dir, subfolder)
+        os.makedirs(full_output_folder, exist_ok=True)
+        counter = 1
+        prefix = f"{filename}_"
+        for existing in os.listdir(full_output_folder):
+            stem = os.path.splitext(existing)[0]
+            if stem.startswith(prefix) and stem[len(prefix):].split("_")[0].isdigit():
+                counter = max(counter, int(stem[len(prefix):].split("_")[0]) + 1)
+        return full_output_folder, filename, counter, subfolder, filename_prefix
+
+    return _module(
+        "folder_paths",
+        base_path=str(base),
+        models_dir=str(models_dir),
+        output_directory=str(output_dir),
+        temp_directory=str(temp_dir),
+        input_directory=str(input_dir),
+        supported_pt_extensions=SUPPORTED_PT_EXTENSIONS,
+        get_output_directory=get_output_directory,
+        get_temp_directory=get_temp_directory,
+        get_input_directory=get_input_directory,
+        get_directory_by_type=get_directory_by_type,
+        get_folder_paths=get_folder_paths,
+        get_filename_list=get_filename_list,
+        get_full_path=get_full_path,
+        get_save_image_path=get_save_image_path,
+    )
+
+
+def _comfy() -> None:
+    import torch
+    import torch.nn.functional as F
+
+    class ProgressBar:
+        def __init__(self, total, node_id=None):
+            self.total = total
+            self.current = 0
+
+        def update(self, value):
+            self.current += value
+
+        def update_absolute(self, value, total=None, preview=None):
+            self.current = value
+            if total is not None:
+                self.total = total
+
+    def load_torch_file(ckpt, safe_load=False, device=None, return_metadata=False):
+        if str(ckpt).lower().endswith((".safetensors", ".sft")):
+            import safetensors.torch
+
+            sd = safetensors.torch.load_file(ckpt, device=str(device or "cpu"))
+        else:
+            sd = torch.load(ckpt, map_location=device or "cpu", weights_only=True)
+        return (sd, {}) if return_metadata else sd
+
+    def common_upscale(samples, width, height, upscale_method, crop):
+        mode = {"nearest-exact": "nearest-exact", "bilinear": "bilinear", "bicubic": "bicubic", "area": "area"}
+        return F.interpolate(samples, size=(height, width), mode=mode.get(upscale_method, "bilinear"))
+
+    def load_lora_for_models(model, clip, lora, strength_model, strength_clip):
+        return model, clip
+
+    def load_checkpoint_guess_config(*args, **kwargs):
+        raise NotImplementedError("checkpoints are not available in the benchmark runtime")
+
+    comfy = _module("comfy")
+    comfy.__path__ = []
+    comfy.utils = _module(
+        "comfy.utils",
+        PROGRESS_BAR_ENABLED=False,
+        ProgressBar=ProgressBar,
+        load_torch_file=load_torch_file,
+        common_upscale=common_upscale,
+    )
+    comfy.sd = _module(
+        "comfy.sd",
+        CLIPType=types.SimpleNamespace(STABLE_DIFFUSION=1),
+        load_lora_for_models=load_lora_for_models,
+        load_checkpoint_guess_config=load_checkpoint_guess_config,
+    )
+    comfy.model_management = _module(
+        "comfy.model_management",
+        get_torch_device=lambda: torch.device("cpu"),
+        intermediate_device=lambda: torch.device("cpu"),
+        unet_offload_device=lambda: torch.device("cpu"),
+    )
+
+
+def _server() -> None:
+    class _Routes:
+        def _register(self, *args, **kwargs):
+            return lambda handler: handler
+
+        get = post = put = delete = _register
+
+    class PromptServer:
+        instance = None
+
+        def __init__(self):
+            self.routes = _Routes()
+            self.sent: list[tuple[str, object]] = []
+
+        def send_sync(self, event, data, sid=None):
+            self.sent.append((event, data))
+
+    PromptServer.instance = PromptServer()
+    _module("server", PromptServer=PromptServer)
+
+
+def _nodes(folder_paths: types.ModuleType) -> None:
+    class SaveImage:
+        def __init__(self):
+            self.output_dir = folder_paths.get_output_directory()
+            self.type = "output"
+            self.prefix_append = ""
+            self.compress_level = 4
+
+    class PreviewImage(SaveImage):
+        def __init__(self):
+            self.output_dir = folder_paths.get_temp_directory()
+            self.type = "temp"
+            self.prefix_append = "_temp_"
+            self.compress_level = 1
+
+    _module("nodes", SaveImage=SaveImage, PreviewImage=PreviewImage)
+
+
+def _node_helpers() -> None:
+    def pillow(fn, arg):
+        return fn(arg)
+
+    _module("node_helpers", pillow=pillow)
+
+
+def install(base: Path) -> None:
+    """Register the stub modules, rooted at the scratch directory ``base``."""
+    folder_paths = _folder_paths(Path(base))
+    _comfy()
+    _server()
+    _nodes(folder_paths)
+    _node_helpers()
+
+
+def load_pack() -> types.ModuleType:
+    """The repository as an importable package, without running its ``__init__``."""
+    pack = sys.modules.get(PACK_NAME)
+    if pack is None:
+        pack = _module(PACK_NAME)
+        pack.__path__ = [str(PACK_ROOT)]
+        pack.__file__ = str(PACK_ROOT / "__init__.py")
+    return pack
+
+
+def import_node_module(name: str) -> types.ModuleType:
+    """Import ``<pack>.<name>`` (e.g. ``"AUNSaveImage"``)."""
+    load_pack()
+    return importlib.import_module(f"{PACK_NAME}.{name}")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""Run the AUN benchmark scenarios headless on CPU and report timings.
+
+Nodes run against the stub ComfyUI runtime in ``comfy_stubs.py`` inside a
+scratch directory. Every scenario is warmed up once and then timed
+``--repeat`` times; results can be written as JSON (``--json``) and
+compared against an earlier run (``--compare``), which exits non-zero when
+any scenario's median got slower than ``--threshold``.
+
+Examples:
+    python benchmarks/run.py --list
+    python benchmarks/run.py --json bench.json
+    python benchmarks/run.py --quick --only "graph.*" --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import comfy_stubs  # noqa: E402
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=comfy_stubs.PACK_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _environment() -> dict[str, Any]:
+    import numpy
+    import PIL
+    import torch
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "numpy": numpy.__version__,
+        "pillow": PIL.__version__,
+    }
+
+
+def _time(run, repeat: int) -> dict[str, Any]:
+    run()  # warm-up: imports, caches, first-call allocation
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "stdev_ms": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+        "samples_ms": [round(s, 3) for s in samples],
+    }
+
+
+def run_scenarios(names: list[str], repeat: int, quick: bool, seed: int, keep: bool) -> dict[str, Any]:
+    scratch = Path(tempfile.mkdtemp(prefix="aun_bench_"))
+    comfy_stubs.install(scratch)
+    import scenarios
+
+    ctx = scenarios.Context(scratch=scratch, quick=quick, seed=seed)
+    results: dict[str, Any] = {}
+    try:
+        for name in names:
+            print(f"{name} ...", end=" ", flush=True, file=sys.stderr)
+            try:
+                run, info = scenarios.SCENARIOS[name](ctx)
+                results[name] = {**info, **_time(run, repeat)}
+            except scenarios.Skip as e:
+                results[name] = {"skipped": str(e)}
+                print(f"skipped ({e})", file=sys.stderr)
+                continue
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"error ({type(e).__name__}: {e})", file=sys.stderr)
+                continue
+            print(f"{results[name]['median_ms']:.1f} ms", file=sys.stderr)
+    finally:
+        if keep:
+            print(f"Scratch directory kept at {scratch}", file=sys.stderr)
+        else:
+            scenarios.cleanup(ctx)
+    return {
+        "environment": _environment(),
+        "config": {"repeat": repeat, "quick": quick, "seed": seed},
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> int:
+    """Print median ratios against ``baseline``; return how many regressed past ``threshold``."""
+    regressions = 0
+    print(f"{'scenario':<28} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name, {})
+        if "median_ms" not in result or "median_ms" not in before:
+            print(f"{name:<28} {'-':>12} {'-':>12} {'n/a':>8}")
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{name:<28} {before['median_ms']:>10.1f}ms {result['median_ms']:>10.1f}ms {ratio:>7.2f}x{flag}")
+    if baseline.get("config") != current["config"]:
+        print("note: baseline was recorded with different settings", baseline.get("config"))
+    return regressions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--only", action="append", default=[], help="glob of scenario names to run (repeatable)")
+    ap.add_argument("--repeat", type=int, default=5, help="timed runs per scenario (default: 5)")
+    ap.add_argument("--quick", action="store_true", help="smaller inputs, for a fast smoke run")
+    ap.add_argument("--seed", type=int, default=1234, help="seed for all generated inputs")
+    ap.add_argument("--json", type=Path, help="write the results to this JSON file")
+    ap.add_argument("--compare", type=Path, help="earlier --json output to compare against")
+    ap.add_argument("--threshold", type=float, default=1.15, help="median ratio counted as a regression (default: 1.15)")
+    ap.add_argument("--keep", action="store_true", help="keep the scratch directory with the written outputs")
+    ap.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    args = ap.parse_args()
+
+    # The scenario registry is import-safe without the stubs; nothing runs until called.
+    import scenarios
+
+    names = list(scenarios.SCENARIOS)
+    if args.only:
+        names = [n for n in names if any(fnmatch.fnmatch(n, pattern) for pattern in args.only)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        print("error: no scenario matches --only", file=sys.stderr)
+        return 2
+
+    report = run_scenarios(names, max(1, args.repeat), args.quick, args.seed, args.keep)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote {args.json}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(report, baseline, args.threshold):
+            return 1
+    failed = [name for name, result in report["results"].items() if "error" in result]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,391 @@
+"""Benchmark scenarios.
+
+Each scenario is registered under a dotted name with :func:`scenario`. It
+receives the run :class:`Context` and returns ``(run, info)``: ``run`` is
+the callable that gets timed and ``info`` is a dict of static facts about
+the workload (batch size, resolution, ...) copied into the results. A
+scenario raises :class:`Skip` when the machine cannot run it (no ffmpeg,
+for example). Inputs come from seeded generators, so two runs on the same
+machine time the same work.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from comfy_stubs import PACK_ROOT, import_node_module
+
+SCENARIOS: dict[str, Callable[["Context"], tuple[Callable[[], Any], dict]]] = {}
+
+
+class Skip(Exception):
+    """The scenario cannot run here; the message says why."""
+
+
+@dataclass
+class Context:
+    scratch: Path
+    quick: bool
+    seed: int
+
+    def size(self, full: int, quick: int) -> int:
+        return quick if self.quick else full
+
+
+def scenario(name: str):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+
+    return register
+
+
+def _images(ctx: Context, count: int, height: int, width: int):
+    import torch
+
+    generator = torch.Generator().manual_seed(ctx.seed)
+    return torch.rand((count, height, width, 3), generator=generator, dtype=torch.float32)
+
+
+def _frames(ctx: Context, count: int, height: int, width: int):
+    """A moving gradient, so encoders see realistic motion instead of noise."""
+    import torch
+
+    ys = torch.linspace(0.0, 1.0, height).view(height, 1, 1)
+    xs = torch.linspace(0.0, 1.0, width).view(1, width, 1)
+    phase = torch.tensor([0.0, 2.1, 4.2]).view(1, 1, 3)
+    frames = [
+        0.5 + 0.5 * torch.sin(6.28 * (xs + ys * 0.5 + i / max(count, 1)) + phase) for i in range(count)
+    ]
+    return torch.stack(frames).clamp(0.0, 1.0)
+
+
+# --- Synthetic workflows -----------------------------------------------------
+
+_UNIT = ("CheckpointLoaderSimple", "LoraLoader", "LoraLoader", "CLIPTextEncode", "CLIPTextEncode", "KSampler", "VAEDecode")
+
+
+def synthetic_workflow(node_count: int, seed: int = 0) -> tuple[dict, dict]:
+    """``(prompt, extra_pnginfo)`` for a graph of ``node_count`` nodes.
+
+    The graph repeats a checkpoint -> 2 LoRAs -> text encoders -> sampler ->
+    decode unit, padded with unrelated primitive nodes (about a third of the
+    graph, as in large real workflows), and ends in one ``AUNSaveImage``.
+    """
+    rng = random.Random(seed)
+    prompt: dict[str, dict] = {}
+    nodes: list[dict] = []
+    links: list[list] = []
+    link_ids = itertools.count(1)
+    ids = itertools.count(1)
+
+    def add(node_type: str, inputs: dict, widgets: list, wf_inputs: list | None = None) -> str:
+        node_id = next(ids)
+        prompt[str(node_id)] = {"class_type": node_type, "inputs": inputs}
+        nodes.append(
+            {
+                "id": node_id,
+                "type": node_type,
+                "mode": 0,
+                "inputs": wf_inputs or [],
+                "widgets_values": widgets,
+            }
+        )
+        return str(node_id)
+
+    def link(src: str, slot: int, dst_inputs: list, name: str, kind: str) -> list:
+        link_id = next(link_ids)
+        links.append([link_id, int(src), slot, len(nodes) + 1, len(dst_inputs), kind])
+        dst_inputs.append({"name": name, "type": kind, "link": link_id})
+        return [src, slot]
+
+    decode = None
+    while len(nodes) < node_count - 1:
+        if len(nodes) + len(_UNIT) + 1 > node_count - 1 or rng.random() < 0.35:
+            add("PrimitiveNode", {"value": rng.randint(0, 10_000)}, [rng.randint(0, 10_000), "fixed"])
+            continue
+        ckpt = add("CheckpointLoaderSimple", {"ckpt_name": f"model_{rng.randint(0, 20)}.safetensors"}, [])
+        model, clip = [ckpt, 0], [ckpt, 1]
+        for _ in range(2):
+            name = f"lora_{rng.randint(0, 200)}.safetensors"
+            strength = round(rng.uniform(0.2, 1.2), 2)
+            wf_inputs: list = []
+            inputs = {
+                "model": link(model[0], model[1], wf_inputs, "model", "MODEL"),
+                "clip": link(clip[0], clip[1], wf_inputs, "clip", "CLIP"),
+                "lora_name": name,
+                "strength_model": strength,
+                "strength_clip": strength,
+            }
+            lora = add("LoraLoader", inputs, [name, strength, strength], wf_inputs)
+            model, clip = [lora, 0], [lora, 1]
+        encoders = []
+        for text in (f"a photo of subject {rng.randint(0, 999)}, detailed", "blurry, lowres"):
+            wf_inputs = []
+            inputs = {"clip": link(clip[0], clip[1], wf_inputs, "clip", "CLIP"), "text": text}
+            encoders.append(add("CLIPTextEncode", inputs, [text], wf_inputs))
+        wf_inputs = []
+        inputs = {
+            "model": link(model[0], model[1], wf_inputs, "model", "MODEL"),
+            "positive": link(encoders[0], 0, wf_inputs, "positive", "CONDITIONING"),
+            "negative": link(encoders[1], 0, wf_inputs, "negative", "CONDITIONING"),
+            "seed": rng.randint(0, 2**32),
+            "steps": 20,
+            "cfg": 7.0,
+            "sampler_name": "euler",
+            "scheduler": "normal",
+            "denoise": 1.0,
+        }
+        sampler = add("KSampler", inputs, [inputs["seed"], "fixed", 20, 7.0, "euler", "normal", 1.0], wf_inputs)
+        wf_inputs = []
+        decode = add("VAEDecode", {"samples": link(sampler, 0, wf_inputs, "samples", "LATENT")}, [], wf_inputs)
+
+    wf_inputs = []
+    save_inputs = {"filename": "%date%_%seed%", "path": "", "extension": "png"}
+    if decode is not None:
+        save_inputs["images"] = link(decode, 0, wf_inputs, "images", "IMAGE")
+    add("AUNSaveImage", save_inputs, ["%date%_%seed%", "", "png"], wf_inputs)
+    return prompt, {"workflow": {"nodes": nodes, "links": links, "version": 0.4}}
+
+
+# --- Image saving ------------------------------------------------------------
+
+def _save_image(ctx: Context, batch: int):
+    module = import_node_module("AUNSaveImage")
+    side = ctx.size(512, 128)
+    images = _images(ctx, batch, side, side)
+    prompt, extra_pnginfo = synthetic_workflow(200, ctx.seed)
+    node = module.AUNSaveImage()
+    # A fresh subfolder per run keeps name allocation cost constant.
+    runs = itertools.count()
+
+    def run():
+        return node.save_files(
+            images,
+            filename="bench_%seed%_%batch_num%",
+            path=f"bench/save_image_b{batch}/r{next(runs)}",
+            extension="png",
+            seed_value=ctx.seed,
+            modelname="model.safetensors",
+            sampler_name="euler",
+            scheduler="normal",
+            sidecar_format="Output text",
+            prompt=prompt,
+            extra_pnginfo=extra_pnginfo,
+        )
+
+    return run, {"images": batch, "resolution": f"{side}x{side}", "format": "png"}
+
+
+for _batch in (1, 16, 64):
+    scenario(f"save_image.batch{_batch}")(lambda ctx, batch=_batch: _save_image(ctx, batch))
+
+
+# --- Video saving ------------------------------------------------------------
+
+def _save_video(ctx: Context, output_format: str, needs_ffmpeg: bool, parallel: bool = False):
+    module = import_node_module("AUNSaveVideo")
+    if needs_ffmpeg and not module.get_ffmpeg_path():
+        raise Skip("ffmpeg not found on PATH or via imageio-ffmpeg")
+    frames = ctx.size(48, 12)
+    side = ctx.size(512, 128)
+    images = _frames(ctx, frames, side, side)
+    node = module.AUNSaveVideo()
+
+    def run():
+        return node.combine_video(
+            images,
+            frame_rate=24,
+            loop_count=0,
+            filename_format="bench_video",
+            output_format=output_format,
+            save_to_output_dir=True,
+            quality=85,
+            save_metadata=True,
+            save_workflow=False,
+            batch_size=32,
+            sidecar_format="Output only (text)",
+            parallel_segments=parallel,
+        )
+
+    return run, {"frames": frames, "resolution": f"{side}x{side}", "format": output_format, "parallel_segments": parallel}
+
+
+scenario("save_video.h264_mp4")(lambda ctx: _save_video(ctx, "video/h264-mp4", True))
+scenario("save_video.h264_mp4_parallel")(lambda ctx: _save_video(ctx, "video/h264-mp4", True, parallel=True))
+scenario("save_video.webp")(lambda ctx: _save_video(ctx, "image/webp", False))
+
+
+# --- RIFE --------------------------------------------------------------------
+
+@scenario("rife.interpolate_x2")
+def _rife(ctx: Context):
+    import torch
+
+    module = import_node_module("AUNRIFE")
+    from aun_bench_pack.aun_rife_arch import IFNet
+
+    node = module.AUNRIFE()
+    node.device = torch.device("cpu")
+    torch.manual_seed(ctx.seed)
+    # Random weights: the timing depends on the architecture, not the checkpoint.
+    node.model = IFNet(arch_ver=node.CKPT_CONFIGS["rife47"]["arch"]).eval()
+    node.current_ckpt = "rife47"
+    frames = ctx.size(6, 3)
+    side = ctx.size(256, 64)
+    images = _frames(ctx, frames, side, side)
+
+    def run():
+        return node.interpolate_frames(images, "rife47", 2, False)
+
+    return run, {"frames": frames, "resolution": f"{side}x{side}", "multiplier": 2, "threads": torch.get_num_threads()}
+
+
+# --- Graph scraping ----------------------------------------------------------
+
+def _graph(ctx: Context, which: str):
+    module = import_node_module("AUNSaveImage")
+    node_count = ctx.size(2000, 500)
+    prompt, extra_pnginfo = synthetic_workflow(node_count, ctx.seed)
+    if which == "loras":
+        return (lambda: module.extract_loras(prompt, extra_pnginfo)), {"nodes": node_count}
+    return (lambda: module.AUNSaveImage._extract_text_prompts(prompt, extra_pnginfo)), {"nodes": node_count}
+
+
+scenario("graph.extract_loras")(lambda ctx: _graph(ctx, "loras"))
+scenario("graph.extract_prompts")(lambda ctx: _graph(ctx, "prompts"))
+
+
+# --- Wildcards ---------------------------------------------------------------
+
+@scenario("wildcards.load")
+def _wildcards_load(ctx: Context):
+    module = import_node_module("AUNWildcardAddToPrompt")
+    processor = module._LocalWildcardProcessor()
+    names = processor.get_wildcard_names(force_refresh=True)
+    return (lambda: processor.get_wildcard_names(force_refresh=True)), {"wildcard_files": len(names)}
+
+
+@scenario("wildcards.expand")
+def _wildcards_expand(ctx: Context):
+    module = import_node_module("AUNWildcardAddToPrompt")
+    processor = module._LocalWildcardProcessor()
+    names = processor.get_wildcard_names()
+    if not names:
+        raise Skip(f"no wildcard files under {PACK_ROOT / 'wildcards'}")
+    rng = random.Random(ctx.seed)
+    picks = rng.sample(names, min(6, len(names)))
+    template = (
+        f"a {{cinematic|moody|2::bright}} photo of __{picks[0]}__, "
+        + ", ".join(f"__{name}__" for name in picks[1:])
+        + f", {{3#__{picks[0]}__|{{red|green|blue}} light}}"
+    )
+    prompts = ctx.size(500, 50)
+
+    def run():
+        randomizer = random.Random(ctx.seed)
+        for _ in range(prompts):
+            processor._expand_text(template, randomizer)
+
+    return run, {"prompts": prompts, "wildcards_used": len(picks)}
+
+
+# --- Image list loading ------------------------------------------------------
+
+def _jpeg_folder(ctx: Context, count: int, side: int) -> Path:
+    from PIL import Image
+
+    folder = ctx.scratch / "input" / f"jpeg_{count}_{side}"
+    if not folder.is_dir():
+        folder.mkdir(parents=True)
+        images = _frames(ctx, count, side, side * 3 // 2)
+        for i, frame in enumerate(images):
+            pixels = (frame.numpy() * 255.0).round().astype("uint8")
+            Image.fromarray(pixels).save(folder / f"photo_{i:04d}.jpg", quality=90)
+    return folder
+
+
+def _image_list(ctx: Context, size_hint: int):
+    module = import_node_module("AUNImageSingleBatch3")
+    count = ctx.size(64, 8)
+    side = ctx.size(2000, 512)
+    folder = str(_jpeg_folder(ctx, count, side))
+    node = module.AUNImageSingleBatch3()
+
+    def run():
+        return node.load_image(
+            source_mode="Batch from Folder",
+            path_mode="Manual",
+            predefined_path="",
+            manual_path=folder,
+            batch_mode="fixed",
+            range_or_pattern=f"1-{count}",
+            image_upload="",
+            output_is_list=True,
+            list_size_hint=size_hint,
+        )
+
+    return run, {"images": count, "resolution": f"{side * 3 // 2}x{side}", "list_size_hint": size_hint}
+
+
+scenario("image_list.load")(lambda ctx: _image_list(ctx, 0))
+scenario("image_list.load_hint")(lambda ctx: _image_list(ctx, 512))
+
+
+# --- Folder scanning ---------------------------------------------------------
+
+def _populated_folder(ctx: Context, count: int) -> Path:
+    folder = ctx.scratch / "input" / f"scan_{count}"
+    if not folder.is_dir():
+        folder.mkdir(parents=True)
+        for i in range(count):
+            (folder / f"image_{i:06d}.png").write_bytes(b"")
+        (folder / "subfolder").mkdir()
+    # Age the folder past the listing cache's racy window so snapshots are kept.
+    past = time.time() - 60
+    os.utime(folder, (past, past))
+    return folder
+
+
+@scenario("folder_scan.listdir")
+def _scan_listdir(ctx: Context):
+    count = ctx.size(5000, 500)
+    folder = str(_populated_folder(ctx, count))
+
+    def run():
+        return sorted(f for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f)))
+
+    return run, {"files": count}
+
+
+@scenario("folder_scan.cold")
+def _scan_cold(ctx: Context):
+    listing_cache = import_node_module("aun_listing_cache")
+    count = ctx.size(5000, 500)
+    folder = str(_populated_folder(ctx, count))
+
+    def run():
+        listing_cache._listings.clear()
+        return listing_cache.list_files(folder)
+
+    return run, {"files": count}
+
+
+@scenario("folder_scan.warm")
+def _scan_warm(ctx: Context):
+    listing_cache = import_node_module("aun_listing_cache")
+    count = ctx.size(5000, 500)
+    folder = str(_populated_folder(ctx, count))
+    listing_cache.list_files(folder)
+    return (lambda: listing_cache.list_files(folder)), {"files": count}
+
+
+def cleanup(ctx: Context) -> None:
+    shutil.rmtree(ctx.scratch, ignore_errors=True)
@@ -1,5 +1,6 @@
 import os
 
+import functools
 import hashlib
 
 import json
@@ -7,6 +8,7 @@ import mimetypes
 import re
 
 import folder_paths
+from .aun_perf import stage as perf_stage
 from .logger import logger
 
 import numpy as np
@@ -28,30 +30,6 @@ VIDEO_FORMATS_DIRECTORY = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "video_formats"
 )
 
-VIDEO_FORMATS: list[str] = []
-try:
-    if os.path.isdir(VIDEO_FORMATS_DIRECTORY):
-        for filename in os.listdir(VIDEO_FORMATS_DIRECTORY):
-            filepath = os.path.join(VIDEO_FORMATS_DIRECTORY, filename)
-            if not os.path.isfile(filepath):
-                continue
-            if not filename.lower().endswith(".json"):
-                continue
-            try:
-                with open(filepath, "r", encoding="utf-8") as file:
-                    data = json.load(file)
-                extension = data.get("extension")
-                if extension and extension not in VIDEO_FORMATS:
-                    VIDEO_FORMATS.append(str(extension))
-            except Exception:
-                # Avoid breaking imports due to a bad format file
-                continue
-except Exception:
-    # Avoid breaking imports if the folder is missing/unreadable
-    VIDEO_FORMATS = []
-
-
-ACCEPTED_UPLOAD_VIDEO_EXTENSIONS = ["webm", "mp4", "mkv", "ogg"] + VIDEO_FORMATS
 ACCEPTED_BROWSER_VIDEO_EXTENSIONS = ["webm", "mp4", "ogg"]
 
 ACCEPTED_ANIMATED_IMAGE_EXTENSIONS = ["gif", "webp", "apng", "mjpeg"]
@@ -60,19 +38,73 @@ ACCEPTED_STILL_IMAGE_EXTENSIONS = ["gif", "webp", "png", "jpg", "jpeg", "jfif"]
 ALL_ACCEPTED_IMAGE_EXTENSIONS = (
     ACCEPTED_STILL_IMAGE_EXTENSIONS + ACCEPTED_ANIMATED_IMAGE_EXTENSIONS
 )
-ALL_ACCEPTED_UPLOAD_VISUAL_EXTENSIONS = (
-    ACCEPTED_UPLOAD_VIDEO_EXTENSIONS + ALL_ACCEPTED_IMAGE_EXTENSIONS
-)
 ALL_ACCEPTED_BROWSER_VISUAL_EXTENSIONS = (
     ACCEPTED_BROWSER_VIDEO_EXTENSIONS + ALL_ACCEPTED_IMAGE_EXTENSIONS
 )
-ACCEPTED_IMAGE_AND_VIDEO_EXTENSIONS_COMPENDIUM = (
-    ALL_ACCEPTED_IMAGE_EXTENSIONS
-    + ALL_ACCEPTED_UPLOAD_VISUAL_EXTENSIONS
-    + ALL_ACCEPTED_BROWSER_VISUAL_EXTENSIONS
+
+
+@functools.lru_cache(maxsize=1)
+def get_video_formats() -> list[str]:
+    """Extensions declared by the ``video_formats/*.json`` files, scanned on first use."""
+    video_formats: list[str] = []
+    try:
+        if os.path.isdir(VIDEO_FORMATS_DIRECTORY):
+            for filename in os.listdir(VIDEO_FORMATS_DIRECTORY):
+                filepath = os.path.join(VIDEO_FORMATS_DIRECTORY, filename)
+                if not os.path.isfile(filepath):
+                    continue
+                if not filename.lower().endswith(".json"):
+                    continue
+                try:
+                    with open(filepath, "r", encoding="utf-8") as file:
+                        data = json.load(file)
+                    extension = data.get("extension")
+                    if extension and extension not in video_formats:
+                        video_formats.append(str(extension))
+                except Exception:
+                    # Skip a bad format file
+                    continue
+    except Exception:
+        # The folder is missing/unreadable
+        return []
+    return video_formats
+
+
+@functools.lru_cache(maxsize=1)
+def _video_extension_lists() -> dict[str, list[str]]:
+    video_formats = list(get_video_formats())
+    upload_video = ["webm", "mp4", "mkv", "ogg"] + video_formats
+    upload_visual = upload_video + ALL_ACCEPTED_IMAGE_EXTENSIONS
+    return {
+        "VIDEO_FORMATS": video_formats,
+        "ACCEPTED_UPLOAD_VIDEO_EXTENSIONS": upload_video,
+        "ALL_ACCEPTED_UPLOAD_VISUAL_EXTENSIONS": upload_visual,
+        "ACCEPTED_IMAGE_AND_VIDEO_EXTENSIONS_COMPENDIUM": (
+            ALL_ACCEPTED_IMAGE_EXTENSIONS + upload_visual + ALL_ACCEPTED_BROWSER_VISUAL_EXTENSIONS
+        ),
+    }
+
+
+def get_image_and_video_extensions() -> list[str]:
+    """Every known image/video extension, including the ones from ``video_formats/``."""
+    return _video_extension_lists()["ACCEPTED_IMAGE_AND_VIDEO_EXTENSIONS_COMPENDIUM"]
+
+
+_LAZY_EXTENSION_LISTS = (
+    "VIDEO_FORMATS",
+    "ACCEPTED_UPLOAD_VIDEO_EXTENSIONS",
+    "ALL_ACCEPTED_UPLOAD_VISUAL_EXTENSIONS",
+    "ACCEPTED_IMAGE_AND_VIDEO_EXTENSIONS_COMPENDIUM",
 )
 
 
+def __getattr__(name: str):
+    # Lists that depend on the video_formats/ scan are built when first used.
+    if name in _LAZY_EXTENSION_LISTS:
+        return _video_extension_lists()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 mimetypes.add_type("image/webp", ".webp")
 
 
@@ -89,9 +121,10 @@ def get_sha256(file_path: str) -> str:
             print(f"AUN: Error reading existing hash file: {e}")
 
     sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
+    with perf_stage("hash.sha256") as perf, open(file_path, "rb") as f:
         for byte_block in iter(lambda: f.read(4096), b""):
             sha256_hash.update(byte_block)
+            perf.add_bytes(len(byte_block))
 
     try:
         with open(hash_file, "w", encoding="utf-8") as f:
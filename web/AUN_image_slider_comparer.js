@@ -400,6 +400,13 @@ function updateSlider(widget, pct) {
 
 function buildImageUrl(info) {
   if (!info) return "";
+  // Inactive pairs are exported lazily: the backend only sends a key and
+  // writes the preview the first time the frame is requested.
+  if (info.lazy_key && !info.filename) {
+    return api.apiURL(
+      "/aun/slider-comparer/frame?" + new URLSearchParams({ key: info.lazy_key }).toString(),
+    );
+  }
   return api.apiURL("/view?" + new URLSearchParams(info).toString());
 }
 
@@ -186,7 +186,7 @@ function disposeFooter(node) {
 const activeFooters = new Map();
 
 const skipWidgetNames = new Set([
-  "index", "mode", "seed", "strength", "apply_lora", "visible_inputs", "case_sensitive",
+  "index", "mode", "seed", "strength", "apply_lora", "visible_inputs", "case_sensitive", "match_mode",
   "reference_phrase", "manual_preset", "match_keywords",
   "preset", "weight", "weight_type", "preset_faceid", "lora_strength",
   "weight_faceid", "weight_faceidv2", "weight_type_faceid",
@@ -281,19 +281,35 @@ function splitKeywords(raw) {
     .filter(Boolean);
 }
 
+function escapeRegExp(text) {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+}
+
+// Mirrors aun_keyword_matcher.py: substring, whole word or regex matching.
+function keywordMatches(ref, kw, cs, mode) {
+  if (mode !== "whole word" && mode !== "regex") {
+    return (cs ? ref : ref.toLowerCase()).includes(cs ? kw : kw.toLowerCase());
+  }
+  const source = mode === "regex" ? kw : `(?<![\\p{L}\\p{N}_])${escapeRegExp(kw)}(?![\\p{L}\\p{N}_])`;
+  try {
+    return new RegExp(source, (cs ? "" : "i") + (mode === "regex" ? "" : "u")).test(ref);
+  } catch {
+    return false;
+  }
+}
+
 function findMatch(node) {
   const ref = getReferencePhrase(node);
   if (!ref) return null;
   const csWidget = getWidget(node, "case_sensitive");
   const cs = !!csWidget?.value;
-  const search = cs ? ref : ref.toLowerCase();
+  const mode = String(getWidget(node, "match_mode")?.value ?? "substring");
   const count = getVisibleCount(node);
 
   for (let i = 1; i <= count; i++) {
     const kws = splitKeywords(getWidget(node, "keyword" + i)?.value);
     for (const kw of kws) {
-      const matchKw = cs ? kw : kw.toLowerCase();
-      if (search.includes(matchKw)) {
+      if (keywordMatches(ref, kw, cs, mode)) {
         return { index: i, keyword: kw, ...getRowSettings(node, i) };
       }
     }
@@ -546,6 +562,7 @@ function updateVisibility(node) {
 
   applyWidgetHiddenState(getWidget(node, "visible_inputs"), compact);
   applyWidgetHiddenState(getWidget(node, "case_sensitive"), compact);
+  applyWidgetHiddenState(getWidget(node, "match_mode"), compact);
   applyWidgetHiddenState(getWidget(node, "match_keywords"), compact);
 
   for (let i = 1; i <= MAX_SLOTS; i++) {
@@ -149,7 +149,7 @@ function disposeFooter(node) {
   node.__AUN_kpsFooter = null;
 }
 
-const skipWidgetNames = new Set(["index", "mode", "seed", "strength", "apply_lora", "visible_inputs", "case_sensitive", "reference_phrase", "preset_default"]);
+const skipWidgetNames = new Set(["index", "mode", "seed", "strength", "apply_lora", "visible_inputs", "case_sensitive", "match_mode", "reference_phrase", "preset_default"]);
 
 function traceLinkValue(startLink, visited, depth) {
   depth = depth || 0;
@@ -225,19 +225,35 @@ function splitKeywords(raw) {
     .filter(Boolean);
 }
 
+function escapeRegExp(text) {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+}
+
+// Mirrors aun_keyword_matcher.py: substring, whole word or regex matching.
+function keywordMatches(ref, kw, cs, mode) {
+  if (mode !== "whole word" && mode !== "regex") {
+    return (cs ? ref : ref.toLowerCase()).includes(cs ? kw : kw.toLowerCase());
+  }
+  const source = mode === "regex" ? kw : `(?<![\\p{L}\\p{N}_])${escapeRegExp(kw)}(?![\\p{L}\\p{N}_])`;
+  try {
+    return new RegExp(source, (cs ? "" : "i") + (mode === "regex" ? "" : "u")).test(ref);
+  } catch {
+    return false;
+  }
+}
+
 function findMatch(node) {
   const ref = getReferencePhrase(node);
   if (!ref) return null;
   const csWidget = getWidget(node, "case_sensitive");
   const cs = !!csWidget?.value;
-  const search = cs ? ref : ref.toLowerCase();
+  const mode = String(getWidget(node, "match_mode")?.value ?? "substring");
   const count = getVisibleCount(node);
 
   for (let i = 1; i <= count; i++) {
     const kws = splitKeywords(getWidget(node, "keyword" + i)?.value);
     for (const kw of kws) {
-      const matchKw = cs ? kw : kw.toLowerCase();
-      if (search.includes(matchKw)) {
+      if (keywordMatches(ref, kw, cs, mode)) {
         const prVal = String(getWidget(node, "preset" + i)?.value ?? "").trim();
         return { index: i, keyword: kw, value: prVal };
       }
@@ -402,6 +418,7 @@ function updateVisibility(node) {
 
   applyWidgetHiddenState(getWidget(node, "visible_inputs"), compact);
   applyWidgetHiddenState(getWidget(node, "case_sensitive"), compact);
+  applyWidgetHiddenState(getWidget(node, "match_mode"), compact);
   applyWidgetHiddenState(getWidget(node, "reference_phrase"), compact);
 
   for (let i = 1; i <= MAX_SLOTS; i++) {
@@ -8,7 +8,7 @@ const SAVED_HEIGHT_KEY = "__aun_saved_height";
 
 const HIDE_WIDGETS = new Set([
   "steps", "cfg", "modelname", "sampler_name", "scheduler",
-  "seed_value", "date_format", "sidecar_format",
+  "seed_value", "date_format", "sidecar_format", "compress_metadata",
   "lpw_positive", "lpw_negative", "loras_delimiter",
   "preview", "save_image", "save_sidecar_to_file",
   "path_filename", "filename", "path", "extension",
@@ -201,24 +201,28 @@ try {
 
   api.addEventListener("AUN_node_bypass_state", (event) => {
     try {
-      const nodeId = event.detail?.node_id;
-      const isActive = event.detail?.is_active;
-      if (!nodeId) return;
-      const target = findNodeById(nodeId);
-      if (!target) return;
-      applyRecursiveState(target, isActive, "bypass");
+      const updates = event.detail?.updates || [event.detail];
+      for (const update of updates) {
+        const nodeId = update?.node_id;
+        if (!nodeId) continue;
+        const target = findNodeById(nodeId);
+        if (!target) continue;
+        applyRecursiveState(target, update.is_active, "bypass");
+      }
       app.graph.setDirtyCanvas(true, true);
     } catch (e) {}
   });
 
   api.addEventListener("AUN-node-mute-state", (event) => {
     try {
-      const nodeId = event.detail?.node_id;
-      const isActive = event.detail?.is_active;
-      if (!nodeId) return;
-      const target = findNodeById(nodeId);
-      if (!target) return;
-      applyRecursiveState(target, isActive, "mute");
+      const updates = event.detail?.updates || [event.detail];
+      for (const update of updates) {
+        const nodeId = update?.node_id;
+        if (!nodeId) continue;
+        const target = findNodeById(nodeId);
+        if (!target) continue;
+        applyRecursiveState(target, update.is_active, "mute");
+      }
       app.graph.setDirtyCanvas(true, true);
     } catch (e) {}
   });
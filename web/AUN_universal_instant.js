@@ -957,7 +957,9 @@ const applyUniversalUpdate = (mode, groupsPayload, stateChanges) => {
     });
   });
 
-  const groupMap = collectGroupsByTitle();
+  // Only Group targets need the group map; ID payloads (including titles the
+  // server already resolved to IDs) skip the scan.
+  let groupMap = null;
 
   const parseIncludeExcludeTargets = (targets) => {
     const includes = [];
@@ -980,6 +982,7 @@ const applyUniversalUpdate = (mode, groupsPayload, stateChanges) => {
   const updateGroupTitle = (title, isActive) => {
     const key = (title || "").trim().toLowerCase();
     if (!key) return;
+    if (!groupMap) groupMap = collectGroupsByTitle();
     const entry = groupMap.get(key);
     if (!entry) return;
     entry.entries.forEach((group) => {
@@ -1017,14 +1020,16 @@ const applyUniversalUpdate = (mode, groupsPayload, stateChanges) => {
       )
       .filter(Boolean);
     if (!includes.length) return;
-    const excludes = new Set(
-      (excludeTargets || [])
-        .map((entry) =>
-          String(entry ?? "")
-            .trim()
-            .toLowerCase(),
-        )
-        .filter(Boolean),
+    const excludes = Array.from(
+      new Set(
+        (excludeTargets || [])
+          .map((entry) =>
+            String(entry ?? "")
+              .trim()
+              .toLowerCase(),
+          )
+          .filter(Boolean),
+      ),
     );
 
     allNodes.forEach((node) => {
@@ -1032,8 +1037,7 @@ const applyUniversalUpdate = (mode, groupsPayload, stateChanges) => {
       const included = includes.some((needle) => title.includes(needle));
       if (!included) return;
       const excluded =
-        excludes.size &&
-        Array.from(excludes).some((needle) => title.includes(needle));
+        excludes.length && excludes.some((needle) => title.includes(needle));
       if (excluded) return;
       forEachNodeAndInnerNodes(node, (target) =>
         setNodeStateForMode(target, mode, isActive, stateChanges),
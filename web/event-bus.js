@@ -2,8 +2,15 @@
  * Centralized event bus for AUN web extensions.
  * Replaces individual polling loops with a single rAF watcher
  * that dispatches events to registered listeners.
+ *
+ * Also unpacks the coalesced "AUN_event_batch" message sent by the
+ * backend (aun_event_bus.py): each contained event is re-dispatched on the
+ * api under its original name, in order, within a single task, so existing
+ * listeners keep working and the canvas redraws once per batch.
  */
 
+import { api } from "../../scripts/api.js";
+
 const EVENTS = {
   NODE_TITLE_CHANGED: "aun:nodeTitleChanged",
   GRAPH_CHANGED: "aun:graphChanged",
@@ -79,6 +86,28 @@ function startWatcher(appRef) {
   requestAnimationFrame(tick);
 }
 
+// ── Coalesced backend events ──────────────────────────────────
+
+const BATCH_EVENT = "AUN_event_batch";
+
+function applyEventBatch(event) {
+  const events = event?.detail?.events;
+  if (!Array.isArray(events)) return;
+  for (const entry of events) {
+    if (!entry || typeof entry.type !== "string") continue;
+    try {
+      api.dispatchEvent(new CustomEvent(entry.type, { detail: entry.data }));
+    } catch (e) {
+      console.warn(`[AUN EventBus] failed to apply "${entry.type}":`, e);
+    }
+  }
+}
+
+if (!globalThis.__aunEventBatchListener) {
+  globalThis.__aunEventBatchListener = true;
+  api.addEventListener(BATCH_EVENT, applyEventBatch);
+}
+
 // Start the watcher once when first imported (lazy start on next tick)
 let _appRef = null;
 export function initEventBus(appRef) {